@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Portfolio aggregates - the numbers behind the Analytics tab, kept up to date as companies arrive
+
+PortfolioAggregates folds in one CompanyRecord at a time (add) and holds only
+summaries whose size does not grow with the portfolio:
+
+    totals and coverage ratios      companies / founders / emails with data
+    tech tag counts                 one counter entry per distinct tag
+    founder-count histogram         founders per company -> companies
+    email domain counts             one counter entry per domain
+    top companies by founders       bounded min-heap of top_n entries
+
+The scraper persists them next to the dataset (aggregates_path, or inside the
+JSON snapshot), so dashboards chart them without touching the records.
+"""
+
+import heapq
+import os
+from collections import Counter
+
+from portfolio_cache import load_json, write_json
+
+TOP_N = 20
+
+
+def aggregates_path(dataset_path):
+    """Sidecar file holding the aggregates of a pickled dataset"""
+    return os.path.splitext(dataset_path)[0] + '.aggregates.json'
+
+
+class PortfolioAggregates:
+    """Incrementally maintained counters and rankings over CompanyRecords"""
+
+    def __init__(self, top_n=TOP_N):
+        self.top_n = top_n
+        self.companies = 0
+        self.founders = 0
+        self.emails = 0
+        self.with_founders = 0
+        self.with_emails = 0
+        self.founders_with_email = 0
+        self.founders_with_linkedin = 0
+        self.inferred_emails = 0
+        self.tech = Counter()
+        self.founder_histogram = Counter()   # founders per company -> number of companies
+        self.email_domains = Counter()
+        self._top = []                       # min-heap of (founders, -order, name, url)
+
+    @classmethod
+    def from_records(cls, records, top_n=TOP_N):
+        aggregates = cls(top_n)
+        for company in records:
+            aggregates.add(company)
+        return aggregates
+
+    def add(self, company):
+        """Fold one CompanyRecord into the summaries"""
+        self.companies += 1
+        self.founders += company.founders_count
+        self.emails += company.emails_count
+        self.with_founders += company.founders_count > 0
+        self.with_emails += company.emails_count > 0
+        self.founder_histogram[company.founders_count] += 1
+        self.tech.update(company.tech_stack)
+        self.email_domains.update(email.split('@')[-1] for email in company.all_emails if '@' in email)
+
+        for founder in company.founders:
+            self.founders_with_email += bool(founder.email)
+            self.founders_with_linkedin += bool(founder.linkedin)
+            self.inferred_emails += founder.email_source == 'inferred'
+
+        # Ties keep the company seen first
+        entry = (company.founders_count, -self.companies, company.company_name, company.company_url)
+        if len(self._top) < self.top_n:
+            heapq.heappush(self._top, entry)
+        elif entry > self._top[0]:
+            heapq.heapreplace(self._top, entry)
+
+    def top_companies(self):
+        """[{company_name, company_url, founders}] - most founders first"""
+        return [
+            {'company_name': name, 'company_url': url, 'founders': count}
+            for count, _, name, url in sorted(self._top, reverse=True)
+        ]
+
+    def coverage(self):
+        """Share of companies / founders that have each kind of data (0..1)"""
+        def ratio(part, whole):
+            return part / whole if whole else 0.0
+
+        return {
+            'companies_with_founders': ratio(self.with_founders, self.companies),
+            'companies_with_emails': ratio(self.with_emails, self.companies),
+            'founders_with_email': ratio(self.founders_with_email, self.founders),
+            'founders_with_linkedin': ratio(self.founders_with_linkedin, self.founders),
+            'inferred_emails': ratio(self.inferred_emails, self.founders_with_email),
+        }
+
+    def totals(self):
+        """Same shape as portfolio_records.portfolio_totals()"""
+        return {
+            'companies': self.companies,
+            'founders': self.founders,
+            'emails': self.emails,
+            'with_founders': self.with_founders
+        }
+
+    def to_dict(self):
+        return {
+            'top_n': self.top_n,
+            'companies': self.companies,
+            'founders': self.founders,
+            'emails': self.emails,
+            'with_founders': self.with_founders,
+            'with_emails': self.with_emails,
+            'founders_with_email': self.founders_with_email,
+            'founders_with_linkedin': self.founders_with_linkedin,
+            'inferred_emails': self.inferred_emails,
+            'tech': dict(self.tech),
+            'founder_histogram': {str(k): v for k, v in self.founder_histogram.items()},
+            'email_domains': dict(self.email_domains),
+            'top': [list(entry) for entry in self._top],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        aggregates = cls(data.get('top_n', TOP_N))
+        for field in ('companies', 'founders', 'emails', 'with_founders', 'with_emails',
+                      'founders_with_email', 'founders_with_linkedin', 'inferred_emails'):
+            setattr(aggregates, field, data.get(field, 0))
+        aggregates.tech = Counter(data.get('tech', {}))
+        aggregates.founder_histogram = Counter({int(k): v for k, v in data.get('founder_histogram', {}).items()})
+        aggregates.email_domains = Counter(data.get('email_domains', {}))
+        aggregates._top = [tuple(entry) for entry in data.get('top', [])]
+        heapq.heapify(aggregates._top)
+        return aggregates
+
+
+def save_aggregates(aggregates, dataset_path):
+    """Write the sidecar for a dataset file just written (atomically), stamped with its size / mtime"""
+    stat = os.stat(dataset_path)
+    payload = dict(aggregates.to_dict(), dataset={'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns})
+    write_json(aggregates_path(dataset_path), payload)
+
+
+def read_aggregates(dataset_path):
+    """Persisted aggregates of a dataset file, or None when missing or stale"""
+    payload = load_json(aggregates_path(dataset_path))
+    try:
+        stat = os.stat(dataset_path)
+    except OSError:
+        return None
+    if not isinstance(payload, dict) or payload.get('dataset') != {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}:
+        return None
+    return PortfolioAggregates.from_dict(payload)
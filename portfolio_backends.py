@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+Fetch backends - how the scraper loads pages
+
+Every backend offers the same small interface:
+
+    navigate(url, settle)   load a page, wait `settle` seconds, return the final URL
+    html()                  current page's HTML
+    run_script(expression)  evaluate a JavaScript expression, return its value
+    harvest_links()         absolute hrefs of every <a> on the page
+    fetch(url, settle)      navigate + html, returns (html, final_url)
+    close()
+
+Backends:
+    HttpBackend      plain urllib GET, no JavaScript (stdlib only)
+    SeleniumBackend  one Chrome per backend through WebDriver (selenium, webdriver-manager)
+    CDPEngine        one headless Chrome driven over the DevTools protocol from an
+                     asyncio loop; engine.new_tab() returns a CDPTab backend, and many
+                     tabs load pages concurrently in the same browser (websockets)
+
+asyncio, subprocess and tempfile are only needed by the CDP engine and are
+imported when it starts, which keeps `import portfolio_scraper` fast.
+"""
+
+import itertools
+import json
+import os
+import re
+import shutil
+import threading
+import time
+
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
+BROWSER_ENGINES = ('selenium', 'cdp')
+
+HREF_RE = re.compile(r'<a\b[^>]*?\bhref\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+))', re.I)
+CHROME_BINARIES = ('google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser', 'chrome')
+LINKS_SCRIPT = "Array.from(document.querySelectorAll('a[href]'), a => a.href)"
+
+
+class FetchBackend:
+    """Interface shared by all backends"""
+
+    def navigate(self, url, settle=0):
+        raise NotImplementedError
+
+    def html(self):
+        raise NotImplementedError
+
+    def run_script(self, expression):
+        raise NotImplementedError(f"{type(self).__name__} cannot run JavaScript")
+
+    def harvest_links(self):
+        return self.run_script(LINKS_SCRIPT) or []
+
+    def fetch(self, url, settle=0):
+        final_url = self.navigate(url, settle)
+        return self.html(), final_url
+
+    def close(self):
+        pass
+
+
+class HttpBackend(FetchBackend):
+    """Plain HTTP GET (no JavaScript)"""
+
+    def __init__(self, timeout=20):
+        self.timeout = timeout
+        self.url = ''
+        self._html = ''
+
+    def navigate(self, url, settle=0):
+        import urllib.request
+
+        request = urllib.request.Request(url, headers={
+            'User-Agent': USER_AGENT,
+            'Accept': 'text/html,application/xhtml+xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.8'
+        })
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            charset = response.headers.get_content_charset() or 'utf-8'
+            self._html = response.read().decode(charset, errors='replace')
+            self.url = response.geturl()
+        return self.url
+
+    def html(self):
+        return self._html
+
+    def harvest_links(self):
+        from urllib.parse import urljoin
+        return [urljoin(self.url, next(g for g in m.groups() if g is not None)) for m in HREF_RE.finditer(self._html)]
+
+
+class SeleniumBackend(FetchBackend):
+    """Chrome through Selenium WebDriver, launched on first navigation"""
+
+    def __init__(self, headless=False):
+        self.headless = headless
+        self.driver = None
+
+    def _start(self):
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+        from webdriver_manager.chrome import ChromeDriverManager
+
+        print("🌐 Starting Chrome...")
+
+        # Chrome options
+        options = Options()
+        if self.headless:
+            options.add_argument("--headless")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("--window-size=1920,1080")
+        options.add_argument("--disable-blink-features=AutomationControlled")
+        options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        options.add_argument(f"user-agent={USER_AGENT}")
+
+        service = Service(ChromeDriverManager().install())
+        self.driver = webdriver.Chrome(service=service, options=options)
+
+    def navigate(self, url, settle=0):
+        if self.driver is None:
+            self._start()
+        self.driver.get(url)
+        time.sleep(settle)
+        return self.driver.current_url
+
+    def html(self):
+        return self.driver.page_source
+
+    def run_script(self, expression):
+        return self.driver.execute_script(f"return ({expression});")
+
+    def close(self):
+        if self.driver is not None:
+            self.driver.quit()
+            self.driver = None
+
+
+def find_chrome():
+    """Path of a Chrome / Chromium binary ($CHROME_PATH wins)"""
+    if os.getenv('CHROME_PATH'):
+        return os.environ['CHROME_PATH']
+    for name in CHROME_BINARIES:
+        path = shutil.which(name)
+        if path:
+            return path
+    raise FileNotFoundError("No Chrome/Chromium binary found (set CHROME_PATH)")
+
+
+class CDPEngine:
+    """One headless Chrome shared by many tabs, driven over the DevTools protocol
+
+    The websocket and all protocol traffic live on an asyncio loop in a
+    background thread; tabs are multiplexed over a single connection with
+    flattened target sessions, so each command is one websocket message
+    instead of a WebDriver HTTP round-trip. new_tab() is thread-safe, and each
+    worker thread drives its own tab.
+    """
+
+    def __init__(self, headless=True, load_timeout=30):
+        try:
+            import websockets  # noqa: F401
+        except ImportError:
+            raise ImportError("The CDP browser engine needs websockets: pip install websockets")
+
+        self.headless = headless
+        self.load_timeout = load_timeout
+        self.loop = None
+        self.thread = None
+        self.process = None
+        self.profile_dir = None
+        self.ws = None
+        self.ids = itertools.count(1)
+        self.pending = {}     # command id -> future
+        self.listeners = {}   # (session id, event name) -> [futures]
+        self.lock = threading.Lock()
+
+    # Engine lifecycle ---------------------------------------------------
+
+    def _ensure_started(self):
+        import asyncio
+
+        with self.lock:
+            if self.loop is not None:
+                return
+            print("🌐 Starting Chrome (DevTools protocol)...")
+            self.loop = asyncio.new_event_loop()
+            self.thread = threading.Thread(target=self.loop.run_forever, name='cdp-engine', daemon=True)
+            self.thread.start()
+            try:
+                self._call(self._connect())
+            except Exception:
+                self.loop.call_soon_threadsafe(self.loop.stop)
+                self.loop = None
+                if self.process is not None:
+                    self.process.kill()
+                raise
+
+    def _call(self, coro, timeout=None):
+        """Run a coroutine on the engine loop from any thread"""
+        import asyncio
+
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+    def _launch(self):
+        import subprocess
+        import tempfile
+
+        self.profile_dir = tempfile.mkdtemp(prefix='portfolio-cdp-')
+        args = [
+            find_chrome(), '--remote-debugging-port=0', f'--user-data-dir={self.profile_dir}',
+            '--no-first-run', '--no-default-browser-check', '--no-sandbox', '--disable-dev-shm-usage',
+            '--disable-blink-features=AutomationControlled', f'--user-agent={USER_AGENT}',
+            '--window-size=1920,1080', 'about:blank'
+        ]
+        if self.headless:
+            args.insert(1, '--headless=new')
+        self.process = subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+        # Chrome writes the chosen port and browser target path once it is listening
+        port_file = os.path.join(self.profile_dir, 'DevToolsActivePort')
+        deadline = time.time() + 30
+        while time.time() < deadline:
+            if os.path.exists(port_file):
+                with open(port_file) as f:
+                    lines = f.read().split()
+                if len(lines) >= 2:
+                    return f"ws://127.0.0.1:{lines[0]}{lines[1]}"
+            if self.process.poll() is not None:
+                break
+            time.sleep(0.1)
+        raise RuntimeError("Chrome did not open a DevTools port")
+
+    async def _connect(self):
+        import asyncio
+        import websockets
+
+        url = await asyncio.get_running_loop().run_in_executor(None, self._launch)
+        self.ws = await websockets.connect(url, max_size=None)
+        asyncio.ensure_future(self._reader())
+
+    async def _reader(self):
+        try:
+            async for message in self.ws:
+                data = json.loads(message)
+                if 'id' in data:
+                    future = self.pending.pop(data['id'], None)
+                    if future is not None and not future.done():
+                        if 'error' in data:
+                            future.set_exception(RuntimeError(data['error'].get('message', 'CDP error')))
+                        else:
+                            future.set_result(data.get('result', {}))
+                else:
+                    key = (data.get('sessionId'), data.get('method'))
+                    for future in self.listeners.pop(key, []):
+                        if not future.done():
+                            future.set_result(data.get('params', {}))
+        except Exception:
+            pass  # connection closed (browser exited)
+        finally:
+            # Nobody may wait forever on a dead browser
+            for future in self.pending.values():
+                if not future.done():
+                    future.set_exception(RuntimeError("Browser connection closed"))
+            self.pending.clear()
+
+    async def send(self, method, params=None, session_id=None):
+        import asyncio
+
+        command_id = next(self.ids)
+        future = asyncio.get_running_loop().create_future()
+        self.pending[command_id] = future
+        message = {'id': command_id, 'method': method, 'params': params or {}}
+        if session_id:
+            message['sessionId'] = session_id
+        await self.ws.send(json.dumps(message))
+        return await future
+
+    def wait_for(self, session_id, method):
+        """Future resolved by the next `method` event of a session (call on the loop)"""
+        future = self.loop.create_future()
+        self.listeners.setdefault((session_id, method), []).append(future)
+        return future
+
+    def new_tab(self):
+        """A CDPTab backend with its own browser tab"""
+        self._ensure_started()
+        target_id, session_id = self._call(self._open_tab())
+        return CDPTab(self, target_id, session_id)
+
+    async def _open_tab(self):
+        target = await self.send('Target.createTarget', {'url': 'about:blank'})
+        session = await self.send('Target.attachToTarget', {'targetId': target['targetId'], 'flatten': True})
+        session_id = session['sessionId']
+        await self.send('Page.enable', session_id=session_id)
+        return target['targetId'], session_id
+
+    def close(self):
+        if self.loop is None:
+            return
+        try:
+            self._call(self._shutdown(), timeout=10)
+        except Exception:
+            pass
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        if self.process is not None:
+            import subprocess
+
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        shutil.rmtree(self.profile_dir, ignore_errors=True)
+        self.loop = None
+
+    async def _shutdown(self):
+        import asyncio
+
+        try:
+            await asyncio.wait_for(self.send('Browser.close'), 5)
+        finally:
+            await self.ws.close()
+
+
+class CDPTab(FetchBackend):
+    """One tab of a CDPEngine, used from a single worker thread"""
+
+    def __init__(self, engine, target_id, session_id):
+        self.engine = engine
+        self.target_id = target_id
+        self.session_id = session_id
+
+    async def _navigate(self, url):
+        import asyncio
+
+        loaded = self.engine.wait_for(self.session_id, 'Page.loadEventFired')
+        result = await self.engine.send('Page.navigate', {'url': url}, self.session_id)
+        if result.get('errorText'):
+            raise RuntimeError(f"{url}: {result['errorText']}")
+        try:
+            await asyncio.wait_for(loaded, self.engine.load_timeout)
+        except asyncio.TimeoutError:
+            pass  # use whatever has rendered so far, like WebDriver's page load timeout
+
+    async def _evaluate(self, expression):
+        result = await self.engine.send('Runtime.evaluate', {
+            'expression': expression, 'returnByValue': True, 'awaitPromise': True
+        }, self.session_id)
+        if result.get('exceptionDetails'):
+            raise RuntimeError(result['exceptionDetails'].get('text', 'JavaScript error'))
+        return result.get('result', {}).get('value')
+
+    def navigate(self, url, settle=0):
+        self.engine._call(self._navigate(url))
+        time.sleep(settle)
+        return self.run_script('location.href')
+
+    def html(self):
+        return self.run_script('document.documentElement.outerHTML')
+
+    def run_script(self, expression):
+        return self.engine._call(self._evaluate(expression))
+
+    def close(self):
+        if self.engine.loop is None:
+            return
+        try:
+            self.engine._call(self.engine.send('Target.closeTarget', {'targetId': self.target_id}), timeout=10)
+        except Exception:
+            pass
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Per-company page budget - fetch only the pages that are likely to add founders
+
+The planner behind scrape_company:
+    - parked / placeholder homepages are recognised and skipped outright
+    - candidate team/about pages are ranked by expected founder yield
+    - pages are fetched in that order until the founder set is confident or
+      the company's page / byte / time budget is spent
+    - the OpenAI fallback runs once per company, only when nothing was found
+"""
+
+import re
+import time
+from urllib.parse import urlparse
+
+from portfolio_resolve import person_score
+
+DEFAULT_BUDGET = {'max_pages': 3, 'max_bytes': 5_000_000, 'max_seconds': 60}
+
+# Expected founder yield of a page, from words in its URL path and link text
+LINK_KEYWORDS = (
+    ('founders', 1.0), ('founder', 1.0), ('team', 0.9), ('leadership', 0.9), ('people', 0.7),
+    ('about', 0.6), ('who-we-are', 0.6), ('company', 0.4), ('story', 0.3)
+)
+LOW_YIELD_RE = re.compile(r'blog|news|press|career|jobs|hiring|privacy|terms|legal|cookie|login|signup|pricing', re.I)
+FOUNDER_ROLE_RE = re.compile(r'founder|\bceo\b|chief executive', re.I)
+
+PARKED_RE = re.compile(
+    r'domain (?:is|may be) for sale|buy this domain|this domain (?:name )?(?:is )?(?:parked|for sale)'
+    r'|parked (?:free|domain|by)|domain parking|afternic|hugedomains'
+    r'|Welcome to nginx!|Apache2 \w+ Default Page|^\s*Index of /'
+    r'|This site can.t be reached|Account Suspended',
+    re.I
+)
+# Parking services that render the page from a script or link
+PARKING_URL_RE = re.compile(r'sedoparking|dan\.com/buy|godaddy\.com/domain-?search|afternic\.com|hugedomains\.com', re.I)
+TITLE_RE = re.compile(r'<title\b[^>]*>(.*?)</title\s*>', re.I | re.S)
+SHORT_PAGE_CHARS = 600   # visible text of a parked / placeholder page fits in this
+PLACEHOLDER_RE = re.compile(r'coming soon|under construction|launching soon|site is being built', re.I)
+SCRIPT_BLOCK_RE = re.compile(r'<(script|style|noscript|template)\b[^>]*>.*?</\1\s*>', re.I | re.S)
+TAG_RE = re.compile(r'<[^>]+>')
+
+
+class CompanyBudget:
+    """Pages, bytes and seconds spent on one company"""
+
+    def __init__(self, max_pages=3, max_bytes=5_000_000, max_seconds=60):
+        self.max_pages = max_pages
+        self.max_bytes = max_bytes
+        self.max_seconds = max_seconds
+        self.started = time.time()
+        self.pages = 0
+        self.bytes = 0
+
+    def spend(self, page_source):
+        self.pages += 1
+        self.bytes += len(page_source)
+
+    def exhausted(self):
+        """Reason the budget is spent ('pages', 'bytes', 'seconds'), or None"""
+        if self.pages >= self.max_pages:
+            return 'pages'
+        if self.bytes >= self.max_bytes:
+            return 'bytes'
+        if time.time() - self.started >= self.max_seconds:
+            return 'seconds'
+        return None
+
+
+def link_yield(url, text=''):
+    """Expected founder yield of a candidate page, 0 when not worth a fetch"""
+    path = urlparse(url).path.lower()
+    text = (text or '').lower()
+    if LOW_YIELD_RE.search(path):
+        return 0.0
+    score = max((weight for word, weight in LINK_KEYWORDS if word in path or word in text), default=0.0)
+    # Deep paths are usually individual posts or profiles, not the team page
+    depth = len([part for part in path.split('/') if part])
+    return score / (1 + 0.25 * max(0, depth - 1))
+
+
+def is_confident(founders, structured=False, min_founders=2):
+    """True when more pages are unlikely to change the founder set"""
+    leaders = [f for f in founders if FOUNDER_ROLE_RE.search(f['role'] or '') and person_score(f['name']) >= 0.75]
+    if structured and founders:
+        return True
+    return len(leaders) >= min_founders
+
+
+def page_text(page_source):
+    return ' '.join(TAG_RE.sub(' ', SCRIPT_BLOCK_RE.sub(' ', page_source)).split())
+
+
+def looks_parked(page_source):
+    """Reason a homepage is a parked domain, server default page or placeholder, or None
+    
+    Only the title and the visible text of short pages are checked, so real
+    sites that mention "domain parking" in their copy or scripts are kept.
+    """
+    title = TITLE_RE.search(page_source)
+    if title and PARKED_RE.search(' '.join(title.group(1).split())):
+        return 'parked'
+    text = page_text(page_source)
+    if len(text) >= SHORT_PAGE_CHARS:
+        return None
+    if PARKED_RE.search(text) or PARKING_URL_RE.search(page_source):
+        return 'parked'
+    if PLACEHOLDER_RE.search(text):
+        return 'placeholder'
+    return None
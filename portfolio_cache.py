@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Content fingerprint cache - lets nightly runs skip companies whose sites haven't changed
+
+A company's result is reused when its homepage fingerprint is unchanged and
+the pages re-checked this run (the top-ranked about / team page, see
+pages_to_verify) still match the hashes stored with it - founder changes
+usually land on /team while the homepage stays the same.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from datetime import datetime
+
+# Markup that changes on every request without the visible content changing
+VOLATILE_BLOCK_RE = re.compile(r'<(script|style|noscript|template)\b[^>]*>.*?</\1\s*>', re.I | re.S)
+COMMENT_RE = re.compile(r'<!--.*?-->', re.S)
+VOLATILE_ATTR_RE = re.compile(
+    r'\s(?:nonce|integrity|data-(?:reactid|react-helmet|wf-page|wf-site|n-head|emotion|build-id|timestamp|ts)|csrf[\w-]*)'
+    r'\s*=\s*("[^"]*"|\'[^\']*\')',
+    re.I
+)
+CACHE_BUSTER_RE = re.compile(r'(\.(?:js|css|png|jpe?g|gif|svg|webp|woff2?))\?[^"\'\s>)]*', re.I)
+ISO_TIMESTAMP_RE = re.compile(r'\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?')
+EPOCH_RE = re.compile(r'\b1\d{9}(?:\d{3})?\b')
+WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_page(page_source):
+    """Strip scripts, comments, timestamps and other per-request noise from a page"""
+    text = VOLATILE_BLOCK_RE.sub('', page_source)
+    text = COMMENT_RE.sub('', text)
+    text = VOLATILE_ATTR_RE.sub('', text)
+    text = CACHE_BUSTER_RE.sub(r'\1', text)
+    text = ISO_TIMESTAMP_RE.sub('', text)
+    text = EPOCH_RE.sub('', text)
+    return WHITESPACE_RE.sub(' ', text).strip()
+
+
+def content_fingerprint(page_source):
+    """Hash of the normalized page content"""
+    return hashlib.sha256(normalize_page(page_source).encode('utf-8', 'replace')).hexdigest()
+
+
+def load_json(path, default=None):
+    """Decoded JSON file, or `default` when it is missing or unreadable"""
+    if path and os.path.exists(path):
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except Exception:
+            pass
+    return default
+
+
+def write_json(path, data, **options):
+    """Write a JSON file atomically (temp file + rename); options go to json.dump"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, **options)
+    os.replace(tmp_path, path)
+
+
+class JsonFileCache:
+    """A dict kept in one JSON file of a cache directory, shared by parallel worker scrapers
+
+    Subclasses set FILENAME (and DUMP_OPTIONS), change self.data under
+    self.lock and set self.dirty; save() writes the file only when dirty.
+    Without a cache_dir nothing is loaded or saved.
+    """
+
+    FILENAME = None
+    DUMP_OPTIONS = {}
+
+    def __init__(self, cache_dir=None):
+        self.path = os.path.join(cache_dir, self.FILENAME) if cache_dir else None
+        data = load_json(self.path)
+        self.data = data if isinstance(data, dict) else {}
+        self.dirty = False
+        self.lock = threading.Lock()
+
+    def save(self):
+        """Persist the cache (atomically) if anything changed"""
+        with self.lock:
+            if not self.path or not self.dirty:
+                return
+            write_json(self.path, self.data, **self.DUMP_OPTIONS)
+            self.dirty = False
+
+
+class FingerprintCache(JsonFileCache):
+    """Per-company content hashes and the extraction result they produced"""
+
+    FILENAME = 'fingerprints.json'
+
+    def __init__(self, cache_dir='.portfolio_cache'):
+        super().__init__(cache_dir)
+        self.entries = self.data   # company url -> entry
+
+    def pages_to_verify(self, company_url, fingerprint, limit=1):
+        """Stored about/team page URLs (best ranked first) to re-check when the homepage is unchanged"""
+        with self.lock:
+            entry = self.entries.get(company_url)
+            if not entry or entry.get('fingerprint') != fingerprint:
+                return []
+            return [url for url in entry.get('pages', {}) if url != company_url][:limit]
+
+    def lookup(self, company_url, fingerprint, page_hashes=None):
+        """Return the previous result if the homepage and every re-checked page are unchanged
+        
+        page_hashes: {url: fingerprint} of the other pages fetched again this run
+        """
+        with self.lock:
+            entry = self.entries.get(company_url)
+            if not entry or entry.get('fingerprint') != fingerprint or not entry.get('result'):
+                return None
+            stored = entry.get('pages', {})
+            if any(stored.get(url) != page_hash for url, page_hash in (page_hashes or {}).items()
+                   if url != company_url):
+                return None
+
+            now = datetime.now().isoformat()
+            entry['last_checked'] = now
+            self.dirty = True
+
+        result = dict(entry['result'])
+        result['scraped_at'] = now
+        result['last_changed'] = entry['last_changed']
+        return result
+
+    def store(self, company_url, fingerprint, result, page_hashes=None):
+        """Remember a fresh extraction result, returns the company's last-changed timestamp"""
+        now = datetime.now().isoformat()
+        with self.lock:
+            previous = self.entries.get(company_url) or {}
+            page_hashes = page_hashes or {}
+            stored = previous.get('pages', {})
+            unchanged = previous.get('fingerprint') == fingerprint and all(
+                stored[url] == page_hash for url, page_hash in page_hashes.items() if url in stored
+            )
+
+            if unchanged and previous.get('last_changed'):
+                last_changed = previous['last_changed']
+            else:
+                last_changed = now
+
+            self.entries[company_url] = {
+                'fingerprint': fingerprint,
+                'pages': page_hashes,
+                'last_changed': last_changed,
+                'last_checked': now,
+                'result': result
+            }
+            self.dirty = True
+        return last_changed
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Adaptive concurrency - how many companies to scrape at once, tuned while the crawl runs
+
+AdaptiveLimiter is an AIMD controller (additive increase, multiplicative
+decrease, as in TCP congestion control) fed with page latencies and errors:
+
+    every `window` samples
+        p95 latency > latency_tolerance x baseline p95,
+        timeout rate > max_timeout_rate,
+        failure rate > max_failure_rate (429s, 5xx, refused connections),
+        or the host is short of CPU / memory    ->  limit = limit x backoff
+        else, if the limit was actually used    ->  limit + 1
+
+The baseline p95 is the best window seen, drifting back toward recent windows
+by baseline_decay each window so one unusually fast window does not cap the
+rest of a run. The limit settles where extra parallelism stops buying
+throughput - whether that is 3 on a laptop or 60 on a 64-core box. metrics()
+exposes the current limit and the signals behind it.
+"""
+
+import math
+import os
+import threading
+import time
+from collections import deque
+
+
+def host_load():
+    """(1-minute load per CPU, available memory ratio) - None where the OS doesn't tell"""
+    try:
+        import psutil
+        return psutil.getloadavg()[0] / (psutil.cpu_count() or 1), psutil.virtual_memory().available / psutil.virtual_memory().total
+    except Exception:
+        pass
+
+    cpu = None
+    try:
+        cpu = os.getloadavg()[0] / (os.cpu_count() or 1)
+    except (AttributeError, OSError):
+        pass
+
+    memory = None
+    try:
+        with open('/proc/meminfo') as f:
+            info = dict(line.split(':', 1) for line in f)
+        memory = int(info['MemAvailable'].split()[0]) / int(info['MemTotal'].split()[0])
+    except Exception:
+        pass
+    return cpu, memory
+
+
+def default_max_limit(fetch_mode, browser_engine='selenium'):
+    """Upper bound for the limiter: browsers are heavy, plain HTTP is cheap"""
+    cpus = os.cpu_count() or 1
+    if fetch_mode == 'http':
+        return cpus * 8
+    if browser_engine == 'cdp':
+        return cpus * 2
+    return max(2, cpus)
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit driven by p95 latency, timeout / failure rates and host headroom"""
+
+    def __init__(self, initial=2, min_limit=1, max_limit=16, window=20, latency_tolerance=2.0,
+                 max_timeout_rate=0.1, max_failure_rate=0.25, backoff=0.7, baseline_decay=0.1,
+                 max_cpu_load=0.9, min_free_memory=0.1, load_probe=host_load):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = min(max(initial, self.min_limit), self.max_limit)
+        self.window = window
+        self.latency_tolerance = latency_tolerance
+        self.max_timeout_rate = max_timeout_rate
+        self.max_failure_rate = max_failure_rate
+        self.backoff = backoff
+        self.baseline_decay = baseline_decay
+        self.max_cpu_load = max_cpu_load
+        self.min_free_memory = min_free_memory
+        self.load_probe = load_probe
+
+        self.lock = threading.Lock()
+        self.latencies = deque(maxlen=window)
+        self.samples = 0
+        self.timeouts = 0
+        self.failures = 0
+        self.peak_in_flight = 0
+        self.best_p95 = None
+        self.last = {'p95': None, 'timeout_rate': 0.0, 'failure_rate': 0.0, 'cpu_load': None, 'free_memory': None,
+                     'reason': 'start'}
+        self.increases = 0
+        self.decreases = 0
+
+    def observe_in_flight(self, in_flight):
+        """Called by the scheduler so increases only happen when the limit is actually used"""
+        with self.lock:
+            self.peak_in_flight = max(self.peak_in_flight, in_flight)
+
+    def record(self, seconds=None, ok=True, timeout=False):
+        """One page result; returns the new limit when this sample triggered an adjustment"""
+        with self.lock:
+            if seconds is not None:
+                self.latencies.append(seconds)
+            self.samples += 1
+            self.failures += not ok
+            self.timeouts += timeout
+            if self.samples < self.window:
+                return None
+            return self._adjust()
+
+    def _adjust(self):
+        latencies = sorted(self.latencies)
+        p95 = latencies[min(len(latencies) - 1, math.ceil(0.95 * len(latencies)) - 1)] if latencies else None
+        timeout_rate = self.timeouts / self.samples
+        failure_rate = self.failures / self.samples
+        cpu_load, free_memory = self.load_probe()
+
+        if p95 is not None:
+            if self.best_p95 is None or p95 < self.best_p95:
+                self.best_p95 = p95
+            else:
+                self.best_p95 += self.baseline_decay * (p95 - self.best_p95)
+
+        if timeout_rate > self.max_timeout_rate:
+            reason = 'timeouts'
+        elif failure_rate > self.max_failure_rate:
+            reason = 'errors'
+        elif p95 is not None and p95 > self.latency_tolerance * self.best_p95:
+            reason = 'latency'
+        elif free_memory is not None and free_memory < self.min_free_memory:
+            reason = 'memory'
+        elif cpu_load is not None and cpu_load > self.max_cpu_load:
+            reason = 'cpu'
+        else:
+            reason = None
+
+        previous = self.limit
+        if reason:
+            self.limit = max(self.min_limit, int(self.limit * self.backoff))
+            self.decreases += self.limit < previous
+        elif self.peak_in_flight >= self.limit:
+            self.limit = min(self.max_limit, self.limit + 1)
+            self.increases += self.limit > previous
+            reason = 'headroom'
+        else:
+            reason = 'idle'
+
+        self.last = {
+            'p95': round(p95, 3) if p95 is not None else None,
+            'timeout_rate': round(timeout_rate, 3),
+            'failure_rate': round(failure_rate, 3),
+            'cpu_load': round(cpu_load, 2) if cpu_load is not None else None,
+            'free_memory': round(free_memory, 3) if free_memory is not None else None,
+            'reason': reason
+        }
+
+        # Start a fresh window
+        self.latencies.clear()
+        self.samples = self.timeouts = self.failures = 0
+        self.peak_in_flight = 0
+        return self.limit
+
+    def metrics(self):
+        """Current limit, bounds and the signals behind the last decision"""
+        with self.lock:
+            metrics = {
+                'limit': self.limit,
+                'min_limit': self.min_limit,
+                'max_limit': self.max_limit,
+                'best_p95': round(self.best_p95, 3) if self.best_p95 is not None else None,
+                'increases': self.increases,
+                'decreases': self.decreases,
+                'updated_at': time.time()
+            }
+            metrics.update(self.last)
+            return metrics
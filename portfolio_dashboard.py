@@ -7,13 +7,16 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-import json
-import pickle
 import os
 from datetime import datetime
-import glob
 import numpy as np
-from collections import Counter
+from portfolio_aggregates import PortfolioAggregates
+from portfolio_dataset import find_dataset, load_aggregates, load_dataset
+from portfolio_records import CompanyRecord
+from portfolio_export import DOWNLOAD_FORMATS, build_columns, export_bytes
+from portfolio_search import build_email_index, build_founder_index
+from portfolio_jobs import JobManager
+from portfolio_runs import CHANGE_KINDS, RunRegistry, summarize
 
 st.set_page_config(
     page_title="🚀 Portfolio Scraper Dashboard",
@@ -74,99 +77,343 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+RUNS_DIR = '.portfolio_cache'  # where scrapes started from this dashboard record their runs
+
 # Initialize session state
-if 'portfolio_data' not in st.session_state:
-    st.session_state.portfolio_data = []
-if 'scraping' not in st.session_state:
-    st.session_state.scraping = False
+if 'data_file' not in st.session_state:
+    st.session_state.data_file = None  # None = newest file on disk, '' = cleared
+
+def current_data_source():
+    """(path, mtime) of the selected dataset - the cache key for everything below"""
+    path = st.session_state.data_file
+    if path is None:
+        path = find_dataset()
+    if not path:
+        return None
+    try:
+        return path, os.path.getmtime(path)
+    except OSError:
+        return None
+
+@st.cache_resource(max_entries=4, show_spinner="Loading portfolio data...")
+def load_records(path, mtime):
+    """Load a dataset file once per (path, mtime) - shared, treat as read-only"""
+    try:
+        return load_dataset(path)
+    except Exception:
+        return []
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def load_frames(path, mtime):
+    """Companies, founders and emails DataFrames, built once per dataset version"""
+    columns = build_columns(load_records(path, mtime))
+    return {name: pd.DataFrame(table) for name, table in columns.items()}
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def get_aggregates(path, mtime):
+    """Precomputed analytics summaries of a dataset version - shared, treat as read-only"""
+    try:
+        return load_aggregates(path)
+    except Exception:
+        return PortfolioAggregates()
+
+def tech_counts(path, mtime, top=15):
+    """Most common tech tags across the portfolio"""
+    return get_aggregates(path, mtime).tech.most_common(top)
+
+@st.cache_resource
+def get_job_manager():
+    """Process-wide background job manager - survives reruns and browser refreshes"""
+    return JobManager(scraper_options={'headless': True})
 
-def load_portfolio_data():
-    """Load portfolio data from files"""
-    # Try pickle first
-    if os.path.exists('portfolio_data.pkl'):
-        try:
-            with open('portfolio_data.pkl', 'rb') as f:
-                return pickle.load(f)
-        except:
-            pass
+JOB_STATE_ICONS = {
+    'queued': '⏳', 'running': '🔄', 'done': '✅',
+    'failed': '❌', 'cancelled': '⏹️', 'interrupted': '⚠️'
+}
+
+@st.cache_resource
+def open_run_registry():
+    """Run history shared by every session"""
+    return RunRegistry(RUNS_DIR)
+
+def get_run_registry():
+    """The shared registry, or None until a run has been recorded (checked on every rerun)"""
+    if not os.path.exists(os.path.join(RUNS_DIR, RunRegistry.FILENAME)):
+        return None
+    return open_run_registry()
+
+CHANGE_TITLES = {
+    'new_company': '🆕 New companies',
+    'new_founder': '👤 New founders',
+    'departed_founder': '👋 Departed founders',
+    'new_email': '📧 New emails'
+}
+
+def display_history():
+    """Recorded runs and what the selected run (or range of runs) changed"""
+    registry = get_run_registry()
+    runs = registry.runs(limit=50) if registry is not None else []
+    if not runs:
+        st.info("No runs recorded yet - history starts with the next scrape")
+        return
     
-    # Try JSON files
-    json_files = glob.glob('portfolio_data_*.json')
-    if json_files:
-        latest = max(json_files, key=os.path.getctime)
-        try:
-            with open(latest, 'r') as f:
-                return json.load(f)
-        except:
-            pass
+    st.dataframe(pd.DataFrame(runs)[['id', 'run_id', 'portfolio_url', 'companies', 'changed', 'finished_at']],
+                 use_container_width=True, hide_index=True)
     
-    return []
+    labels = {r['id']: f"#{r['id']} - {r['run_id']}" for r in runs}
+    col1, col2 = st.columns(2)
+    with col1:
+        run = st.selectbox("Run", list(labels), format_func=labels.get)
+    with col2:
+        earlier = [r for r in labels if r < run]
+        since = st.selectbox("Compared with", [None] + earlier,
+                             format_func=lambda r: "previous run" if r is None else labels[r])
+    
+    changes = registry.changes(run, since)
+    counts = summarize(changes)
+    for col, kind in zip(st.columns(len(CHANGE_KINDS)), CHANGE_KINDS):
+        col.metric(CHANGE_TITLES[kind], counts[kind])
+    
+    for kind in CHANGE_KINDS:
+        rows = [
+            {'Company': c['company_name'], 'Item': c['item'], 'Detail': c['detail'], 'Run': c['run']}
+            for c in changes if c['kind'] == kind
+        ]
+        if rows:
+            with st.expander(f"{CHANGE_TITLES[kind]} ({len(rows)})", expanded=len(rows) <= 20):
+                st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
 
-def run_portfolio_scraper(urls):
-    """Run the portfolio scraper"""
-    from portfolio_scraper import PortfolioScraper
+@st.fragment(run_every=2)
+def display_jobs():
+    """Poll the job status files; only this fragment reruns while jobs are active"""
+    manager = get_job_manager()
+    jobs = manager.list_jobs()[:5]
+    if not jobs:
+        return
     
-    progress_placeholder = st.empty()
-    status_placeholder = st.empty()
-    results_placeholder = st.empty()
+    st.markdown("### 🛠️ Scraping Jobs")
+    for job in jobs:
+        icon = JOB_STATE_ICONS.get(job['state'], '•')
+        st.markdown(f"{icon} **{job['portfolio_url']}** - {job['state']}")
+        
+        if job['state'] == 'running':
+            progress = job['done'] / job['total'] if job['total'] else 0.0
+            st.progress(progress, text=f"{job['done']}/{job['total']} {job['current']}")
+            st.caption(
+                f"{job['companies_scraped']} companies · {job['founders']} founders · "
+                f"{job['emails']} emails · {job.get('errors', 0)} errors"
+            )
+        elif job['state'] == 'failed' and job['error']:
+            st.caption(job['error'].splitlines()[0])
+        
+        if job['state'] in ('queued', 'running'):
+            if st.button("Cancel", key=f"cancel_{job['job_id']}"):
+                manager.cancel(job['job_id'])
     
-    scraper = PortfolioScraper(headless=False)
+    # Reload the main view once when a job finishes (its data was just saved)
+    finished = sum(1 for job in jobs if job['state'] == 'done')
+    if st.session_state.get('jobs_finished', finished) != finished:
+        st.session_state.jobs_finished = finished
+        st.rerun(scope="app")
+    st.session_state.jobs_finished = finished
+
+@st.cache_resource(max_entries=4, show_spinner="Building search index...")
+def search_indexes(path, mtime):
+    """Founder and email search indexes, built once per dataset version"""
+    return {
+        'founders': build_founder_index(load_records(path, mtime)),
+        'emails': build_email_index(load_frames(path, mtime)['emails'])
+    }
+
+MATCH_LABELS = {
+    'name': 'Founder Name',
+    'company': 'Company Name',
+    'role': 'Role',
+    'email': 'Email',
+    'links': 'Social Profile',
+    'domain': 'Domain',
+}
+
+SORT_OPTIONS = {
+    "Original order": None,
+    "Most founders": ('founders_count', False),
+    "Most emails": ('emails_count', False),
+    "Name (A-Z)": ('company_name', True),
+    "Recently changed": ('last_changed', False),
+}
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def filter_companies(path, mtime, min_founders, has_email, tech_tags, sort_by):
+    """Row positions of the companies matching the filters, in display order"""
+    df = load_frames(path, mtime)['companies']
+    mask = df['founders_count'] >= min_founders
+    if has_email:
+        mask &= df['emails_count'] > 0
+    if tech_tags:
+        wanted = set(tech_tags)
+        mask &= df['tech_stack'].map(lambda tags: not wanted.isdisjoint(tags))
     
-    try:
-        for url in urls:
-            status_placeholder.info(f"🔍 Scraping portfolio: {url}")
-            
-            # Find companies
-            companies = scraper.find_portfolio_companies(url)
-            progress_placeholder.progress(0.1)
-            
-            if companies:
-                status_placeholder.info(f"📂 Found {len(companies)} companies to scrape...")
+    view = df[mask]
+    sort = SORT_OPTIONS.get(sort_by)
+    if sort:
+        column, ascending = sort
+        view = view.sort_values(column, ascending=ascending, kind='stable')
+    return view.index.to_numpy()
+
+def company_filters():
+    """Companies tab filter values (also read by the download panel, which renders first)"""
+    state = st.session_state
+    return (
+        int(state.get('filter_min_founders', 0)),
+        bool(state.get('filter_has_email', False)),
+        tuple(state.get('filter_tech_tags', ())),
+        state.get('filter_sort_by', next(iter(SORT_OPTIONS)))
+    )
+
+DOWNLOAD_LABELS = {'xlsx': "📊 Excel", 'csv': "📄 CSV", 'json': "🧾 JSON"}
+DOWNLOAD_SCOPES = {
+    'all': "Whole dataset",
+    'filtered': "Companies tab filters",
+    'search': "Founder search results",
+}
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def export_file(path, mtime, fmt, scope, filters, search):
+    """Download file for one dataset version and view, built only when first requested"""
+    data = load_records(path, mtime)
+    if scope == 'filtered':
+        data = [data[i] for i in filter_companies(path, mtime, *filters)]
+    elif scope == 'search':
+        # Companies with a matching founder, keeping only the matching founders
+        matched = {}
+        for (c, f), _, _ in search_indexes(path, mtime)['founders'].search(search, limit=len(data) * 50):
+            matched.setdefault(c, []).append(f)
+        subset = []
+        for c, founder_positions in matched.items():
+            company = data[c]
+            subset.append(CompanyRecord(
+                company.company_name, company.company_url, company.description,
+                [company.founders[f] for f in sorted(founder_positions)], company.all_emails,
+                company.tech_stack, company.scraped_at, company.last_changed, company.social
+            ))
+        data = subset
+    return export_bytes(data, fmt)
+
+def display_downloads(source):
+    """Format / scope pickers and a download button that builds the file on click"""
+    search = st.session_state.get('founder_search', '').strip()
+    scopes = [scope for scope in DOWNLOAD_SCOPES if scope != 'search' or search]
+    
+    fmt = st.selectbox("Format", list(DOWNLOAD_FORMATS), format_func=DOWNLOAD_LABELS.get)
+    scope = st.radio("Rows", scopes, format_func=DOWNLOAD_SCOPES.get)
+    filters = company_filters() if scope == 'filtered' else None
+    
+    path, mtime = source
+    stamp = datetime.fromtimestamp(mtime).strftime("%Y%m%d_%H%M%S")
+    suffix = '' if scope == 'all' else f'_{scope}'
+    st.download_button(
+        f"{DOWNLOAD_LABELS[fmt]} Download",
+        data=lambda: export_file(path, mtime, fmt, scope, filters, search if scope == 'search' else ''),
+        file_name=f"portfolio_founders_{stamp}{suffix}.{fmt}",
+        mime=DOWNLOAD_FORMATS[fmt]
+    )
+
+def display_company_browser(data, source):
+    """Filtered, sorted, paginated company list - only the visible page is rendered"""
+    all_tags = [tag for tag, _ in tech_counts(*source, top=None)]
+    
+    col1, col2, col3, col4 = st.columns([1, 1, 2, 1])
+    with col1:
+        min_founders = st.number_input("Min founders", min_value=0, value=0, step=1, key='filter_min_founders')
+    with col2:
+        has_email = st.checkbox("Has email", value=False, key='filter_has_email')
+    with col3:
+        tech_tags = st.multiselect("Tech stack", all_tags, key='filter_tech_tags')
+    with col4:
+        sort_by = st.selectbox("Sort by", list(SORT_OPTIONS), key='filter_sort_by')
+    
+    positions = filter_companies(*source, *company_filters())
+    
+    if not len(positions):
+        st.info("No companies match these filters")
+        return
+    
+    col1, col2, col3 = st.columns([1, 1, 2])
+    with col1:
+        page_size = st.selectbox("Per page", [10, 25, 50, 100], index=1)
+    page_count = (len(positions) + page_size - 1) // page_size
+    with col2:
+        page = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1)
+    with col3:
+        start = (page - 1) * page_size
+        end = min(start + page_size, len(positions))
+        st.caption(f"Showing {start + 1}-{end} of {len(positions)} companies (page {page}/{page_count})")
+    
+    for i, position in enumerate(positions[start:end]):
+        display_company(data[position], expanded=(page == 1 and i < 5))  # Expand first 5
+
+def display_company(company, expanded=False):
+    """Render one company card"""
+    with st.expander(
+        f"**{company.company_name}** - {company.founders_count} founders, {company.emails_count} emails",
+        expanded=expanded
+    ):
+        # Company info
+        col1, col2 = st.columns([3, 1])
                 
-                # Scrape each company
-                for i, company in enumerate(companies):
-                    progress = 0.1 + (0.9 * (i / len(companies)))
-                    progress_placeholder.progress(progress)
-                    status_placeholder.info(f"🏢 [{i+1}/{len(companies)}] Scraping {company['name']}...")
-                    
-                    company_data = scraper.scrape_company(company['url'], company['name'])
+        with col1:
+            st.markdown(f"🔗 **Website:** {company['company_url']}")
+            if company['description']:
+                st.markdown(f"📝 **Description:** {company['description']}")
+            if company['tech_stack']:
+                st.markdown(f"💻 **Tech Stack:** {', '.join(company['tech_stack'])}")
+            if company.social:
+                st.markdown("🌐 **Social:** " + ' · '.join(f"[{network.title()}]({url})"
+                                                         for network, url in company.social.items()))
+                
+        with col2:
+            st.metric("Founders", company.founders_count)
+            st.metric("Emails", company.emails_count)
+                
+        # Founders
+        if company['founders']:
+            st.markdown("### 👥 Founders & Team")
                     
-                    if company_data:
-                        scraper.portfolio_data.append(company_data)
+            for founder in company['founders']:
+                founder_info = f"**{founder['name']}** - {founder['role']}"
                         
-                        # Show live results
-                        with results_placeholder.container():
-                            col1, col2, col3 = st.columns(3)
-                            with col1:
-                                st.metric("Companies Scraped", len(scraper.portfolio_data))
-                            with col2:
-                                total_founders = sum(len(c['founders']) for c in scraper.portfolio_data)
-                                st.metric("Total Founders", total_founders)
-                            with col3:
-                                total_emails = sum(len(c['all_emails']) for c in scraper.portfolio_data)
-                                st.metric("Total Emails", total_emails)
-                
-                # Save final data
-                scraper.save_all_formats()
-                progress_placeholder.progress(1.0)
-                status_placeholder.success(f"✅ Completed! Scraped {len(scraper.portfolio_data)} companies")
+                if founder.get('email'):
+                    founder_info += f" | 📧 {founder['email']}"
+                    if founder.get('email_source') == 'inferred':
+                        founder_info += " *(inferred)*"
+                        
+                if founder.get('linkedin'):
+                    founder_info += f" | [LinkedIn]({founder['linkedin']})"
+                        
+                if founder.get('twitter'):
+                    founder_info += f" | [Twitter]({founder['twitter']})"
+                        
+                st.markdown(founder_info)
+        else:
+            st.info("No founders found for this company")
                 
-                # Update session state
-                st.session_state.portfolio_data = scraper.portfolio_data
-            else:
-                status_placeholder.error("❌ No companies found on portfolio page")
-        
-    finally:
-        scraper.close()
+        # Emails
+        if company['all_emails']:
+            st.markdown("### 📧 All Emails Found")
+            email_cols = st.columns(3)
+            for idx, email in enumerate(company['all_emails']):
+                with email_cols[idx % 3]:
+                    st.markdown(f"`{email}`")
 
-def display_metrics(data):
+def display_metrics(aggregates):
     """Display summary metrics"""
     col1, col2, col3, col4 = st.columns(4)
     
-    total_companies = len(data)
-    total_founders = sum(len(c['founders']) for c in data)
-    total_emails = sum(len(c['all_emails']) for c in data)
-    companies_with_founders = sum(1 for c in data if c['founders'])
+    totals = aggregates.totals()
+    total_companies = totals['companies']
+    total_founders = totals['founders']
+    total_emails = totals['emails']
+    companies_with_founders = totals['with_founders']
     
     with col1:
         st.metric("🏢 Companies", total_companies)
@@ -181,6 +428,8 @@ def display_metrics(data):
         st.metric("✅ With Founders", f"{companies_with_founders}/{total_companies}")
 
 def main():
+    source = current_data_source()
+    
     # Header
     st.markdown("""
     <div class="main-header">
@@ -211,153 +460,98 @@ https://500.co/portfolio
 https://techstars.com/portfolio
             """)
         
-        if st.button("🚀 START SCRAPING", type="primary", disabled=st.session_state.scraping):
+        if st.button("🚀 START SCRAPING", type="primary"):
             if portfolio_url:
-                st.session_state.scraping = True
-                run_portfolio_scraper([portfolio_url])
-                st.session_state.scraping = False
-                st.rerun()
+                get_job_manager().submit(portfolio_url)
+                st.success("Scraping job queued - it runs in the background")
             else:
                 st.warning("Please enter a portfolio URL")
         
+        display_jobs()
+        
         st.markdown("---")
         
         # Data management
         if st.button("🔄 Load Previous Data"):
-            st.session_state.portfolio_data = load_portfolio_data()
-            st.success(f"Loaded {len(st.session_state.portfolio_data)} companies")
+            st.session_state.data_file = None
+            source = current_data_source()
+            if source:
+                st.success(f"Loaded {len(load_records(*source))} companies")
             st.rerun()
         
         if st.button("🗑️ Clear All Data"):
-            st.session_state.portfolio_data = []
+            st.session_state.data_file = ''
             st.rerun()
         
-        # Download section
-        if st.session_state.portfolio_data:
+        # Download section - files are built from the loaded dataset on click
+        if source:
             st.markdown("---")
             st.markdown("### 📥 Download Data")
-            
-            # Find latest files
-            excel_files = glob.glob('portfolio_founders_*.xlsx')
-            csv_files = glob.glob('portfolio_founders_*.csv')
-            
-            if excel_files:
-                latest_excel = max(excel_files, key=os.path.getctime)
-                with open(latest_excel, 'rb') as f:
-                    st.download_button(
-                        "📊 Download Excel",
-                        data=f.read(),
-                        file_name=latest_excel,
-                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                    )
-            
-            if csv_files:
-                latest_csv = max(csv_files, key=os.path.getctime)
-                with open(latest_csv, 'rb') as f:
-                    st.download_button(
-                        "📄 Download CSV",
-                        data=f.read(),
-                        file_name=latest_csv,
-                        mime="text/csv"
-                    )
+            display_downloads(source)
     
-    # Load data
-    if not st.session_state.portfolio_data:
-        st.session_state.portfolio_data = load_portfolio_data()
+    # Load data (cached per file version)
+    data = load_records(*source) if source else []
     
     # Main content
-    if st.session_state.portfolio_data:
+    if data:
         # Display metrics
-        display_metrics(st.session_state.portfolio_data)
+        aggregates = get_aggregates(*source)
+        display_metrics(aggregates)
         
         # Tabs
-        tab1, tab2, tab3, tab4 = st.tabs([
+        tab1, tab2, tab3, tab4, tab5 = st.tabs([
             "🏢 Companies & Founders", 
             "📊 Analytics", 
             "📧 All Emails",
-            "🔍 Search"
+            "🔍 Search",
+            "🕒 History"
         ])
         
         with tab1:
             st.markdown("## 🏢 Portfolio Companies")
-            
-            # Display each company
-            for i, company in enumerate(st.session_state.portfolio_data):
-                with st.expander(
-                    f"**{company['company_name']}** - {len(company['founders'])} founders, {len(company['all_emails'])} emails",
-                    expanded=(i < 5)  # Expand first 5
-                ):
-                    # Company info
-                    col1, col2 = st.columns([3, 1])
-                    
-                    with col1:
-                        st.markdown(f"🔗 **Website:** {company['company_url']}")
-                        if company['description']:
-                            st.markdown(f"📝 **Description:** {company['description']}")
-                        if company['tech_stack']:
-                            st.markdown(f"💻 **Tech Stack:** {', '.join(company['tech_stack'])}")
-                    
-                    with col2:
-                        st.metric("Founders", len(company['founders']))
-                        st.metric("Emails", len(company['all_emails']))
-                    
-                    # Founders
-                    if company['founders']:
-                        st.markdown("### 👥 Founders & Team")
-                        
-                        for founder in company['founders']:
-                            founder_info = f"**{founder['name']}** - {founder['role']}"
-                            
-                            if founder.get('email'):
-                                founder_info += f" | 📧 {founder['email']}"
-                            
-                            if founder.get('linkedin'):
-                                founder_info += f" | [LinkedIn]({founder['linkedin']})"
-                            
-                            if founder.get('twitter'):
-                                founder_info += f" | [Twitter]({founder['twitter']})"
-                            
-                            st.markdown(founder_info)
-                    else:
-                        st.info("No founders found for this company")
-                    
-                    # Emails
-                    if company['all_emails']:
-                        st.markdown("### 📧 All Emails Found")
-                        email_cols = st.columns(3)
-                        for idx, email in enumerate(company['all_emails']):
-                            with email_cols[idx % 3]:
-                                st.markdown(f"`{email}`")
+            display_company_browser(data, source)
         
         with tab2:
             st.markdown("## 📊 Portfolio Analytics")
             
+            # Everything below renders from the precomputed aggregates
+            coverage = aggregates.coverage()
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("Companies with emails", f"{coverage['companies_with_emails']:.0%}")
+            col2.metric("Founders with email", f"{coverage['founders_with_email']:.0%}")
+            col3.metric("Founders with LinkedIn", f"{coverage['founders_with_linkedin']:.0%}")
+            col4.metric("Inferred emails", f"{coverage['inferred_emails']:.0%}")
+            
             # Companies with/without founders
             fig1 = go.Figure(data=[
-                go.Bar(name='With Founders', x=['Companies'], y=[sum(1 for c in st.session_state.portfolio_data if c['founders'])]),
-                go.Bar(name='Without Founders', x=['Companies'], y=[sum(1 for c in st.session_state.portfolio_data if not c['founders'])])
+                go.Bar(name='With Founders', x=['Companies'], y=[aggregates.with_founders]),
+                go.Bar(name='Without Founders', x=['Companies'], y=[aggregates.companies - aggregates.with_founders])
             ])
             fig1.update_layout(title="Companies with Founder Data", barmode='stack')
             st.plotly_chart(fig1, use_container_width=True)
             
             # Founders per company
-            company_names = [c['company_name'][:20] for c in st.session_state.portfolio_data[:20]]
-            founder_counts = [len(c['founders']) for c in st.session_state.portfolio_data[:20]]
+            top_companies = aggregates.top_companies()
+            company_names = [c['company_name'][:20] for c in top_companies]
+            founder_counts = [c['founders'] for c in top_companies]
             
             fig2 = go.Figure(data=[go.Bar(x=company_names, y=founder_counts, marker_color='lightblue')])
-            fig2.update_layout(title="Founders per Company (Top 20)", xaxis_tickangle=-45)
+            fig2.update_layout(title=f"Founders per Company (Top {len(top_companies)})", xaxis_tickangle=-45)
             st.plotly_chart(fig2, use_container_width=True)
             
+            # How many founders companies have
+            histogram = sorted(aggregates.founder_histogram.items())
+            fig4 = go.Figure(data=[go.Bar(x=[k for k, _ in histogram], y=[v for _, v in histogram])])
+            fig4.update_layout(title="Companies by Number of Founders", xaxis_title="Founders", yaxis_title="Companies")
+            st.plotly_chart(fig4, use_container_width=True)
+            
             # Tech stack distribution
-            all_tech = []
-            for c in st.session_state.portfolio_data:
-                all_tech.extend(c['tech_stack'])
+            top_tech = tech_counts(*source)
             
-            if all_tech:
-                tech_counts = Counter(all_tech).most_common(15)
+            if top_tech:
                 fig3 = go.Figure(data=[go.Bar(
-                    x=[t[1] for t in tech_counts],
-                    y=[t[0] for t in tech_counts],
+                    x=[t[1] for t in top_tech],
+                    y=[t[0] for t in top_tech],
                     orientation='h'
                 )])
                 fig3.update_layout(title="Most Common Technologies")
@@ -366,72 +560,52 @@ https://techstars.com/portfolio
         with tab3:
             st.markdown("## 📧 All Email Addresses")
             
-            # Collect all emails
-            all_emails = []
-            for company in st.session_state.portfolio_data:
-                for email in company['all_emails']:
-                    all_emails.append({
-                        'Email': email,
-                        'Company': company['company_name'],
-                        'Domain': email.split('@')[-1] if '@' in email else ''
-                    })
+            emails_df = load_frames(*source)['emails']
             
-            if all_emails:
-                email_df = pd.DataFrame(all_emails)
+            if len(emails_df):
+                email_df = emails_df[['email', 'company_name', 'domain']].rename(
+                    columns={'email': 'Email', 'company_name': 'Company', 'domain': 'Domain'}
+                )
                 
                 # Email search
                 search = st.text_input("🔍 Search emails", placeholder="Search by email, company, or domain...")
                 
                 if search:
-                    mask = (
-                        email_df['Email'].str.contains(search, case=False) |
-                        email_df['Company'].str.contains(search, case=False) |
-                        email_df['Domain'].str.contains(search, case=False)
-                    )
-                    filtered_df = email_df[mask]
+                    hits = search_indexes(*source)['emails'].search(search, limit=len(email_df))
+                    filtered_df = email_df.iloc[[position for position, _, _ in hits]]
                 else:
                     filtered_df = email_df
                 
                 st.dataframe(filtered_df, use_container_width=True, height=600)
                 
                 # Domain distribution
-                domain_counts = email_df['Domain'].value_counts().head(10)
-                fig = px.pie(values=domain_counts.values, names=domain_counts.index, title="Top Email Domains")
+                domain_counts = aggregates.email_domains.most_common(10)
+                fig = px.pie(values=[n for _, n in domain_counts], names=[d for d, _ in domain_counts],
+                             title="Top Email Domains")
                 st.plotly_chart(fig, use_container_width=True)
         
         with tab4:
             st.markdown("## 🔍 Search Founders")
             
-            search_term = st.text_input("Search for founders, companies, or roles", placeholder="e.g., CEO, John, Tech Company...")
+            search_term = st.text_input("Search for founders, companies, or roles", placeholder="e.g., CEO, John, Tech Company...",
+                                        key='founder_search')
             
             if search_term:
                 results = []
                 
-                for company in st.session_state.portfolio_data:
-                    # Search in company name
-                    if search_term.lower() in company['company_name'].lower():
-                        for founder in company['founders']:
-                            results.append({
-                                'Company': company['company_name'],
-                                'Founder': founder['name'],
-                                'Role': founder['role'],
-                                'Email': founder.get('email', ''),
-                                'LinkedIn': founder.get('linkedin', ''),
-                                'Match': 'Company Name'
-                            })
-                    
-                    # Search in founders
-                    for founder in company['founders']:
-                        if (search_term.lower() in founder['name'].lower() or 
-                            search_term.lower() in founder['role'].lower()):
-                            results.append({
-                                'Company': company['company_name'],
-                                'Founder': founder['name'],
-                                'Role': founder['role'],
-                                'Email': founder.get('email', ''),
-                                'LinkedIn': founder.get('linkedin', ''),
-                                'Match': 'Founder/Role'
-                            })
+                # Ranked hits from the prebuilt index (prefix and typo tolerant)
+                for (c, f), score, field in search_indexes(*source)['founders'].search(search_term, limit=500):
+                    company = data[c]
+                    founder = company.founders[f]
+                    results.append({
+                        'Company': company.company_name,
+                        'Founder': founder.name,
+                        'Role': founder.role,
+                        'Email': founder.email,
+                        'Email Source': founder.email_source,
+                        'LinkedIn': founder.linkedin,
+                        'Match': MATCH_LABELS.get(field, field)
+                    })
                 
                 if results:
                     st.success(f"Found {len(results)} matches")
@@ -439,6 +613,10 @@ https://techstars.com/portfolio
                     st.dataframe(results_df, use_container_width=True)
                 else:
                     st.info("No matches found")
+        
+        with tab5:
+            st.markdown("## 🕒 Run History")
+            display_history()
     
     else:
         # Welcome screen
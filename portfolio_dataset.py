@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Dataset access - one loader for both dashboards and the tools
+
+load_dataset(path) reads anything the scraper has written and returns
+CompanyRecords on the current schema:
+
+    portfolio_data.pkl                 pickled records (dashboard snapshot)
+    portfolio_data_<ts>.json           versioned envelope, or a bare list from older runs
+    sample_portfolio_data.json         {'companies': [...]} without a version
+    portfolio_companies_<ts>.arrow     Arrow IPC tables, memory-mapped (the founders /
+    portfolio_companies_<ts>.parquet   emails files of the same run are read alongside)
+
+detect_schema() tells which layout a JSON payload uses and migrate() upgrades
+it one version at a time. JSON is decoded with orjson when it is installed.
+Loaded datasets are cached in-process per (path, mtime, size), so every
+rerun and every dashboard in the process parses a file once.
+load_aggregates() returns the dataset's PortfolioAggregates - the persisted
+sidecar when it matches the file, else computed once from the records.
+"""
+
+import glob
+import json
+import os
+import pickle
+import re
+import threading
+from collections import OrderedDict
+
+from portfolio_aggregates import PortfolioAggregates, read_aggregates
+from portfolio_records import SCHEMA_VERSION, CompanyRecord, FounderRecord, to_records
+
+SNAPSHOT_FILE = 'portfolio_data.pkl'
+SAMPLE_FILE = 'sample_portfolio_data.json'
+COLUMNAR_RE = re.compile(r'portfolio_(companies|founders|emails)_(.+)\.(parquet|arrow)$')
+
+CACHE_SIZE = 4
+_cache = OrderedDict()   # path -> ((mtime_ns, size), records)
+_aggregates = OrderedDict()   # path -> ((mtime_ns, size), PortfolioAggregates)
+_cache_lock = threading.Lock()
+
+
+# Schema versions and migrations ------------------------------------------
+#
+#   0  {'companies': [{'name', 'url', ...}]}    early static-dashboard layout
+#   1  [{'company_name', 'company_url', ...}]   bare list, before the envelope
+#   2  {'schema_version': 2, 'companies': ...}   adds last_changed
+#   3  {'schema_version': 3, ...}                founders gain email_source
+#   4  current                                   companies gain social links
+
+def detect_schema(data):
+    """Schema version of a decoded JSON / pickled payload"""
+    if isinstance(data, dict):
+        if 'schema_version' in data:
+            return int(data['schema_version'])
+        companies = data.get('companies') or []
+    else:
+        companies = data or []
+
+    first = next(iter(companies), None)
+    if isinstance(first, dict) and 'company_name' not in first and 'name' in first:
+        return 0
+    return 1
+
+
+def _v0_to_v1(data):
+    companies = data.get('companies') or [] if isinstance(data, dict) else data
+    return [dict(c, company_name=c.get('name', ''), company_url=c.get('url', '')) for c in companies]
+
+
+def _v1_to_v2(data):
+    companies = data.get('companies', []) if isinstance(data, dict) else data
+    return {
+        'schema_version': 2,
+        'companies': [dict(c, last_changed=c.get('last_changed') or c.get('scraped_at', '')) for c in companies]
+    }
+
+
+def _v2_to_v3(data):
+    return {
+        'schema_version': 3,
+        'companies': [
+            dict(c, founders=[dict(f, email_source=f.get('email_source', '')) for f in c.get('founders') or []])
+            for c in data['companies']
+        ]
+    }
+
+
+def _v3_to_v4(data):
+    return {
+        'schema_version': 4,
+        'companies': [dict(c, social=c.get('social') or {}) for c in data['companies']]
+    }
+
+
+MIGRATIONS = {0: _v0_to_v1, 1: _v1_to_v2, 2: _v2_to_v3, 3: _v3_to_v4}
+
+
+def migrate(data):
+    """Upgrade a decoded JSON payload to the current versioned envelope"""
+    version = detect_schema(data)
+    if version > SCHEMA_VERSION:
+        raise ValueError(f"Dataset schema v{version} is newer than this code (v{SCHEMA_VERSION})")
+    while version < SCHEMA_VERSION:
+        data = MIGRATIONS[version](data)
+        version += 1
+    return data
+
+
+# Readers ------------------------------------------------------------------
+
+def read_json(path):
+    """Decoded JSON file, through orjson when available"""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    try:
+        import orjson
+    except ImportError:
+        return json.loads(raw)
+    return orjson.loads(raw)
+
+
+def _read_pickle(path):
+    with open(path, 'rb') as f:
+        data = pickle.load(f)
+    # Records migrate themselves when unpickled; plain dicts go through migrate()
+    if isinstance(data, list) and all(isinstance(c, CompanyRecord) for c in data):
+        return data
+    return to_records(migrate(data))
+
+
+def columnar_paths(path):
+    """{table: path} of the run a companies / founders / emails file belongs to"""
+    match = COLUMNAR_RE.search(os.path.basename(path))
+    if not match:
+        raise ValueError(f"Not a columnar export: {path}")
+    _, timestamp, fmt = match.groups()
+    directory = os.path.dirname(path)
+    return {
+        table: os.path.join(directory, f'portfolio_{table}_{timestamp}.{fmt}')
+        for table in ('companies', 'founders', 'emails')
+    }
+
+
+def _read_table(path):
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise ImportError("Reading columnar datasets needs pyarrow: pip install pyarrow")
+
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        return pq.read_table(path, memory_map=True)
+    return pa.ipc.open_file(pa.memory_map(path)).read_all()
+
+
+def _read_columnar(path):
+    """CompanyRecords rebuilt from the three tables of one columnar export"""
+    tables = {}
+    for table, table_path in columnar_paths(path).items():
+        if os.path.exists(table_path):
+            tables[table] = _read_table(table_path).to_pydict()
+    if 'companies' not in tables:
+        raise FileNotFoundError(f"Companies table missing for {path}")
+
+    companies = tables['companies']
+    socials = companies.get('social') or [None] * len(companies['company_url'])
+    records = {}
+    for i, url in enumerate(companies['company_url']):
+        records[url] = CompanyRecord(
+            companies['company_name'][i], url, companies['description'][i],
+            tech_stack=companies['tech_stack'][i] or (),
+            scraped_at=companies['scraped_at'][i], last_changed=companies['last_changed'][i],
+            social=dict(socials[i] or ())
+        )
+
+    founders = tables.get('founders')
+    if founders:
+        sources = founders.get('email_source') or [''] * len(founders['name'])
+        for i, url in enumerate(founders['company_url']):
+            if url in records:
+                records[url].add_founder(FounderRecord(
+                    founders['name'][i], founders['role'][i], founders['email'][i],
+                    founders['linkedin'][i], founders['twitter'][i], sources[i]
+                ))
+
+    emails = tables.get('emails')
+    if emails:
+        by_company = {}
+        for url, email in zip(emails['company_url'], emails['email']):
+            by_company.setdefault(url, []).append(email)
+        for url, company_emails in by_company.items():
+            if url in records:
+                records[url].all_emails = company_emails
+
+    return list(records.values())
+
+
+def _read(path):
+    if path.endswith('.pkl'):
+        return _read_pickle(path)
+    if COLUMNAR_RE.search(os.path.basename(path)):
+        return _read_columnar(path)
+    return to_records(migrate(read_json(path)))
+
+
+# Public API ---------------------------------------------------------------
+
+def load_dataset(path, use_cache=True):
+    """CompanyRecords of a dataset file (shared when cached - treat as read-only)"""
+    stat = os.stat(path)
+    version = (stat.st_mtime_ns, stat.st_size)
+    key = os.path.abspath(path)
+
+    if use_cache:
+        with _cache_lock:
+            cached = _cache.get(key)
+            if cached is not None and cached[0] == version:
+                _cache.move_to_end(key)
+                return cached[1]
+
+    records = _read(path)
+
+    if use_cache:
+        with _cache_lock:
+            _cache[key] = (version, records)
+            _cache.move_to_end(key)
+            while len(_cache) > CACHE_SIZE:
+                _cache.popitem(last=False)
+    return records
+
+
+def load_aggregates(path):
+    """PortfolioAggregates of a dataset file: persisted when current, else computed once"""
+    stat = os.stat(path)
+    version = (stat.st_mtime_ns, stat.st_size)
+    key = os.path.abspath(path)
+
+    with _cache_lock:
+        cached = _aggregates.get(key)
+        if cached is not None and cached[0] == version:
+            _aggregates.move_to_end(key)
+            return cached[1]
+
+    aggregates = read_aggregates(path) or PortfolioAggregates.from_records(load_dataset(path))
+
+    with _cache_lock:
+        _aggregates[key] = (version, aggregates)
+        _aggregates.move_to_end(key)
+        while len(_aggregates) > CACHE_SIZE:
+            _aggregates.popitem(last=False)
+    return aggregates
+
+
+def clear_cache():
+    with _cache_lock:
+        _cache.clear()
+        _aggregates.clear()
+
+
+def find_dataset(directory='.', include_sample=False):
+    """Dataset to show: the dashboard snapshot, else the newest JSON / columnar export"""
+    snapshot = os.path.join(directory, SNAPSHOT_FILE)
+    if os.path.exists(snapshot):
+        return snapshot
+
+    for pattern in ('portfolio_data_*.json', 'portfolio_companies_*.arrow', 'portfolio_companies_*.parquet'):
+        files = [f for f in glob.glob(os.path.join(directory, pattern)) if not f.endswith('.aggregates.json')]
+        if files:
+            return max(files, key=os.path.getmtime)
+
+    sample = os.path.join(directory, SAMPLE_FILE)
+    if include_sample and os.path.exists(sample):
+        return sample
+    return None
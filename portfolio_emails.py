@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Email inference - learns each company's address pattern from the emails it publishes
+
+Observed addresses that belong to a known founder (jane.doe@acme.com for
+Jane Doe) reveal the company's pattern (first.last). Founders without an
+observed address get one built from the learned pattern and the company's
+registrable domain, and every founder email is tagged:
+
+    observed - found on the company's pages
+    inferred - generated from the pattern learned for this domain
+
+Domains without a learned pattern get no guessed addresses at all - a
+first-name default would hand out (and merge founders on) bogus emails.
+
+Learned patterns are cached per domain (and persisted next to the
+fingerprint cache) so later runs keep them even when the page that showed
+the example address is gone.
+"""
+
+import re
+import unicodedata
+
+from portfolio_cache import JsonFileCache
+from portfolio_urls import registrable_domain
+
+OBSERVED = 'observed'
+INFERRED = 'inferred'
+
+# Local-part builders, most specific first so ties resolve to the richer pattern
+PATTERNS = {
+    'first.last': lambda f, l: f"{f}.{l}",
+    'first_last': lambda f, l: f"{f}_{l}",
+    'firstlast': lambda f, l: f"{f}{l}",
+    'f.last': lambda f, l: f"{f[0]}.{l}",
+    'flast': lambda f, l: f"{f[0]}{l}",
+    'firstl': lambda f, l: f"{f}{l[0]}",
+    'last.first': lambda f, l: f"{l}.{f}",
+    'last': lambda f, l: l,
+    'first': lambda f, l: f,
+}
+
+NAME_TOKEN_RE = re.compile(r'[^a-z]')
+
+
+def name_parts(name):
+    """(first, last) as plain ASCII lower-case letters, or None"""
+    folded = unicodedata.normalize('NFKD', name or '').encode('ascii', 'ignore').decode().lower()
+    tokens = [NAME_TOKEN_RE.sub('', t) for t in folded.split()]
+    tokens = [t for t in tokens if t]
+    if not tokens:
+        return None
+    return tokens[0], tokens[-1] if len(tokens) > 1 else ''
+
+
+def candidate_locals(parts):
+    """{local part: pattern} for every pattern that applies to a name"""
+    first, last = parts
+    candidates = {}
+    for pattern, build in PATTERNS.items():
+        if not last and pattern != 'first':
+            continue
+        candidates.setdefault(build(first, last), pattern)
+    return candidates
+
+
+class EmailInference(JsonFileCache):
+    """Matches observed emails to founders and infers the rest with per-domain patterns"""
+
+    FILENAME = 'email_patterns.json'
+    DUMP_OPTIONS = {'indent': 1, 'sort_keys': True}
+
+    def __init__(self, cache_dir=None):
+        super().__init__(cache_dir)
+        self.patterns = self.data   # registrable domain -> pattern name
+
+    def pattern_for(self, domain):
+        with self.lock:
+            return self.patterns.get(domain)
+
+    def learn(self, domain, pattern):
+        with self.lock:
+            if self.patterns.get(domain) != pattern:
+                self.patterns[domain] = pattern
+                self.dirty = True
+
+    def assign(self, company_url, founders, all_emails):
+        """Fill founder['email'] / ['email_source'] in place, returns the domain's pattern"""
+        domain = registrable_domain(company_url)
+
+        # Observed addresses by local part; company-domain addresses win over others
+        by_local = {}
+        for email in all_emails:
+            local, _, email_domain = email.lower().partition('@')
+            if local not in by_local or registrable_domain(email_domain) == domain:
+                by_local[local] = email
+
+        votes = {}
+        pending = []
+        for founder in founders:
+            if founder.get('email'):
+                founder['email_source'] = OBSERVED
+                self._vote(votes, founder['name'], founder['email'], domain)
+                continue
+
+            parts = name_parts(founder['name'])
+            if parts is None:
+                continue
+
+            # One dict lookup per pattern instead of name parts x emails
+            candidates = candidate_locals(parts)
+            match = next((by_local[local] for local in candidates if local in by_local), None)
+            if match:
+                founder['email'] = match
+                founder['email_source'] = OBSERVED
+                self._vote(votes, founder['name'], match, domain)
+            else:
+                pending.append((founder, parts))
+
+        if votes:
+            # Prefer the most common pattern; PATTERNS order breaks ties
+            order = list(PATTERNS)
+            pattern = max(votes, key=lambda p: (votes[p], -order.index(p)))
+            self.learn(domain, pattern)
+        else:
+            pattern = self.pattern_for(domain)
+
+        # Only learned patterns, and no guesses for IP addresses or single-label hosts
+        if pattern and '.' in domain and not domain.replace('.', '').isdigit():
+            for founder, parts in pending:
+                if parts[1] or pattern == 'first':
+                    founder['email'] = f"{PATTERNS[pattern](*parts)}@{domain}"
+                    founder['email_source'] = INFERRED
+        return pattern
+
+    def _vote(self, votes, name, email, domain):
+        local, _, email_domain = email.lower().partition('@')
+        if registrable_domain(email_domain) != domain:
+            return
+        parts = name_parts(name)
+        if parts is None:
+            return
+        pattern = candidate_locals(parts).get(local)
+        if pattern:
+            votes[pattern] = votes.get(pattern, 0) + 1
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Scrape progress events - structured events with running counters
+
+The scraper emits company_started / page_fetched / company_done /
+company_skipped / error events (plus portfolio_started / portfolio_done, and
+concurrency when an adaptive worker limit changes); a page that could not
+be loaded is a page_fetched event with ok=False and its error. Counters
+are updated incrementally as events are emitted and every event carries a
+snapshot, so consumers never re-aggregate the dataset. Events go to in-process
+listeners and, optionally, to a JSON Lines file that other processes can
+tail with EventTail:
+
+    python portfolio_events.py .portfolio_jobs/<job_id>.events.jsonl
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+EVENT_TYPES = (
+    'portfolio_started', 'company_started', 'page_fetched',
+    'company_done', 'company_skipped', 'error', 'concurrency', 'portfolio_done'
+)
+
+
+def empty_counters():
+    return {
+        'companies_total': 0,
+        'companies_started': 0,
+        'companies_done': 0,
+        'companies_cached': 0,
+        'companies_skipped': 0,
+        'founders': 0,
+        'emails': 0,
+        'pages_fetched': 0,
+        'pages_failed': 0,
+        'errors': 0
+    }
+
+
+class EventLog:
+    """Emits events to listeners and an optional JSON Lines file"""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.counters = empty_counters()
+        self.listeners = []
+        self.lock = threading.RLock()   # re-entrant: listeners may emit (e.g. concurrency changes)
+        self.file = None
+
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.file = open(path, 'a', encoding='utf-8')
+
+    def add_listener(self, listener):
+        """listener(event) is called synchronously for every event, in emission order"""
+        self.listeners.append(listener)
+
+    def _count(self, event_type, fields):
+        c = self.counters
+        if event_type == 'portfolio_started':
+            c['companies_total'] += fields.get('total', 0)
+        elif event_type == 'company_started':
+            c['companies_started'] += 1
+        elif event_type == 'page_fetched':
+            c['pages_fetched' if fields.get('ok', True) else 'pages_failed'] += 1
+        elif event_type == 'company_done':
+            c['companies_done'] += 1
+            c['founders'] += fields.get('founders', 0)
+            c['emails'] += fields.get('emails', 0)
+            if fields.get('cached'):
+                c['companies_cached'] += 1
+        elif event_type == 'company_skipped':
+            c['companies_skipped'] += 1
+        elif event_type == 'error':
+            c['errors'] += 1
+
+    def emit(self, event_type, **fields):
+        """Record one event, returns it (with a counters snapshot)"""
+        with self.lock:
+            self._count(event_type, fields)
+            event = {'ts': datetime.now().isoformat(), 'type': event_type}
+            event.update(fields)
+            event['counters'] = dict(self.counters)
+
+            if self.file is not None:
+                self.file.write(json.dumps(event, ensure_ascii=False, separators=(',', ':')) + '\n')
+                self.file.flush()
+
+            # Still under the lock, so listeners see counter snapshots in order
+            # even when several workers emit at once
+            for listener in self.listeners:
+                try:
+                    listener(event)
+                except Exception:
+                    pass
+        return event
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class EventTail:
+    """Reads only the events appended since the last poll"""
+
+    def __init__(self, path):
+        self.path = path
+        self.offset = 0
+        self.counters = empty_counters()
+        self.last_event = None
+
+    def poll(self):
+        """New complete events since the previous call"""
+        events = []
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(self.offset)
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        break  # partially written line, pick it up next time
+                    self.offset += len(line)
+                    try:
+                        events.append(json.loads(line))
+                    except ValueError:
+                        continue
+        except FileNotFoundError:
+            return events
+
+        if events:
+            self.last_event = events[-1]
+            self.counters = events[-1].get('counters', self.counters)
+        return events
+
+
+def follow(path, interval=1.0):
+    """Print events from a file as they arrive (Ctrl+C to stop)"""
+    tail = EventTail(path)
+    try:
+        while True:
+            for event in tail.poll():
+                c = event['counters']
+                detail = event.get('name') or event.get('url') or event.get('message') or ''
+                print(f"[{event['ts'][11:19]}] {event['type']:<17} {detail}  "
+                      f"({c['companies_done']}/{c['companies_total']} companies, "
+                      f"{c['founders']} founders, {c['emails']} emails, {c['errors']} errors)")
+                if event['type'] == 'portfolio_done':
+                    return
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python portfolio_events.py <events.jsonl>")
+        sys.exit(1)
+    follow(sys.argv[1])
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Exports - columnar tables (Parquet / Arrow IPC) built straight from the scraped
+records with dictionary-encoded strings, streaming CSV / JSON Lines writers
+that append each company as soon as it is scraped, and the Excel / CSV / JSON
+files (on disk, or in memory for dashboard downloads).
+
+Reading back (memory-mapped):
+    import pyarrow as pa
+    table = pa.ipc.open_file(pa.memory_map('portfolio_founders_<ts>.arrow')).read_all()
+    # or
+    import pyarrow.parquet as pq
+    table = pq.read_table('portfolio_founders_<ts>.parquet', memory_map=True)
+"""
+
+import csv
+import io
+import json
+import os
+
+from portfolio_records import dump_records
+
+COLUMNAR_FORMATS = ('parquet', 'arrow')
+# Single-file formats the dashboard builds on demand, with their MIME types
+DOWNLOAD_FORMATS = {
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'csv': 'text/csv',
+    'json': 'application/json',
+}
+STREAM_FORMATS = ('csv', 'jsonl')
+SYNC_POLICIES = ('none', 'flush', 'fsync')
+
+# Flat founders CSV layout (one row per founder, or one per company without founders)
+CSV_COLUMNS = [
+    'company_name', 'company_url', 'company_description', 'founder_name',
+    'founder_role', 'founder_email', 'linkedin', 'twitter', 'tech_stack', 'email_source', 'company_social'
+]
+
+# Low-cardinality string columns that compress well as dictionaries
+DICTIONARY_COLUMNS = {
+    'companies': {'company_name', 'company_url'},
+    'founders': {'company_name', 'company_url', 'role', 'email_source'},
+    'emails': {'company_name', 'company_url', 'domain'},
+}
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        return pyarrow
+    except ImportError:
+        raise ImportError("Columnar export needs pyarrow: pip install pyarrow")
+
+
+def build_columns(portfolio_data):
+    """Collect the three export tables as column lists in a single pass over CompanyRecords"""
+    companies = {
+        'company_name': [], 'company_url': [], 'description': [],
+        'founders_count': [], 'emails_count': [], 'tech_stack': [],
+        'scraped_at': [], 'last_changed': [], 'social': []
+    }
+    founders = {
+        'company_name': [], 'company_url': [], 'name': [], 'role': [],
+        'email': [], 'email_source': [], 'linkedin': [], 'twitter': []
+    }
+    emails = {'company_name': [], 'company_url': [], 'email': [], 'domain': []}
+
+    for company in portfolio_data:
+        name = company.company_name
+        url = company.company_url
+
+        companies['company_name'].append(name)
+        companies['company_url'].append(url)
+        companies['description'].append(company.description)
+        companies['founders_count'].append(company.founders_count)
+        companies['emails_count'].append(company.emails_count)
+        companies['tech_stack'].append(company.tech_stack)
+        companies['scraped_at'].append(company.scraped_at)
+        companies['last_changed'].append(company.last_changed)
+        companies['social'].append(list(company.social.items()))
+
+        for founder in company.founders:
+            founders['company_name'].append(name)
+            founders['company_url'].append(url)
+            founders['name'].append(founder.name)
+            founders['role'].append(founder.role)
+            founders['email'].append(founder.email)
+            founders['email_source'].append(founder.email_source)
+            founders['linkedin'].append(founder.linkedin)
+            founders['twitter'].append(founder.twitter)
+
+        for email in company.all_emails:
+            emails['company_name'].append(name)
+            emails['company_url'].append(url)
+            emails['email'].append(email)
+            emails['domain'].append(email.split('@')[-1] if '@' in email else '')
+
+    return {'companies': companies, 'founders': founders, 'emails': emails}
+
+
+def _string_list_array(pa, lists):
+    """list<dictionary<string>> array without materializing per-row Python objects twice"""
+    offsets = [0]
+    values = []
+    for items in lists:
+        values.extend(items)
+        offsets.append(len(values))
+    dictionary = pa.array(values, type=pa.string()).dictionary_encode()
+    return pa.ListArray.from_arrays(pa.array(offsets, type=pa.int32()), dictionary)
+
+
+def build_tables(portfolio_data):
+    """Arrow tables for companies, founders and emails"""
+    pa = _require_pyarrow()
+    tables = {}
+
+    for table_name, columns in build_columns(portfolio_data).items():
+        arrays = []
+        for column, values in columns.items():
+            if column == 'tech_stack':
+                arrays.append(_string_list_array(pa, values))
+            elif column == 'social':
+                arrays.append(pa.array(values, type=pa.map_(pa.string(), pa.string())))
+            elif column.endswith('_count'):
+                arrays.append(pa.array(values, type=pa.int32()))
+            elif column in DICTIONARY_COLUMNS[table_name]:
+                arrays.append(pa.array(values, type=pa.string()).dictionary_encode())
+            else:
+                arrays.append(pa.array(values, type=pa.string()))
+        tables[table_name] = pa.Table.from_arrays(arrays, names=list(columns))
+
+    return tables
+
+
+def export_columnar(portfolio_data, timestamp, fmt='parquet', output_dir='.'):
+    """Write one file per table, returns the written paths"""
+    if fmt not in COLUMNAR_FORMATS:
+        raise ValueError(f"Unknown columnar format: {fmt}")
+
+    pa = _require_pyarrow()
+    paths = []
+
+    for table_name, table in build_tables(portfolio_data).items():
+        path = os.path.join(output_dir, f'portfolio_{table_name}_{timestamp}.{fmt}')
+
+        if fmt == 'parquet':
+            import pyarrow.parquet as pq
+            pq.write_table(table, path, compression='zstd', use_dictionary=True)
+        else:
+            # Uncompressed IPC file so readers can memory-map it without copying
+            with pa.OSFile(path, 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+
+        paths.append(path)
+
+    return paths
+
+
+def csv_rows(company):
+    """Rows of the flat founders CSV for one company, in CSV_COLUMNS order"""
+    head = [company.company_name, company.company_url, company.description]
+    tech_stack = ', '.join(company.tech_stack)
+    social = ', '.join(company.social.values())
+
+    if not company.founders_count:
+        yield head + ['', '', '', '', '', tech_stack, '', social]
+        return
+
+    for founder in company.founders:
+        yield head + [founder.name, founder.role, founder.email, founder.linkedin, founder.twitter, tech_stack,
+                      founder.email_source, social]
+
+
+def _write_csv(portfolio_data, f):
+    writer = csv.writer(f, lineterminator='\n')
+    writer.writerow(CSV_COLUMNS)
+    for company in portfolio_data:
+        writer.writerows(csv_rows(company))
+
+
+def write_csv(portfolio_data, path):
+    """Write the flat founders CSV for a whole portfolio"""
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        _write_csv(portfolio_data, f)
+
+
+def write_excel(portfolio_data, target):
+    """Excel workbook with overview, founders and emails sheets (target: path or binary file)"""
+    import pandas as pd
+
+    with pd.ExcelWriter(target, engine='openpyxl') as writer:
+        # Overview sheet
+        overview_data = []
+        for company in portfolio_data:
+            overview_data.append({
+                'Company Name': company.company_name,
+                'Website': company.company_url,
+                'Description': company.description[:200] + '...' if len(company.description) > 200 else company.description,
+                'Founders Count': company.founders_count,
+                'Emails Found': company.emails_count,
+                'Tech Stack': ', '.join(company.tech_stack),
+                'Social': ', '.join(company.social.values()),
+                'Scraped At': company.scraped_at,
+                'Last Changed': company.last_changed
+            })
+
+        pd.DataFrame(overview_data).to_excel(writer, sheet_name='Overview', index=False)
+
+        # Founders sheet
+        founders_data = []
+        for company in portfolio_data:
+            for founder in company.founders:
+                founders_data.append({
+                    'Company': company.company_name,
+                    'Company URL': company.company_url,
+                    'Founder Name': founder.name,
+                    'Role': founder.role,
+                    'Email': founder.email,
+                    'Email Source': founder.email_source,
+                    'LinkedIn': founder.linkedin,
+                    'Twitter': founder.twitter
+                })
+
+        if founders_data:
+            pd.DataFrame(founders_data).to_excel(writer, sheet_name='All Founders', index=False)
+
+        # Emails sheet
+        emails_data = []
+        for company in portfolio_data:
+            for email in company.all_emails:
+                emails_data.append({
+                    'Company': company.company_name,
+                    'Email': email,
+                    'Company URL': company.company_url
+                })
+
+        if emails_data:
+            pd.DataFrame(emails_data).to_excel(writer, sheet_name='All Emails', index=False)
+
+
+def export_bytes(portfolio_data, fmt):
+    """One download file (xlsx, csv or json) for a set of CompanyRecords, built in memory"""
+    if fmt not in DOWNLOAD_FORMATS:
+        raise ValueError(f"Unknown download format: {fmt}")
+
+    buffer = io.BytesIO()
+    if fmt == 'xlsx':
+        write_excel(portfolio_data, buffer)
+    elif fmt == 'csv':
+        text = io.TextIOWrapper(buffer, encoding='utf-8', newline='')
+        _write_csv(portfolio_data, text)
+        text.flush()
+        text.detach()
+    else:
+        buffer.write(json.dumps(dump_records(portfolio_data), indent=2).encode('utf-8'))
+    return buffer.getvalue()
+
+
+class StreamingExporter:
+    """Appends each finished company to per-run CSV / JSON Lines files
+
+    sync policy:
+        none  - leave buffering to the OS (fastest, may lose the tail on a crash)
+        flush - flush Python buffers every `sync_every` companies (tail -f friendly)
+        fsync - flush and fsync every `sync_every` companies (durable)
+    """
+
+    def __init__(self, run_id, output_dir='.', formats=STREAM_FORMATS, sync='flush', sync_every=1):
+        if sync not in SYNC_POLICIES:
+            raise ValueError(f"Unknown sync policy: {sync}")
+
+        self.sync = sync
+        self.sync_every = max(1, sync_every)
+        self.pending = 0
+        self.companies_written = 0
+        self.paths = {}
+        self.files = {}
+        self.csv_writer = None
+
+        os.makedirs(output_dir, exist_ok=True)
+
+        if 'csv' in formats:
+            path = os.path.join(output_dir, f'portfolio_stream_{run_id}.csv')
+            is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+            self.files['csv'] = open(path, 'a', newline='', encoding='utf-8')
+            self.csv_writer = csv.writer(self.files['csv'], lineterminator='\n')
+            if is_new:
+                self.csv_writer.writerow(CSV_COLUMNS)
+            self.paths['csv'] = path
+
+        if 'jsonl' in formats:
+            path = os.path.join(output_dir, f'portfolio_stream_{run_id}.jsonl')
+            self.files['jsonl'] = open(path, 'a', encoding='utf-8')
+            self.paths['jsonl'] = path
+
+    def write_company(self, company):
+        """Append one company (and its founders) to every open stream"""
+        if self.csv_writer is not None:
+            self.csv_writer.writerows(csv_rows(company))
+
+        if 'jsonl' in self.files:
+            self.files['jsonl'].write(json.dumps(company.to_dict(), ensure_ascii=False, separators=(',', ':')))
+            self.files['jsonl'].write('\n')
+
+        self.companies_written += 1
+        self.pending += 1
+        if self.pending >= self.sync_every:
+            self.sync_now()
+
+    def sync_now(self):
+        """Apply the sync policy to all open files"""
+        self.pending = 0
+        if self.sync == 'none':
+            return
+
+        for f in self.files.values():
+            f.flush()
+            if self.sync == 'fsync':
+                os.fsync(f.fileno())
+
+    def close(self):
+        if self.pending and self.sync != 'none':
+            self.sync_now()
+        for f in self.files.values():
+            f.close()
+        self.files = {}
+        self.csv_writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
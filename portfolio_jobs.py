@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Background scraping jobs - runs portfolio crawls off the Streamlit request thread
+
+Each submitted portfolio becomes a job with an id, a status file
+(<jobs_dir>/<job_id>.json) rewritten on every company boundary, and an
+event log (<jobs_dir>/<job_id>.events.jsonl), so any reader - the
+dashboard, a CLI, another process - can poll it cheaply.
+Jobs run on worker threads in submission order and can be cancelled between
+companies.
+"""
+
+import os
+import queue
+import threading
+import traceback
+import uuid
+from datetime import datetime
+
+from portfolio_cache import load_json, write_json
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+INTERRUPTED = 'interrupted'
+
+FINISHED_STATES = (DONE, FAILED, CANCELLED, INTERRUPTED)
+
+
+def _default_scraper_factory(**options):
+    from portfolio_scraper import PortfolioScraper
+    return PortfolioScraper(**options)
+
+
+class JobManager:
+    """Queue of portfolio crawls executed by background worker threads"""
+
+    def __init__(self, jobs_dir='.portfolio_jobs', max_parallel=1, scraper_factory=None, scraper_options=None):
+        self.jobs_dir = jobs_dir
+        self.max_parallel = max(1, max_parallel)
+        self.scraper_factory = scraper_factory or _default_scraper_factory
+        self.scraper_options = scraper_options or {'headless': True}
+
+        self.lock = threading.Lock()
+        self.queue = queue.Queue()
+        self.jobs = {}
+        self.cancel_events = {}
+        self.workers = []
+
+        os.makedirs(jobs_dir, exist_ok=True)
+        self._recover()
+
+    def _recover(self):
+        """Reload job history; re-queue queued jobs, mark crashed running jobs as interrupted"""
+        for filename in sorted(os.listdir(self.jobs_dir)):
+            if not filename.endswith('.json'):
+                continue
+            job = load_json(os.path.join(self.jobs_dir, filename))
+            if not job:
+                continue
+
+            self.jobs[job['job_id']] = job
+            if job['state'] == RUNNING:
+                job['state'] = INTERRUPTED
+                job['finished_at'] = datetime.now().isoformat()
+                self._persist(job)
+            elif job['state'] == QUEUED:
+                self.cancel_events[job['job_id']] = threading.Event()
+                self.queue.put(job['job_id'])
+
+        if not self.queue.empty():
+            self._ensure_workers()
+
+    def _persist(self, job):
+        write_json(os.path.join(self.jobs_dir, f"{job['job_id']}.json"), job)
+
+    def _update(self, job_id, **fields):
+        with self.lock:
+            job = self.jobs[job_id]
+            job.update(fields)
+            job['updated_at'] = datetime.now().isoformat()
+            self._persist(job)
+
+    def _ensure_workers(self):
+        with self.lock:
+            self.workers = [w for w in self.workers if w.is_alive()]
+            while len(self.workers) < self.max_parallel:
+                worker = threading.Thread(target=self._worker_loop, name='portfolio-job-worker', daemon=True)
+                worker.start()
+                self.workers.append(worker)
+
+    def submit(self, portfolio_url):
+        """Queue a portfolio crawl, returns its job id"""
+        job_id = datetime.now().strftime('%Y%m%d_%H%M%S_') + uuid.uuid4().hex[:6]
+        now = datetime.now().isoformat()
+        job = {
+            'job_id': job_id,
+            'portfolio_url': portfolio_url,
+            'state': QUEUED,
+            'created_at': now,
+            'updated_at': now,
+            'started_at': None,
+            'finished_at': None,
+            'total': 0,
+            'done': 0,
+            'companies_scraped': 0,
+            'founders': 0,
+            'emails': 0,
+            'errors': 0,
+            'current': '',
+            'error': ''
+        }
+
+        with self.lock:
+            self.jobs[job_id] = job
+            self.cancel_events[job_id] = threading.Event()
+            self._persist(job)
+
+        self.queue.put(job_id)
+        self._ensure_workers()
+        return job_id
+
+    def cancel(self, job_id):
+        """Request cancellation; queued jobs never start, running ones stop after the current company"""
+        event = self.cancel_events.get(job_id)
+        if event is None:
+            return False
+        event.set()
+
+        job = self.jobs.get(job_id)
+        if job and job['state'] == QUEUED:
+            self._update(job_id, state=CANCELLED, finished_at=datetime.now().isoformat())
+        return True
+
+    def event_file(self, job_id):
+        """JSON Lines event log of a job (see portfolio_events.EventTail)"""
+        return os.path.join(self.jobs_dir, f"{job_id}.events.jsonl")
+
+    def get(self, job_id):
+        with self.lock:
+            job = self.jobs.get(job_id)
+            return dict(job) if job else None
+
+    def list_jobs(self):
+        """All known jobs, newest first"""
+        with self.lock:
+            return sorted((dict(j) for j in self.jobs.values()), key=lambda j: j['created_at'], reverse=True)
+
+    def active_jobs(self):
+        return [j for j in self.list_jobs() if j['state'] not in FINISHED_STATES]
+
+    def _worker_loop(self):
+        while True:
+            job_id = self.queue.get()
+            try:
+                self._run(job_id)
+            finally:
+                self.queue.task_done()
+
+    def _run(self, job_id):
+        cancel_event = self.cancel_events[job_id]
+        if cancel_event.is_set() or self.jobs[job_id]['state'] != QUEUED:
+            return
+
+        self._update(job_id, state=RUNNING, started_at=datetime.now().isoformat(), current='Starting browser...')
+
+        def on_event(event):
+            # Status files only change on company boundaries; page events stay in the event log
+            if event['type'] not in ('portfolio_started', 'company_started', 'company_done', 'company_skipped', 'error'):
+                return
+            c = event['counters']
+            self._update(
+                job_id,
+                total=c['companies_total'],
+                done=c['companies_done'] + c.get('companies_skipped', 0) + c['errors'],
+                companies_scraped=c['companies_done'],
+                founders=c['founders'],
+                emails=c['emails'],
+                errors=c['errors'],
+                current=event.get('name', '') if event['type'] == 'company_started' else self.jobs[job_id]['current']
+            )
+
+        scraper = None
+        try:
+            options = dict(self.scraper_options, event_file=self.event_file(job_id))
+            scraper = self.scraper_factory(**options)
+            scraper.events.add_listener(on_event)
+            self._update(job_id, current='Finding companies...')
+            scraper.scrape_portfolio(self.jobs[job_id]['portfolio_url'], should_stop=cancel_event.is_set)
+            state = CANCELLED if cancel_event.is_set() else DONE
+            self._update(job_id, state=state, finished_at=datetime.now().isoformat(), current='')
+        except Exception as e:
+            self._update(
+                job_id, state=FAILED, finished_at=datetime.now().isoformat(), current='',
+                error=f"{e}\n{traceback.format_exc(limit=5)}"
+            )
+        finally:
+            if scraper is not None:
+                try:
+                    scraper.close()
+                except Exception:
+                    pass
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Email domain validation - drops addresses whose domain can't receive mail
+
+Each domain's MX records are looked up once per run through a pluggable
+resolver and kept in a shared TTL cache; lookups for a batch of domains run
+concurrently on a bounded thread pool. A resolver is any object with
+mx(domain) returning the mail hosts ([] or a null MX ['.'] = no mail),
+raising on lookup failure. Failures count as deliverable, so a flaky resolver never deletes
+data.
+
+    DnsResolver   real DNS via dnspython (pip install dnspython)
+    StubResolver  fixed answers from a dict, for offline runs and tests
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class DnsResolver:
+    """MX lookups with dnspython; falls back to A/AAAA records (implicit MX)"""
+
+    def __init__(self, timeout=5.0):
+        try:
+            import dns.resolver
+        except ImportError:
+            raise ImportError("Email validation needs dnspython: pip install dnspython")
+
+        self.dns = dns.resolver
+        self.resolver = dns.resolver.Resolver()
+        self.resolver.lifetime = timeout
+
+    def _exists(self, domain, record_type):
+        try:
+            return bool(self.resolver.resolve(domain, record_type))
+        except (self.dns.NoAnswer, self.dns.NXDOMAIN):
+            return False
+
+    def mx(self, domain):
+        try:
+            answer = self.resolver.resolve(domain, 'MX')
+        except self.dns.NXDOMAIN:
+            return []
+        except self.dns.NoAnswer:
+            if self._exists(domain, 'A') or self._exists(domain, 'AAAA'):
+                return [domain]
+            return []
+
+        # A single "0 ." record is a null MX: the domain explicitly accepts no mail
+        hosts = [str(r.exchange).rstrip('.') for r in sorted(answer, key=lambda r: r.preference)]
+        return [h for h in hosts if h]
+
+
+class StubResolver:
+    """Resolver answering from a {domain: [mx hosts]} dict; unknown domains have no mail"""
+
+    def __init__(self, records=None, default=()):
+        self.records = {d.lower(): list(hosts) for d, hosts in (records or {}).items()}
+        self.default = list(default)
+        self.lookups = 0
+
+    def mx(self, domain):
+        self.lookups += 1
+        return self.records.get(domain.lower(), self.default)
+
+
+class TTLCache:
+    """Thread-safe {key: value} that forgets entries after `ttl` seconds"""
+
+    def __init__(self, ttl=3600):
+        self.ttl = ttl
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self.entries[key]
+                return None
+            return value
+
+    def set(self, key, value):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, value)
+
+
+def email_domain(email):
+    return email.rpartition('@')[2].lower().rstrip('.')
+
+
+class MXValidator:
+    """Checks and filters emails by whether their domain accepts mail"""
+
+    def __init__(self, resolver=None, ttl=3600, max_workers=8, cache=None):
+        self.resolver = resolver if resolver is not None else DnsResolver()
+        self.cache = cache if cache is not None else TTLCache(ttl)
+        self.max_workers = max(1, max_workers)
+        self.lock = threading.Lock()
+        self.in_flight = {}   # domain -> Event, so concurrent callers share one lookup
+
+    def _lookup(self, domain):
+        try:
+            hosts = self.resolver.mx(domain)
+            deliverable = any(host.rstrip('.') for host in hosts)
+        except Exception:
+            return True  # unknown - keep the address, retry next run
+        self.cache.set(domain, deliverable)
+        return deliverable
+
+    def _check(self, domain):
+        cached = self.cache.get(domain)
+        if cached is not None:
+            return cached
+
+        with self.lock:
+            event = self.in_flight.get(domain)
+            owner = event is None
+            if owner:
+                event = self.in_flight[domain] = threading.Event()
+
+        if not owner:
+            event.wait()
+            cached = self.cache.get(domain)
+            return True if cached is None else cached
+
+        try:
+            return self._lookup(domain)
+        finally:
+            with self.lock:
+                del self.in_flight[domain]
+            event.set()
+
+    def check_domains(self, domains):
+        """{domain: deliverable} for a batch of domains, looked up concurrently"""
+        domains = list(dict.fromkeys(d.lower() for d in domains if d))
+        results = {}
+        missing = []
+        for domain in domains:
+            cached = self.cache.get(domain)
+            if cached is None:
+                missing.append(domain)
+            else:
+                results[domain] = cached
+
+        if len(missing) == 1:
+            results[missing[0]] = self._check(missing[0])
+        elif missing:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(missing))) as pool:
+                results.update(zip(missing, pool.map(self._check, missing)))
+        return results
+
+    def filter_records(self, records):
+        """Drop undeliverable emails from CompanyRecords in place, returns counts"""
+        domains = set()
+        for record in records:
+            domains.update(email_domain(e) for e in record.all_emails)
+            domains.update(email_domain(f.email) for f in record.founders if f.email)
+
+        deliverable = self.check_domains(domains)
+        stats = {
+            'domains': len(deliverable),
+            'undeliverable_domains': sum(1 for ok in deliverable.values() if not ok),
+            'emails_dropped': 0,
+            'founder_emails_cleared': 0
+        }
+        if not stats['undeliverable_domains']:
+            return stats
+
+        for record in records:
+            kept = [e for e in record.all_emails if deliverable.get(email_domain(e), True)]
+            if len(kept) != record.emails_count:
+                stats['emails_dropped'] += record.emails_count - len(kept)
+                record.all_emails = kept
+
+            for founder in record.founders:
+                if founder.email and not deliverable.get(email_domain(founder.email), True):
+                    founder.email = ''
+                    founder.email_source = ''
+                    stats['founder_emails_cleared'] += 1
+        return stats
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Page archive - compressed raw HTML of every fetched page, for offline re-extraction
+
+Layout of an archive directory:
+    pages.dat     append-only frames, one compressed page each (zstd if the
+                  zstandard package is installed, zlib otherwise)
+    index.jsonl   one line per stored page: url, company, offset, length,
+                  codec, sha1, fetched_at (the latest line for a URL wins)
+
+Readers memory-map pages.dat and decompress single frames on demand, so
+re-running the extractors never needs a browser or the network:
+
+    python run_portfolio_scraper.py --reextract .portfolio_archive --workers 8
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+DATA_FILE = 'pages.dat'
+INDEX_FILE = 'index.jsonl'
+
+
+def _compress(data):
+    if zstandard is not None:
+        return 'zstd', zstandard.ZstdCompressor(level=6).compress(data)
+    return 'zlib', zlib.compress(data, 6)
+
+
+def _decompress(codec, frame):
+    if codec == 'zstd':
+        if zstandard is None:
+            raise ImportError("This archive uses zstd frames: pip install zstandard")
+        return zstandard.ZstdDecompressor().decompress(frame)
+    return zlib.decompress(frame)
+
+
+class PageStore:
+    """Append-only compressed page archive with a URL index"""
+
+    def __init__(self, archive_dir):
+        self.archive_dir = archive_dir
+        self.data_path = os.path.join(archive_dir, DATA_FILE)
+        self.index_path = os.path.join(archive_dir, INDEX_FILE)
+        self.index = {}                   # url -> latest entry
+        self.companies = OrderedDict()    # company_url -> [page urls], homepage first
+        self.lock = threading.Lock()
+        self._mmap = None
+        self._mmap_size = 0
+
+        os.makedirs(archive_dir, exist_ok=True)
+        if os.path.exists(self.index_path):
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        self._add_to_index(json.loads(line))
+                    except ValueError:
+                        continue
+
+    def _add_to_index(self, entry):
+        self.index[entry['url']] = entry
+        pages = self.companies.setdefault(entry['company_url'], [])
+        if entry['url'] not in pages:
+            pages.append(entry['url'])
+
+    def put(self, url, html, company_url, company_name=''):
+        """Archive one page; unchanged pages (same hash) are not written again"""
+        raw = html.encode('utf-8', 'replace')
+        sha1 = hashlib.sha1(raw).hexdigest()
+
+        with self.lock:
+            previous = self.index.get(url)
+            if previous and previous['sha1'] == sha1 and previous['company_url'] == company_url:
+                return previous
+
+            codec, frame = _compress(raw)
+            with open(self.data_path, 'ab') as f:
+                offset = f.tell()
+                f.write(frame)
+
+            entry = {
+                'url': url,
+                'company_url': company_url,
+                'company_name': company_name,
+                'offset': offset,
+                'length': len(frame),
+                'codec': codec,
+                'sha1': sha1,
+                'fetched_at': datetime.now().isoformat()
+            }
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + '\n')
+            self._add_to_index(entry)
+            return entry
+
+    def _view(self, end):
+        """Memory map of the data file, remapped when it has grown past `end`"""
+        if self._mmap is None or end > self._mmap_size:
+            if self._mmap is not None:
+                self._mmap.close()
+            with open(self.data_path, 'rb') as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._mmap_size = len(self._mmap)
+        return self._mmap
+
+    def get(self, url):
+        """Decompressed HTML of the latest archived copy of a URL, or None"""
+        entry = self.index.get(url)
+        if entry is None:
+            return None
+        start = entry['offset']
+        end = start + entry['length']
+        with self.lock:
+            frame = self._view(end)[start:end]
+        return _decompress(entry['codec'], frame).decode('utf-8', 'replace')
+
+    def company_pages(self, company_url):
+        """[(url, html)] for a company, homepage first"""
+        return [(url, self.get(url)) for url in self.companies.get(company_url, [])]
+
+    def company_name(self, company_url):
+        pages = self.companies.get(company_url)
+        return self.index[pages[0]].get('company_name', '') if pages else ''
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+
+# Offline re-extraction ------------------------------------------------------
+
+_worker_store = None
+_worker_scraper = None
+
+
+def _init_worker(archive_dir, use_ai):
+    global _worker_store, _worker_scraper
+    from portfolio_scraper import PortfolioScraper
+
+    _worker_store = PageStore(archive_dir)
+    _worker_scraper = PortfolioScraper(cache_dir=None, stream_formats=None, use_ai=use_ai)
+
+
+def _reextract_company(company_url):
+    pages = _worker_store.company_pages(company_url)
+    if not pages:
+        return None
+    (homepage_url, homepage), about_pages = pages[0], pages[1:]
+    return _worker_scraper.extract_company(
+        company_url, _worker_store.company_name(company_url), homepage, about_pages
+    )
+
+
+def reextract_archive(archive_dir, workers=None, use_ai=False):
+    """Re-run every extractor over the archived pages in parallel, returns CompanyRecords"""
+    store = PageStore(archive_dir)
+    company_urls = list(store.companies)
+    store.close()
+
+    if not company_urls:
+        return []
+
+    workers = workers or os.cpu_count() or 1
+    records = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(archive_dir, use_ai)) as pool:
+        for record in pool.map(_reextract_company, company_urls, chunksize=8):
+            if record is not None:
+                records.append(record)
+    return records
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Compact record model for scraped companies and founders
+
+Records use __slots__ (no per-instance dict), intern repeated strings such as
+roles and tech tags, and keep founder/email counts precomputed. They still
+support dict-style access (record['founders'], record.get('email')) so older
+consumers of the plain-dict format keep working.
+"""
+
+import sys
+
+# Bump when fields change; from_dict / unpickling migrate older payloads
+SCHEMA_VERSION = 4
+
+
+def _intern(value):
+    return sys.intern(value) if value else ''
+
+
+class _MappingCompat:
+    """Read/write access by key for code written against the old dict format"""
+
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in self.FIELDS
+
+    def get(self, key, default=None):
+        if key not in self.FIELDS:
+            return default
+        value = getattr(self, key)
+        return default if value is None else value
+
+    def keys(self):
+        return list(self.FIELDS)
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.to_tuple() == other.to_tuple()
+
+    def __repr__(self):
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.FIELDS[:2])
+        return f"{type(self).__name__}({fields}, ...)"
+
+
+class FounderRecord(_MappingCompat):
+    """One person found on a company site"""
+
+    FIELDS = ('name', 'role', 'email', 'linkedin', 'twitter', 'email_source')
+    __slots__ = ('name', '_role', 'email', 'linkedin', 'twitter', '_email_source')
+
+    def __init__(self, name, role='Team Member', email='', linkedin='', twitter='', email_source=''):
+        self.name = name
+        self.role = role
+        self.email = email or ''
+        self.linkedin = linkedin or ''
+        self.twitter = twitter or ''
+        self.email_source = email_source  # 'observed', 'inferred' or '' (unknown, pre-v3 data)
+
+    @property
+    def role(self):
+        return self._role
+
+    @role.setter
+    def role(self, value):
+        self._role = _intern(value)
+
+    @property
+    def email_source(self):
+        return self._email_source
+
+    @email_source.setter
+    def email_source(self, value):
+        self._email_source = _intern(value)
+
+    def to_tuple(self):
+        return (self.name, self._role, self.email, self.linkedin, self.twitter, self._email_source)
+
+    def to_dict(self):
+        return dict(zip(self.FIELDS, self.to_tuple()))
+
+    @classmethod
+    def from_dict(cls, data):
+        if isinstance(data, cls):
+            return data
+        return cls(
+            data.get('name', ''),
+            data.get('role') or 'Team Member',
+            data.get('email', ''),
+            data.get('linkedin', ''),
+            data.get('twitter', ''),
+            data.get('email_source', '')
+        )
+
+    def __reduce__(self):
+        return (_restore_founder, (SCHEMA_VERSION, self.to_tuple()))
+
+
+class CompanyRecord(_MappingCompat):
+    """One scraped portfolio company with its founders"""
+
+    FIELDS = (
+        'company_name', 'company_url', 'description', 'founders', 'all_emails',
+        'tech_stack', 'scraped_at', 'last_changed', 'social'
+    )
+    __slots__ = (
+        'company_name', 'company_url', 'description', '_founders', '_all_emails',
+        '_tech_stack', 'scraped_at', 'last_changed', 'social', 'founders_count', 'emails_count'
+    )
+
+    def __init__(self, company_name, company_url, description='', founders=(), all_emails=(),
+                 tech_stack=(), scraped_at='', last_changed='', social=None):
+        self.company_name = company_name
+        self.company_url = company_url
+        self.description = description or ''
+        self.founders = founders
+        self.all_emails = all_emails
+        self.tech_stack = tech_stack
+        self.scraped_at = scraped_at
+        self.last_changed = last_changed or scraped_at
+        self.social = dict(social or {})   # network -> company profile url
+
+    @property
+    def founders(self):
+        return self._founders
+
+    @founders.setter
+    def founders(self, value):
+        self._founders = [FounderRecord.from_dict(f) for f in value]
+        self.founders_count = len(self._founders)
+
+    @property
+    def all_emails(self):
+        return self._all_emails
+
+    @all_emails.setter
+    def all_emails(self, value):
+        self._all_emails = list(value)
+        self.emails_count = len(self._all_emails)
+
+    @property
+    def tech_stack(self):
+        return self._tech_stack
+
+    @tech_stack.setter
+    def tech_stack(self, value):
+        self._tech_stack = [_intern(t) for t in value]
+
+    def add_founder(self, founder):
+        """Append a founder and keep the count in sync"""
+        self._founders.append(FounderRecord.from_dict(founder))
+        self.founders_count += 1
+
+    def to_tuple(self):
+        return (
+            self.company_name, self.company_url, self.description,
+            tuple(f.to_tuple() for f in self._founders), tuple(self._all_emails),
+            tuple(self._tech_stack), self.scraped_at, self.last_changed, tuple(self.social.items())
+        )
+
+    def to_dict(self):
+        return {
+            'company_name': self.company_name,
+            'company_url': self.company_url,
+            'description': self.description,
+            'founders': [f.to_dict() for f in self._founders],
+            'all_emails': list(self._all_emails),
+            'tech_stack': list(self._tech_stack),
+            'scraped_at': self.scraped_at,
+            'last_changed': self.last_changed,
+            'social': dict(self.social)
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        if isinstance(data, cls):
+            return data
+        return cls(
+            data.get('company_name') or data.get('name', ''),
+            data.get('company_url') or data.get('url', ''),
+            data.get('description', ''),
+            data.get('founders') or (),
+            data.get('all_emails') or (),
+            data.get('tech_stack') or (),
+            data.get('scraped_at', ''),
+            data.get('last_changed', ''),
+            data.get('social')
+        )
+
+    def __reduce__(self):
+        return (_restore_company, (SCHEMA_VERSION, self.to_tuple()))
+
+
+def _restore_founder(version, state):
+    # v2 tuples lack email_source, which defaults to unknown
+    return FounderRecord(*state)
+
+
+def _restore_company(version, state):
+    # v3 tuples lack social links
+    name, url, description, founders, emails, tech, scraped_at, last_changed, *social = state
+    return CompanyRecord(
+        name, url, description, [FounderRecord(*f) for f in founders], emails, tech,
+        scraped_at, last_changed, dict(social[0]) if social else None
+    )
+
+
+def to_records(data):
+    """Convert a loaded dataset (list of dicts, records, or versioned envelope) to CompanyRecords"""
+    if isinstance(data, dict):
+        data = data.get('companies', [])
+    return [CompanyRecord.from_dict(c) for c in data or []]
+
+
+def dump_records(records):
+    """Versioned JSON-ready envelope for a list of records"""
+    return {
+        'schema_version': SCHEMA_VERSION,
+        'companies': [r.to_dict() for r in records]
+    }
+
+
+def portfolio_totals(records):
+    """Companies / founders / emails / companies-with-founders from the precomputed counts"""
+    founders = emails = with_founders = 0
+    for r in records:
+        founders += r.founders_count
+        emails += r.emails_count
+        if r.founders_count:
+            with_founders += 1
+    return {
+        'companies': len(records),
+        'founders': founders,
+        'emails': emails,
+        'with_founders': with_founders
+    }
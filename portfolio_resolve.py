@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Founder entity resolution - one record per real person
+
+Founders are collected from several pages (homepage, about, team) and
+several extractors, so the same person shows up as "Dr. Jane  Doe",
+"Jane Doe, PhD" and a LinkedIn-only card, next to junk such as
+"Founder / Mode Party". Resolution:
+
+    1. normalizes names (unicode, whitespace, honorifics, suffixes)
+    2. drops strings that don't look like a person (person_score)
+    3. blocks by company site (portfolio_urls.site_key) - people are only
+       compared within a company, and the same site listed twice becomes one
+       company
+    4. merges records sharing a name key, LinkedIn / Twitter profile or
+       observed email with union-find (inferred emails are built from the
+       name, so they are not evidence of identity)
+
+Every step is a hash lookup per founder, so a whole dataset resolves in
+near-linear time.
+"""
+
+import re
+import unicodedata
+from urllib.parse import urlparse
+
+from portfolio_emails import OBSERVED
+from portfolio_records import CompanyRecord, FounderRecord
+from portfolio_urls import site_key
+
+MIN_PERSON_SCORE = 0.5   # names must score above this
+
+HONORIFICS = {'dr', 'mr', 'mrs', 'ms', 'miss', 'mx', 'prof', 'sir', 'dame'}
+SUFFIXES = {'jr', 'sr', 'ii', 'iii', 'iv', 'phd', 'md', 'mba', 'cpa', 'esq', 'pe'}
+NAME_PARTICLES = {'van', 'von', 'de', 'der', 'den', 'da', 'di', 'du', 'del', 'la', 'le', 'bin', 'al', 'el', 'y'}
+
+# Words that show up in headings and role text but not in people's names
+NON_PERSON_WORDS = {
+    'founder', 'founders', 'co-founder', 'cofounder', 'ceo', 'cto', 'cfo', 'coo', 'cmo', 'chief',
+    'president', 'director', 'head', 'vp', 'officer', 'partner', 'team', 'our', 'the', 'meet',
+    'about', 'us', 'we', 'contact', 'company', 'inc', 'llc', 'ltd', 'corp', 'party', 'mode',
+    'leadership', 'people', 'careers', 'jobs', 'blog', 'news', 'press', 'product', 'products',
+    'platform', 'solutions', 'services', 'learn', 'more', 'read', 'view', 'join', 'get',
+    'started', 'home', 'privacy', 'policy', 'terms', 'and', 'of', 'for', 'with', 'member',
+    'members', 'advisor', 'advisors', 'board', 'investors', 'engineering', 'operations',
+    'co', 'ex', 'former', 'formerly', 'previously', 'current', 'new', 'senior', 'lead', 'manager',
+    'engineer', 'investor', 'owner', 'staff', 'hiring', 'open', 'role', 'roles', 'your', 'my'
+}
+SPECIAL_CHARS_RE = re.compile(r'[/|&@:()\[\]{}<>#*+=_"]|\d')
+ROLE_TAIL_RE = re.compile(r'\s*[,\-–—|]\s*(co-?founder|founder|ceo|cto|cfo|coo|president|chief .*)$', re.I)
+
+
+def _fold(text):
+    """Case- and accent-insensitive form of a string"""
+    text = unicodedata.normalize('NFKD', text)
+    return ''.join(ch for ch in text if not unicodedata.combining(ch)).casefold()
+
+
+def normalize_name(name):
+    """Display form of a name: NFKC, single spaces, no honorifics / degree suffixes / trailing role"""
+    name = unicodedata.normalize('NFKC', name or '')
+    name = ROLE_TAIL_RE.sub('', ' '.join(name.split()))
+
+    tokens = [t for t in name.replace(',', ' ').split()]
+    while tokens and tokens[0].rstrip('.').lower() in HONORIFICS:
+        tokens.pop(0)
+    while tokens and tokens[-1].rstrip('.').replace('.', '').lower() in SUFFIXES:
+        tokens.pop()
+    return ' '.join(tokens)
+
+
+def name_key(name):
+    """Blocking/merge key for a normalized name"""
+    return ' '.join(re.sub(r"[^\w\s'-]", '', _fold(name)).split())
+
+
+def person_score(name):
+    """0..1 - how much a (normalized) string looks like a person's name"""
+    tokens = name.split()
+    if not tokens:
+        return 0.0
+    if len(tokens) == 1:
+        return 0.2
+    if len(tokens) > 4:
+        return 0.1
+
+    score = 1.0
+    if SPECIAL_CHARS_RE.search(name):
+        score -= 0.6
+    if len(name) > 40:
+        score -= 0.3
+
+    # One stop word or lower-case word ("Docker Co", "Human-like voice") is enough to fail
+    for token in tokens:
+        lowered = token.lower().strip('.,')
+        if lowered in NON_PERSON_WORDS:
+            score -= 0.5
+        elif not token[0].isupper() and lowered not in NAME_PARTICLES:
+            score -= 0.5
+    return max(0.0, min(1.0, score))
+
+
+def profile_key(url):
+    """Comparable form of a LinkedIn / Twitter / X profile URL"""
+    if not url:
+        return ''
+    parsed = urlparse(url if '//' in url else '//' + url)
+    host = parsed.netloc.lower()
+    if host.startswith('www.') or host.startswith('mobile.'):
+        host = host.split('.', 1)[1]
+    if host in ('x.com', 'twitter.com'):
+        host = 'twitter.com'
+    elif host.endswith('linkedin.com'):
+        host = 'linkedin.com'
+    path = parsed.path.rstrip('/').lower()
+    return f"{host}{path}" if path else ''
+
+
+class _UnionFind:
+    def __init__(self, size):
+        self.parent = list(range(size))
+
+    def find(self, i):
+        root = i
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[i] != root:
+            self.parent[i], i = root, self.parent[i]
+        return root
+
+    def union(self, a, b):
+        a, b = self.find(a), self.find(b)
+        if a != b:
+            # Keep the earliest record as the root so output order is stable
+            if b < a:
+                a, b = b, a
+            self.parent[b] = a
+
+
+def _merge(group):
+    """One FounderRecord from a group of records for the same person"""
+    best = max(group, key=lambda f: (person_score(f.name), len(f.name)))
+    merged = FounderRecord(best.name)
+    for field in ('role', 'email', 'linkedin', 'twitter'):
+        for founder in group:
+            value = founder[field]
+            if value and not (field == 'role' and value == 'Team Member'):
+                merged[field] = value
+                if field == 'email':
+                    merged.email_source = founder.email_source
+                break
+    return merged
+
+
+def resolve_founders(founders, min_score=MIN_PERSON_SCORE):
+    """Deduplicated FounderRecords of one company (input: dicts or records, in page order)"""
+    candidates = []
+    for founder in founders:
+        founder = FounderRecord.from_dict(founder)
+        name = normalize_name(founder.name)
+        if person_score(name) <= min_score:
+            continue
+        founder.name = name
+        candidates.append(founder)
+
+    if len(candidates) < 2:
+        return candidates
+
+    uf = _UnionFind(len(candidates))
+    owners = {}
+    for i, founder in enumerate(candidates):
+        keys = [('name', name_key(founder.name))]
+        if founder.linkedin:
+            keys.append(('profile', profile_key(founder.linkedin)))
+        if founder.twitter:
+            keys.append(('profile', profile_key(founder.twitter)))
+        if founder.email and founder.email_source == OBSERVED:
+            keys.append(('email', founder.email.lower()))
+
+        for key in keys:
+            if not key[1]:
+                continue
+            if key in owners:
+                uf.union(i, owners[key])
+            else:
+                owners[key] = i
+
+    groups = {}
+    for i in range(len(candidates)):
+        groups.setdefault(uf.find(i), []).append(candidates[i])
+    return [_merge(group) for root, group in sorted(groups.items())]
+
+
+def _unique(values):
+    return list(dict.fromkeys(values))
+
+
+def resolve_records(records, min_score=MIN_PERSON_SCORE):
+    """Resolve founders across a dataset; records of the same company site are merged into one"""
+    blocks = {}
+    order = []
+    for record in records:
+        key = site_key(record.company_url) or record.company_url
+        if key not in blocks:
+            blocks[key] = []
+            order.append(key)
+        blocks[key].append(record)
+
+    resolved = []
+    for key in order:
+        block = blocks[key]
+        first = block[0]
+        if len(block) == 1:
+            first.founders = resolve_founders(first.founders, min_score)
+            resolved.append(first)
+            continue
+
+        resolved.append(CompanyRecord(
+            company_name=first.company_name,
+            company_url=first.company_url,
+            description=next((r.description for r in block if r.description), ''),
+            founders=resolve_founders([f for r in block for f in r.founders], min_score),
+            all_emails=_unique(e for r in block for e in r.all_emails),
+            tech_stack=_unique(t for r in block for t in r.tech_stack),
+            scraped_at=max(r.scraped_at for r in block),
+            last_changed=max(r.last_changed or r.scraped_at for r in block),
+            social={k: v for r in reversed(block) for k, v in r.social.items()}
+        ))
+    return resolved
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Run history - what changed between scrape runs, without reloading snapshots
+
+RunRegistry is a small SQLite database next to the other caches. Companies
+are keyed by site_key() and founders by (company, name_key()), so IDs stay
+stable across runs, URL variants and name spellings. For every company it
+keeps only the latest founder / email sets and a content hash:
+
+    record_company()  hash unchanged  ->  just mark the company as seen
+                      hash changed    ->  diff against the stored sets and
+                                          append rows to the changes table
+
+Diffs between runs are then plain queries over `changes` (new companies,
+new and departed founders, new emails) - O(changes), not O(snapshot).
+A company missing from a run is not reported as removed, since runs may
+cover different portfolios or stop early.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+from portfolio_resolve import name_key
+from portfolio_urls import site_key
+
+CHANGE_KINDS = ('new_company', 'new_founder', 'departed_founder', 'new_email')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT, portfolio_url TEXT, started_at TEXT, finished_at TEXT,
+    companies INTEGER DEFAULT 0, changed INTEGER DEFAULT 0, dataset TEXT DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS companies (
+    company_id TEXT PRIMARY KEY, company_name TEXT, company_url TEXT,
+    content_hash TEXT, first_run INTEGER, last_run INTEGER
+);
+CREATE TABLE IF NOT EXISTS founders (
+    company_id TEXT, founder_id TEXT, name TEXT, role TEXT,
+    PRIMARY KEY (company_id, founder_id)
+);
+CREATE TABLE IF NOT EXISTS emails (
+    company_id TEXT, email TEXT,
+    PRIMARY KEY (company_id, email)
+);
+CREATE TABLE IF NOT EXISTS changes (
+    run INTEGER, company_id TEXT, kind TEXT, item TEXT, detail TEXT
+);
+CREATE INDEX IF NOT EXISTS changes_run ON changes (run);
+"""
+
+
+def company_id(company):
+    return site_key(company.company_url) or company.company_url
+
+
+def founder_id(company_key, founder):
+    return hashlib.sha1(f"{company_key}|{name_key(founder.name)}".encode('utf-8')).hexdigest()[:16]
+
+
+def content_hash(founder_ids, emails):
+    """Hash of what the diff looks at: founder IDs and email addresses"""
+    payload = '\n'.join(sorted(founder_ids)) + '\0' + '\n'.join(sorted(emails))
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class RunRegistry:
+    """Scrape runs, latest company state and the changes each run introduced"""
+
+    FILENAME = 'runs.sqlite'
+
+    def __init__(self, cache_dir='.portfolio_cache'):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, self.FILENAME)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        with self.lock, self.conn:
+            self.conn.execute('PRAGMA journal_mode=WAL')  # dashboards read while a job writes
+            self.conn.executescript(SCHEMA)
+
+    # Writing -------------------------------------------------------------
+
+    def start_run(self, portfolio_url='', run_id=None):
+        """Register a run, returns its numeric id"""
+        run_id = run_id or datetime.now().strftime("%Y%m%d_%H%M%S")
+        with self.lock, self.conn:
+            cursor = self.conn.execute(
+                'INSERT INTO runs (run_id, portfolio_url, started_at) VALUES (?, ?, ?)',
+                (run_id, portfolio_url, datetime.now().isoformat())
+            )
+        return cursor.lastrowid
+
+    def record_company(self, run, company):
+        """Fold one scraped CompanyRecord into the registry, returns the changes it caused"""
+        key = company_id(company)
+        founders = {founder_id(key, f): f for f in company.founders}
+        emails = {e.lower() for e in company.all_emails} | {f.email.lower() for f in company.founders if f.email}
+        digest = content_hash(founders, emails)
+
+        with self.lock, self.conn:
+            row = self.conn.execute('SELECT content_hash FROM companies WHERE company_id = ?', (key,)).fetchone()
+            if row is not None and row['content_hash'] == digest:
+                self.conn.execute(
+                    'UPDATE companies SET company_name = ?, company_url = ?, last_run = ? WHERE company_id = ?',
+                    (company.company_name, company.company_url, run, key)
+                )
+                return []
+
+            changes = []
+            if row is None:
+                changes.append(('new_company', company.company_url, company.company_name))
+                self.conn.execute(
+                    'INSERT INTO companies VALUES (?, ?, ?, ?, ?, ?)',
+                    (key, company.company_name, company.company_url, digest, run, run)
+                )
+                known_founders, known_emails = {}, set()
+            else:
+                self.conn.execute(
+                    'UPDATE companies SET company_name = ?, company_url = ?, content_hash = ?, last_run = ? '
+                    'WHERE company_id = ?',
+                    (company.company_name, company.company_url, digest, run, key)
+                )
+                known_founders = {
+                    r['founder_id']: r['name']
+                    for r in self.conn.execute('SELECT founder_id, name FROM founders WHERE company_id = ?', (key,))
+                }
+                known_emails = {
+                    r['email'] for r in self.conn.execute('SELECT email FROM emails WHERE company_id = ?', (key,))
+                }
+
+            for fid, founder in founders.items():
+                if fid not in known_founders:
+                    changes.append(('new_founder', founder.name, founder.role))
+            for fid, name in known_founders.items():
+                if fid not in founders:
+                    changes.append(('departed_founder', name, ''))
+            for email in sorted(emails - known_emails):
+                changes.append(('new_email', email, ''))
+
+            # Keep only the latest sets
+            self.conn.execute('DELETE FROM founders WHERE company_id = ?', (key,))
+            self.conn.executemany(
+                'INSERT INTO founders VALUES (?, ?, ?, ?)',
+                [(key, fid, f.name, f.role) for fid, f in founders.items()]
+            )
+            self.conn.execute('DELETE FROM emails WHERE company_id = ?', (key,))
+            self.conn.executemany('INSERT INTO emails VALUES (?, ?)', [(key, e) for e in emails])
+            self.conn.executemany(
+                'INSERT INTO changes VALUES (?, ?, ?, ?, ?)',
+                [(run, key, kind, item, detail) for kind, item, detail in changes]
+            )
+        return [{'kind': kind, 'item': item, 'detail': detail} for kind, item, detail in changes]
+
+    def finish_run(self, run, dataset=''):
+        with self.lock, self.conn:
+            self.conn.execute(
+                'UPDATE runs SET finished_at = ?, dataset = ?, '
+                'companies = (SELECT COUNT(*) FROM companies WHERE last_run = ?), '
+                'changed = (SELECT COUNT(DISTINCT company_id) FROM changes WHERE run = ?) WHERE id = ?',
+                (datetime.now().isoformat(), dataset, run, run, run)
+            )
+
+    def record_run(self, records, portfolio_url='', run_id=None, dataset=''):
+        """Register a whole dataset as one run (snapshots, re-extractions), returns the run id"""
+        run = self.start_run(portfolio_url, run_id)
+        for company in records:
+            self.record_company(run, company)
+        self.finish_run(run, dataset)
+        return run
+
+    # Reading -------------------------------------------------------------
+
+    def runs(self, limit=20):
+        """Most recent runs first"""
+        with self.lock:
+            rows = self.conn.execute('SELECT * FROM runs ORDER BY id DESC LIMIT ?', (limit,)).fetchall()
+        return [dict(r) for r in rows]
+
+    def resolve_run(self, ref):
+        """Numeric run id for 'latest', a run number or a run_id timestamp - None if unknown"""
+        with self.lock:
+            if ref in (None, '', 'latest'):
+                row = self.conn.execute('SELECT MAX(id) AS id FROM runs').fetchone()
+            elif str(ref).isdigit():
+                row = self.conn.execute('SELECT id FROM runs WHERE id = ?', (int(ref),)).fetchone()
+            else:
+                row = self.conn.execute('SELECT MAX(id) AS id FROM runs WHERE run_id = ?', (ref,)).fetchone()
+        return row['id'] if row is not None else None
+
+    def changes(self, run, since=None):
+        """Changes recorded after run `since` up to and including `run` (default: just `run`)"""
+        since = run - 1 if since is None else since
+        with self.lock:
+            rows = self.conn.execute(
+                'SELECT c.run, c.kind, c.item, c.detail, c.company_id, co.company_name, co.company_url '
+                'FROM changes c LEFT JOIN companies co ON co.company_id = c.company_id '
+                'WHERE c.run > ? AND c.run <= ? ORDER BY c.run, co.company_name, c.rowid',
+                (since, run)
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+def summarize(changes):
+    """{kind: count} for every change kind"""
+    counts = dict.fromkeys(CHANGE_KINDS, 0)
+    for change in changes:
+        counts[change['kind']] = counts.get(change['kind'], 0) + 1
+    return counts
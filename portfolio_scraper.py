@@ -2,6 +2,11 @@
 """
 PORTFOLIO SCRAPER - Scrapes ALL companies from portfolio pages
 This visits EACH company website to get complete founder data
+
+Heavy dependencies (selenium, pandas, BeautifulSoup, openai) are imported on
+first use and Chrome starts on the first browser navigation, so importing this
+module - or using it only to export data or re-run extractors on saved HTML -
+never pays for them.
 """
 
 import time
@@ -9,64 +14,245 @@ import json
 import re
 import os
 from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.service import Service
-import pandas as pd
-from bs4 import BeautifulSoup
-from urllib.parse import urlparse, urljoin
-import openai
-from collections import defaultdict
+from urllib.parse import urldefrag, urljoin
 import pickle
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from portfolio_aggregates import PortfolioAggregates, save_aggregates
+from portfolio_backends import BROWSER_ENGINES, CDPEngine, HttpBackend, SeleniumBackend
+from portfolio_budget import DEFAULT_BUDGET, CompanyBudget, is_confident, link_yield, looks_parked, page_text
+from portfolio_cache import FingerprintCache, content_fingerprint
+from portfolio_concurrency import AdaptiveLimiter, default_max_limit
+from portfolio_records import CompanyRecord, dump_records, to_records
+from portfolio_emails import EmailInference
+from portfolio_events import EventLog
+from portfolio_pagestore import PageStore
+from portfolio_resolve import resolve_founders, resolve_records
+from portfolio_runs import RunRegistry, summarize
+from portfolio_structured import extract_structured
+from portfolio_templates import TemplateRules, card_selector, detect_template, extract_with_template, looks_like_people
+from portfolio_urls import BLOCKED_HOSTS, HostFilter, RedirectCache, canonical_url, site_key
+from portfolio_export import COLUMNAR_FORMATS, StreamingExporter, export_columnar, write_csv, write_excel
+from portfolio_mx import MXValidator
 
 # YOUR API KEY
-import os
-openai.api_key = os.getenv("OPENAI_API_KEY")
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+
+FETCH_MODES = ('browser', 'http', 'hybrid')
+
+# 4xx answers other than 429 are about the page, not about how hard we are pushing the server
+CLIENT_ERROR_RE = re.compile(r'http error 4(?!29)\d\d')
+
+
+def parse_html(html):
+    """BeautifulSoup tree of a page (bs4 is imported on first use)"""
+    from bs4 import BeautifulSoup
+    return BeautifulSoup(html, 'html.parser')
+
+
+def looks_client_rendered(html, min_text=300):
+    """True when a raw HTTP response is an empty JS shell that needs a real browser"""
+    return len(page_text(html)) < min_text
+
 
 class PortfolioScraper:
-    def __init__(self, headless=False):
+    def __init__(self, headless=False, cache_dir='.portfolio_cache', stream_formats=('csv', 'jsonl'),
+                 stream_sync='flush', keep_in_memory=True, event_file=None, fetch_mode='browser',
+                 workers=1, delay=2, http_timeout=20, resume=False,
+                 export_formats=('xlsx', 'csv', 'json', 'parquet'), archive_dir=None, use_ai=True,
+                 validate_emails=False, mx_resolver=None, block_hosts=(), allow_hosts=(),
+                 browser_engine='selenium', page_budget=None, runs_dir=None):
         print("🚀 Initializing Portfolio Scraper...")
         
-        # Chrome options
-        self.options = Options()
-        if headless:
-            self.options.add_argument("--headless")
-        self.options.add_argument("--no-sandbox")
-        self.options.add_argument("--disable-dev-shm-usage")
-        self.options.add_argument("--window-size=1920,1080")
-        self.options.add_argument("--disable-blink-features=AutomationControlled")
-        self.options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        self.options.add_argument("user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36")
-        
-        service = Service(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=service, options=self.options)
-        self.wait = WebDriverWait(self.driver, 20)
+        if fetch_mode not in FETCH_MODES:
+            raise ValueError(f"Unknown fetch mode: {fetch_mode}")
+        if browser_engine not in BROWSER_ENGINES:
+            raise ValueError(f"Unknown browser engine: {browser_engine}")
+        
+        self.headless = headless
+        self.fetch_mode = fetch_mode      # browser, http (no JS) or hybrid (http, browser fallback)
+        # Parallel company scrapers, one browser (or CDP tab) each; 'auto' adapts the
+        # number in flight to observed latency, timeouts and host headroom
+        self.limiter = None
+        if workers == 'auto':
+            self.limiter = AdaptiveLimiter(initial=2, max_limit=default_max_limit(fetch_mode, browser_engine))
+            workers = self.limiter.max_limit
+        self.workers = max(1, workers)
+        self.delay = delay                # politeness delay after each company
+        self.http_timeout = http_timeout
+        self.export_formats = export_formats
+        self.use_ai = use_ai              # OpenAI fallback, once per company with < 2 founders
+        # Max pages / bytes / seconds spent on one company (see portfolio_budget)
+        self.page_budget = dict(DEFAULT_BUDGET, **(page_budget or {}))
+        
+        # Page loading: urllib for http mode, Chrome started on the first browser navigation.
+        # The CDP engine runs one Chrome for all worker scrapers, one tab each.
+        self.browser_engine = browser_engine
+        self.http = HttpBackend(http_timeout)
+        self.engine = CDPEngine(headless=headless) if browser_engine == 'cdp' else None
+        self._browser = None
         
         self.portfolio_data = []
+        self.aggregates = PortfolioAggregates()   # analytics summaries of portfolio_data
+        self.run_ids = set()                      # export timestamps used by this scraper
         
-    def find_portfolio_companies(self, portfolio_url):
-        """Find all company links on a portfolio page"""
-        print(f"\n📂 Finding companies on: {portfolio_url}")
+        # Content fingerprints from previous runs (None disables change detection)
+        self.fingerprints = FingerprintCache(cache_dir) if cache_dir else None
+        
+        # Run history: per-company changes between runs (kept with the caches unless
+        # runs_dir says otherwise, so runs without a cache are still recorded)
+        runs_dir = runs_dir or cache_dir
+        self.runs = RunRegistry(runs_dir) if runs_dir else None
+        
+        # URL canonicalization: redirect targets, host block/allow lists, sites already scraped
+        self.redirects = RedirectCache(cache_dir)
+        self.host_filter = HostFilter(BLOCKED_HOSTS + tuple(block_hosts), allow_hosts)
+        self.claimed_sites = {}   # site key -> company url that owns it
+        self.claim_lock = threading.Lock()
+        
+        # Founder selectors per site builder, growing as builders are confirmed
+        self.template_rules = TemplateRules(cache_dir)
         
-        self.driver.get(portfolio_url)
-        time.sleep(3)
+        # Email address patterns learned per company domain
+        self.email_inference = EmailInference(cache_dir)
         
-        # Scroll to load all content
-        last_height = self.driver.execute_script("return document.body.scrollHeight")
+        # Optional MX check that drops emails on domains that can't receive mail
+        self.mx_validator = None
+        if validate_emails:
+            try:
+                self.mx_validator = MXValidator(mx_resolver)
+            except ImportError as e:
+                print(f"⚠️  Skipping email validation: {e}")
+        
+        # Compressed raw HTML of every company page, for offline re-extraction
+        self.page_store = PageStore(archive_dir) if archive_dir else None
+        
+        # Per-run CSV / JSON Lines streams written as each company finishes
+        self.stream_formats = stream_formats
+        self.stream_sync = stream_sync
+        # False keeps memory flat: results only go to the streams
+        self.keep_in_memory = keep_in_memory
+        
+        # Structured progress events (optionally mirrored to a JSON Lines file)
+        self.events = EventLog(event_file)
+        if self.limiter is not None:
+            self.events.add_listener(self._feed_limiter)
+        
+        # Pick up where an interrupted run left off
+        if resume and os.path.exists('portfolio_data.pkl'):
+            with open('portfolio_data.pkl', 'rb') as f:
+                self.portfolio_data = to_records(pickle.load(f))
+            self.aggregates = PortfolioAggregates.from_records(self.portfolio_data)
+            print(f"♻️  Resuming with {len(self.portfolio_data)} previously scraped companies")
+        
+    @property
+    def browser(self):
+        """Browser backend (Selenium driver or a CDP tab), started on first use"""
+        if self._browser is None:
+            if self.engine is not None:
+                self._browser = self.engine.new_tab()
+            else:
+                self._browser = SeleniumBackend(self.headless)
+        return self._browser
+    
+    def _fetch(self, url, settle=3):
+        """Fetch a page with the configured mode, returns (html, final_url)"""
+        if self.fetch_mode in ('http', 'hybrid'):
+            try:
+                html, final_url = self._fetch_http(url)
+                if self.fetch_mode == 'http' or not looks_client_rendered(html):
+                    return html, final_url
+            except Exception:
+                if self.fetch_mode == 'http':
+                    raise
+        
+        return self._fetch_browser(url, settle)
+    
+    def _fetch_browser(self, url, settle=3):
+        """Load a page in Chrome and let scripts settle"""
+        started = time.time()
+        try:
+            html, final_url = self.browser.fetch(url, settle)
+        except Exception as e:
+            self.events.emit('page_fetched', url=url, mode='browser', seconds=round(time.time() - started, 3),
+                             ok=False, error=str(e))
+            raise
+        self.events.emit('page_fetched', url=url, mode='browser', seconds=round(time.time() - started, 3))
+        return html, final_url
+    
+    def _fetch_http(self, url):
+        """Plain HTTP GET (no JavaScript)"""
+        started = time.time()
+        try:
+            html, final_url = self.http.fetch(url)
+        except Exception as e:
+            self.events.emit('page_fetched', url=url, mode='http', seconds=round(time.time() - started, 3),
+                             ok=False, error=str(e))
+            raise
+        self.events.emit('page_fetched', url=url, mode='http', seconds=round(time.time() - started, 3))
+        return html, final_url
+    
+    def _scroll_to_bottom(self):
+        """Scroll the loaded page so lazy/infinite lists render"""
+        last_height = self.browser.run_script("document.body.scrollHeight")
         for i in range(5):
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            self.browser.run_script("window.scrollTo(0, document.body.scrollHeight)")
             time.sleep(2)
-            new_height = self.driver.execute_script("return document.body.scrollHeight")
+            new_height = self.browser.run_script("document.body.scrollHeight")
             if new_height == last_height:
                 break
             last_height = new_height
         
-        companies = []
+    def find_portfolio_companies(self, portfolio_url):
+        """Find all company links on a portfolio page"""
+        print(f"\n📂 Finding companies on: {portfolio_url}")
+        
+        html = None
+        backend = self.http   # whichever backend holds the page, for harvest_links()
+        if self.fetch_mode in ('http', 'hybrid'):
+            try:
+                html, _ = self._fetch_http(portfolio_url)
+                if self.fetch_mode == 'hybrid' and looks_client_rendered(html):
+                    html = None
+            except Exception:
+                if self.fetch_mode == 'http':
+                    raise
+        
+        if html is None:
+            self._fetch_browser(portfolio_url)
+            # Scroll to load all content
+            self._scroll_to_bottom()
+            backend = self.browser
+            html = backend.html()
+        
+        soup = parse_html(html)
+        
+        # One URL per company site: canonical form, known redirects followed,
+        # social/press hosts and the fund's own site excluded
+        fund_sites = {site_key(portfolio_url), site_key(self.redirects.resolve(portfolio_url))}
+        found_links = {}  # site key -> url
+        
+        def consider(href):
+            # The canonical form only deduplicates; the link as written is what
+            # gets fetched, since some sites only answer on www.
+            canonical = canonical_url(href, portfolio_url)
+            if not canonical or not self.host_filter.allows(canonical):
+                return
+            key = site_key(self.redirects.resolve(canonical))
+            if key in fund_sites:
+                return
+            url = urldefrag(urljoin(portfolio_url, href.strip()))[0]
+            current = found_links.get(key)
+            if current is None:
+                found_links[key] = url
+                return
+            # Prefer the homepage when a company is linked several times, and
+            # https whenever any of the links uses it
+            secure = url.startswith('https:') or current.startswith('https:')
+            url = min(current, url, key=lambda u: len(canonical_url(u).partition('://')[2]))
+            if secure and url.startswith('http:'):
+                url = 'https:' + url[len('http:'):]
+            found_links[key] = url
         
         # Method 1: Look for portfolio grid/list items
         selectors = [
@@ -82,44 +268,33 @@ class PortfolioScraper:
             "div[class*='item'] a"
         ]
         
-        found_links = set()
-        
         for selector in selectors:
-            try:
-                links = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                for link in links:
-                    href = link.get_attribute('href')
-                    if href and href.startswith('http'):
-                        # Filter out social media and non-company links
-                        if not any(skip in href for skip in ['linkedin.com', 'twitter.com', 'facebook.com', 'youtube.com', '#', 'mailto:']):
-                            found_links.add(href)
-            except:
-                continue
+            for link in soup.select(selector):
+                consider(link.get('href'))
         
         # Method 2: Find all links and filter
-        all_links = self.driver.find_elements(By.TAG_NAME, 'a')
-        for link in all_links:
-            try:
-                href = link.get_attribute('href')
-                text = link.text.strip()
-                
-                if href and text and len(text) > 3:
-                    # Check if it looks like a company link
-                    if any(pattern in href for pattern in ['.com', '.io', '.co', '.ai', '.xyz']):
-                        if href not in found_links and portfolio_url not in href:
-                            if not any(skip in href for skip in ['linkedin', 'twitter', 'facebook', 'mailto']):
-                                parent_class = link.find_element(By.XPATH, '..').get_attribute('class') or ''
-                                if any(keyword in parent_class.lower() for keyword in ['portfolio', 'company', 'card', 'item']):
-                                    found_links.add(href)
-            except:
-                continue
+        for link in soup.find_all('a', href=True):
+            href = link['href']
+            text = link.get_text().strip()
+            
+            if href and text and len(text) > 3:
+                # Check if it looks like a company link
+                if any(pattern in href for pattern in ['.com', '.io', '.co', '.ai', '.xyz']):
+                    parent_class = ' '.join(link.parent.get('class') or []) if link.parent else ''
+                    if any(keyword in parent_class.lower() for keyword in ['portfolio', 'company', 'card', 'item']):
+                        consider(href)
+        
+        # Method 3: logo walls (image links without text or telling class names) -
+        # every link the backend resolved on the page, minus blocked hosts and the fund
+        if not found_links:
+            for href in backend.harvest_links():
+                consider(href)
         
         # Get company names where possible
-        for link in found_links:
-            companies.append({
-                'url': link,
-                'name': urlparse(link).netloc.replace('www.', '').split('.')[0].title()
-            })
+        companies = [
+            {'url': url, 'name': key.split('.')[0].title()}
+            for key, url in found_links.items()
+        ]
         
         print(f"✅ Found {len(companies)} portfolio companies")
         return companies
@@ -127,106 +302,247 @@ class PortfolioScraper:
     def scrape_company(self, company_url, company_name=""):
         """Scrape a single company website for founder information"""
         print(f"\n🏢 Scraping: {company_name or company_url}")
+        self.events.emit('company_started', url=company_url, name=company_name)
         
         try:
-            self.driver.get(company_url)
-            time.sleep(3)
+            budget = CompanyBudget(**self.page_budget)
+            page_source, final_url = self._fetch(company_url)
+            budget.spend(page_source)
             
-            # Get basic info
-            title = self.driver.title
-            domain = urlparse(company_url).netloc
+            # A redirect can land on a company another link already covers
+            self.redirects.record(company_url, final_url)
+            if not self._claim_site(company_url, final_url):
+                print(f"   ↪️  Same site as another company ({final_url}) - skipping")
+                self.events.emit('company_skipped', url=company_url, name=company_name, final_url=final_url,
+                                 reason='duplicate')
+                return None
             
-            # Try to get company name
-            if not company_name:
-                company_name = title.split(' - ')[0].split(' | ')[0].strip()
+            # Parked domains and placeholder pages have no founders to find
+            parked = looks_parked(page_source)
+            if parked:
+                print(f"   🅿️  Looks like a {parked} page - skipping")
+                self.events.emit('company_skipped', url=company_url, name=company_name, final_url=final_url,
+                                 reason=parked)
+                return None
             
-            # Get page source
-            page_source = self.driver.page_source
-            soup = BeautifulSoup(page_source, 'html.parser')
+            soup = parse_html(page_source)
             
-            # Extract description
-            description = ""
-            try:
-                meta_desc = self.driver.find_element(By.XPATH, "//meta[@name='description']").get_attribute('content')
-                description = meta_desc
-            except:
-                pass
+            # Keep the raw HTML so extractors can be re-run offline
+            if self.page_store is not None:
+                self.page_store.put(company_url, page_source, company_url, company_name)
             
-            # Find about/team page links
-            about_links = []
-            for link in self.driver.find_elements(By.TAG_NAME, 'a'):
-                href = link.get_attribute('href') or ''
-                text = link.text.lower()
-                if any(keyword in href.lower() or keyword in text for keyword in ['about', 'team', 'founders', 'leadership', 'people']):
-                    if company_url in href:
-                        about_links.append(href)
+            # Reuse the previous result if the site hasn't changed
+            page_hashes = {}
+            prefetched = {}   # about page re-checked for the cache -> its HTML
+            fingerprint = None
+            if self.fingerprints is not None:
+                fingerprint = content_fingerprint(page_source)
+                page_hashes[company_url] = fingerprint
+                # An unchanged homepage says little about /team - re-check the top about page too
+                for about_link in self.fingerprints.pages_to_verify(company_url, fingerprint):
+                    try:
+                        print(f"   📄 Re-checking {about_link}")
+                        about_source, _ = self._fetch(about_link, settle=2)
+                    except Exception:
+                        budget.spend('')
+                        continue  # can't tell - trust the homepage
+                    budget.spend(about_source)
+                    page_hashes[about_link] = content_fingerprint(about_source)
+                    prefetched[about_link] = about_source
+                cached = self.fingerprints.lookup(company_url, fingerprint, page_hashes)
+                if cached:
+                    print(f"   ♻️  Unchanged since {cached['last_changed']} - reusing previous result")
+                    company_data = CompanyRecord.from_dict(cached)
+                    self._company_done(company_data, cached=True, pages=budget.pages)
+                    return company_data
             
-            # Extract founders from main page
-            founders = self.extract_founders_from_page(page_source, company_url)
+            structured = extract_structured(page_source)
+            founders = self.extract_founders_from_page(page_source, company_url, structured=structured, allow_ai=False)
             
-            # Visit about/team pages for more founder info
-            for about_link in about_links[:2]:  # Limit to 2 pages
-                try:
-                    print(f"   📄 Checking {about_link}")
-                    self.driver.get(about_link)
-                    time.sleep(2)
-                    about_source = self.driver.page_source
-                    more_founders = self.extract_founders_from_page(about_source, about_link)
-                    
-                    # Merge founders (avoid duplicates)
-                    existing_names = {f['name'].lower() for f in founders}
-                    for founder in more_founders:
-                        if founder['name'].lower() not in existing_names:
-                            founders.append(founder)
-                            existing_names.add(founder['name'].lower())
-                except:
-                    continue
+            # Visit the most promising about/team pages until the founders look
+            # complete or the company's budget is spent
+            about_pages = []
+            for about_link in self.find_about_links(soup, final_url):
+                if is_confident(resolve_founders(founders), structured=bool(structured['founders'])):
+                    print("   🎯 Founders look complete - no more pages needed")
+                    break
+                about_source = prefetched.pop(about_link, None)
+                if about_source is None:
+                    spent = budget.exhausted()
+                    if spent:
+                        print(f"   💰 Page budget spent ({spent}) - not fetching more pages")
+                        break
+                    try:
+                        print(f"   📄 Checking {about_link}")
+                        about_source, _ = self._fetch(about_link, settle=2)
+                    except Exception:
+                        budget.spend('')
+                        continue
+                    budget.spend(about_source)
+                    if fingerprint is not None:
+                        page_hashes[about_link] = content_fingerprint(about_source)
+                about_pages.append((about_link, about_source))
+                founders.extend(self.extract_founders_from_page(about_source, about_link, allow_ai=False))
             
-            # Extract emails
-            all_emails = self.extract_all_emails(page_source)
+            if self.page_store is not None:
+                for about_link, about_source in about_pages:
+                    self.page_store.put(about_link, about_source, company_url, company_name)
             
-            # Extract tech stack
-            tech_stack = self.extract_tech_stack(page_source)
+            company_data = self.extract_company(company_url, company_name, page_source, about_pages, soup=soup,
+                                                structured=structured, founders=founders)
             
-            # Match emails to founders
-            for founder in founders:
-                if not founder.get('email'):
-                    name_parts = founder['name'].lower().split()
-                    for email in all_emails:
-                        email_local = email.split('@')[0].lower()
-                        if any(part in email_local for part in name_parts):
-                            founder['email'] = email
-                            break
-                    
-                    # Generate email if not found
-                    if not founder.get('email') and name_parts:
-                        founder['email'] = f"{name_parts[0]}@{domain}"
+            if self.mx_validator is not None:
+                stats = self.mx_validator.filter_records([company_data])
+                dropped = stats['emails_dropped'] + stats['founder_emails_cleared']
+                if dropped:
+                    print(f"   📭 Dropped {dropped} emails on domains without mail servers")
             
-            company_data = {
-                'company_name': company_name,
-                'company_url': company_url,
-                'description': description,
-                'founders': founders,
-                'all_emails': all_emails,
-                'tech_stack': tech_stack,
-                'scraped_at': datetime.now().isoformat()
-            }
+            # Record when the content last changed
+            if fingerprint is not None:
+                company_data.last_changed = self.fingerprints.store(
+                    company_url, fingerprint, company_data.to_dict(), page_hashes
+                )
             
-            print(f"   ✅ Found {len(founders)} founders")
+            print(f"   ✅ Found {company_data.founders_count} founders ({budget.pages} pages)")
+            self._company_done(company_data, pages=budget.pages)
             return company_data
             
         except Exception as e:
             print(f"   ❌ Error: {str(e)}")
+            self.events.emit('error', url=company_url, name=company_name, message=str(e))
             return None
     
-    def extract_founders_from_page(self, page_source, url):
-        """Extract founder information from a page"""
-        soup = BeautifulSoup(page_source, 'html.parser')
+    def _claim_site(self, company_url, final_url):
+        """Reserve a company's site keys for this URL; False if another company owns them"""
+        keys = {site_key(company_url), site_key(final_url)}
+        with self.claim_lock:
+            if any(self.claimed_sites.get(key, company_url) != company_url for key in keys):
+                return False
+            for key in keys:
+                self.claimed_sites[key] = company_url
+        return True
+    
+    def find_about_links(self, soup, page_url):
+        """Same-site about/team page links, most likely to list founders first
+        
+        page_url: where the homepage was actually served from (after redirects),
+        so relative links resolve and www / scheme variants count as the same site
+        """
+        scores = {}
+        links = {}   # canonical URL -> first link seen for it
+        site = site_key(page_url)
+        homepage = canonical_url(page_url)
+        for link in soup.find_all('a', href=True):
+            href = urldefrag(urljoin(page_url, link['href']))[0]
+            key = canonical_url(href)
+            if not key or key == homepage or site_key(key) != site:
+                continue
+            score = link_yield(href, link.get_text())
+            if score > scores.get(key, 0):
+                scores[key] = score
+                links.setdefault(key, href)
+        # Stable sort keeps page order between equally promising links
+        return [links[key] for key in sorted(scores, key=lambda key: -scores[key])]
+    
+    def extract_company(self, company_url, company_name, page_source, about_pages, soup=None,
+                        structured=None, founders=None):
+        """Run every extractor over already-fetched pages (homepage + [(url, html)] about pages)
+        
+        founders: raw founders scrape_company already extracted page by page
+        """
+        if soup is None:
+            soup = parse_html(page_source)
+        
+        # Get basic info
+        title = soup.title.get_text().strip() if soup.title else ''
+        
+        # JSON-LD / OpenGraph data the site declares about itself
+        if structured is None:
+            structured = extract_structured(page_source)
+        
+        # Try to get company name
+        if not company_name:
+            company_name = structured['name'] or title.split(' - ')[0].split(' | ')[0].strip()
+        
+        # Extract description
+        description = ""
+        meta_desc = soup.find('meta', attrs={'name': 'description'})
+        if meta_desc and meta_desc.get('content'):
+            description = meta_desc['content']
+        if not description:
+            description = structured['description']
+        
+        # Extract founders from main and about pages, then merge duplicates / drop junk
+        if founders is None:
+            founders = self.extract_founders_from_page(page_source, company_url, structured=structured, allow_ai=False)
+            for about_link, about_source in about_pages:
+                founders.extend(self.extract_founders_from_page(about_source, about_link, allow_ai=False))
+        
+        # Last resort: one AI call over every page the heuristics came up short on
+        if len(resolve_founders(founders)) < 2 and not structured['founders'] and self.use_ai and OPENAI_API_KEY:
+            pages = [about_source for _, about_source in about_pages] + [page_source]
+            founders.extend(self.extract_founders_with_ai(' '.join(page_text(p) for p in pages), founders))
+        founders = resolve_founders(founders)
+        
+        # Extract emails
+        all_emails = self.extract_all_emails(page_source)
+        
+        # Extract tech stack
+        tech_stack = self.extract_tech_stack(page_source)
+        
+        # Match emails to founders, infer the rest from the company's address pattern
+        self.email_inference.assign(company_url, founders, all_emails)
+        
+        return CompanyRecord(
+            company_name=company_name,
+            company_url=company_url,
+            description=description,
+            founders=founders,
+            all_emails=all_emails,
+            tech_stack=tech_stack,
+            scraped_at=datetime.now().isoformat(),
+            social=structured['social']
+        )
+    
+    def _company_done(self, company_data, cached=False, pages=0):
+        self.events.emit(
+            'company_done',
+            url=company_data.company_url,
+            name=company_data.company_name,
+            founders=company_data.founders_count,
+            emails=company_data.emails_count,
+            cached=cached,
+            pages=pages
+        )
+    
+    def extract_founders_from_page(self, page_source, url, structured=None, allow_ai=True):
+        """Extract founder information from a page (allow_ai=False leaves the AI call to the caller)"""
+        # Method 0: founders declared in JSON-LD - when present, skip the heuristics and AI
+        if structured is None:
+            structured = extract_structured(page_source)
+        if structured['founders']:
+            print(f"   🧩 {len(structured['founders'])} founders from structured data")
+            return list(structured['founders'])
+        
+        soup = parse_html(page_source)
         founders = []
         seen_names = set()
         
-        # Method 1: Look for structured data
-        team_sections = soup.find_all(['section', 'div'], class_=re.compile('team|founder|leadership|people|about', re.I))
+        # Method 1a: targeted selectors for known site builders (Webflow, Wix, ...). Cards
+        # without any leadership role or LinkedIn profile may be blog posts or feature
+        # blocks, so they are only a fallback for the generic walk below
+        template = detect_template(page_source)
+        template_founders = []
+        if template:
+            template_founders, selector = extract_with_template(soup, template, self.template_rules)
+            if template_founders and looks_like_people(template_founders):
+                self.template_rules.confirm(template, selector)
+                founders = template_founders
+                seen_names.update(f['name'] for f in founders)
+        
+        # Method 1b: Look for structured data
+        team_sections = [] if founders else soup.find_all(['section', 'div'], class_=re.compile('team|founder|leadership|people|about', re.I))
+        learned_card = None
         
         for section in team_sections:
             # Look for person cards
@@ -275,6 +591,7 @@ class PortfolioScraper:
                     
                     if name not in seen_names:
                         seen_names.add(name)
+                        learned_card = learned_card or card
                         founders.append({
                             'name': name,
                             'role': role,
@@ -283,6 +600,14 @@ class PortfolioScraper:
                             'twitter': twitter
                         })
         
+        # Teach the builder's rules the card markup the generic walk found
+        if template and learned_card is not None:
+            if looks_like_people(founders):
+                self.template_rules.confirm(template, card_selector(learned_card))
+        elif not founders and template_founders:
+            founders = template_founders
+            seen_names.update(f['name'] for f in founders)
+        
         # Method 2: Look for name + role patterns in text
         text = soup.get_text()
         patterns = [
@@ -308,39 +633,50 @@ class PortfolioScraper:
                         })
         
         # Method 3: Use AI if enabled
-        if len(founders) < 2 and OPENAI_API_KEY:
+        if allow_ai and len(founders) < 2 and self.use_ai and OPENAI_API_KEY:
+            founders.extend(self.extract_founders_with_ai(text, founders))
+        
+        return founders
+    
+    def extract_founders_with_ai(self, text, known=()):
+        """Founders OpenAI finds in page text, minus names already known"""
+        seen_names = {f['name'] for f in known}
+        founders = []
+        try:
+            # Get clean text
+            clean_text = ' '.join(text.split())[:3000]
+            
+            import openai
+            openai.api_key = OPENAI_API_KEY
+            
+            response = openai.ChatCompletion.create(
+                model="gpt-3.5-turbo",
+                messages=[
+                    {"role": "system", "content": "Extract founder/CEO/team member names and roles. Return JSON array."},
+                    {"role": "user", "content": f"Find founders in this text:\n{clean_text}"}
+                ],
+                temperature=0.1,
+                max_tokens=500
+            )
+            
+            ai_result = response.choices[0].message.content
             try:
-                # Get clean text
-                clean_text = ' '.join(text.split())[:3000]
-                
-                response = openai.ChatCompletion.create(
-                    model="gpt-3.5-turbo",
-                    messages=[
-                        {"role": "system", "content": "Extract founder/CEO/team member names and roles. Return JSON array."},
-                        {"role": "user", "content": f"Find founders in this text:\n{clean_text}"}
-                    ],
-                    temperature=0.1,
-                    max_tokens=500
-                )
-                
-                ai_result = response.choices[0].message.content
-                try:
-                    ai_founders = json.loads(ai_result)
-                    for founder in ai_founders:
-                        if isinstance(founder, dict) and founder.get('name'):
-                            if founder['name'] not in seen_names:
-                                seen_names.add(founder['name'])
-                                founders.append({
-                                    'name': founder['name'],
-                                    'role': founder.get('role', 'Team Member'),
-                                    'email': founder.get('email', ''),
-                                    'linkedin': '',
-                                    'twitter': ''
-                                })
-                except:
-                    pass
+                ai_founders = json.loads(ai_result)
+                for founder in ai_founders:
+                    if isinstance(founder, dict) and founder.get('name'):
+                        if founder['name'] not in seen_names:
+                            seen_names.add(founder['name'])
+                            founders.append({
+                                'name': founder['name'],
+                                'role': founder.get('role', 'Team Member'),
+                                'email': founder.get('email', ''),
+                                'linkedin': '',
+                                'twitter': ''
+                            })
             except:
                 pass
+        except:
+            pass
         
         return founders
     
@@ -376,8 +712,12 @@ class PortfolioScraper:
         
         return found_tech
     
-    def scrape_portfolio(self, portfolio_url):
-        """Main method to scrape an entire portfolio"""
+    def scrape_portfolio(self, portfolio_url, should_stop=None):
+        """Main method to scrape an entire portfolio
+        
+        Progress is reported through self.events; should_stop() is checked before
+        each company so background jobs can be cancelled between companies.
+        """
         print(f"\n🚀 SCRAPING PORTFOLIO: {portfolio_url}")
         print("=" * 60)
         
@@ -386,152 +726,288 @@ class PortfolioScraper:
         
         if not companies:
             print("❌ No companies found on portfolio page")
+            self.events.emit('error', url=portfolio_url, message='No companies found on portfolio page')
+            self.events.emit('portfolio_done', url=portfolio_url, companies=0, founders=0)
             return []
         
+        # Skip companies a resumed run already has
+        done_sites = {site_key(c.company_url) for c in self.portfolio_data}
+        if done_sites:
+            skipped = len(companies)
+            companies = [c for c in companies if site_key(c['url']) not in done_sites]
+            skipped -= len(companies)
+            if skipped:
+                print(f"⏭️  Skipping {skipped} companies already scraped")
+        
         print(f"\n📊 Found {len(companies)} companies to scrape")
         print("=" * 60)
+        self.events.emit('portfolio_started', url=portfolio_url, total=len(companies))
         
-        # Scrape each company
-        for i, company in enumerate(companies):
-            print(f"\n[{i+1}/{len(companies)}] Processing {company['name']}...")
-            
-            company_data = self.scrape_company(company['url'], company['name'])
-            
-            if company_data:
-                self.portfolio_data.append(company_data)
-                
-                # Save progress after each company
-                self.save_data()
-            
-            # Small delay between companies
-            time.sleep(2)
+        run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+        if run_id in self.run_ids:
+            # Several portfolios in the same second must not overwrite each other's exports
+            run_id = f"{run_id}_{len(self.run_ids)}"
+        self.run_ids.add(run_id)
+        run = self.runs.start_run(portfolio_url, run_id) if self.runs is not None else None
+        
+        stream = None
+        if self.stream_formats:
+            stream = StreamingExporter(run_id, formats=self.stream_formats, sync=self.stream_sync)
+            print(f"📡 Streaming results to: {', '.join(stream.paths.values())}")
+        
+        companies_scraped = 0
+        founders_found = 0
+        
+        try:
+            # Scrape each company (results arrive here, on the calling thread)
+            for company_data in self._scrape_companies(companies, should_stop):
+                if company_data:
+                    companies_scraped += 1
+                    founders_found += company_data.founders_count
+                    
+                    if stream is not None:
+                        stream.write_company(company_data)
+                    
+                    if run is not None:
+                        self.runs.record_company(run, company_data)
+                    
+                    if self.keep_in_memory:
+                        self.portfolio_data.append(company_data)
+                        self.aggregates.add(company_data)
+                        
+                        # Save progress after each company
+                        self.save_data()
+        finally:
+            if stream is not None:
+                stream.close()
+            if self.fingerprints is not None:
+                self.fingerprints.save()
+        
+        # Same company listed twice (e.g. with and without www.) becomes one record
+        if self.keep_in_memory:
+            self.portfolio_data = resolve_records(self.portfolio_data)
+            self.aggregates = PortfolioAggregates.from_records(self.portfolio_data)
+            self.save_data()
         
         print("\n" + "=" * 60)
         print("✅ PORTFOLIO SCRAPING COMPLETE!")
-        print(f"   Total companies scraped: {len(self.portfolio_data)}")
-        print(f"   Total founders found: {sum(len(c['founders']) for c in self.portfolio_data)}")
+        print(f"   Total companies scraped: {companies_scraped}")
+        print(f"   Total founders found: {founders_found}")
+        self.events.emit('portfolio_done', url=portfolio_url, companies=companies_scraped, founders=founders_found)
         
         # Final save
-        self.save_all_formats()
+        self.save_all_formats(self.export_formats, timestamp=run_id)
+        
+        if run is not None:
+            saved_json = self.portfolio_data and 'json' in self.export_formats
+            self.runs.finish_run(run, dataset=f'portfolio_data_{run_id}.json' if saved_json else '')
+            counts = summarize(self.runs.changes(run))
+            print(f"🕒 Run {run}: {counts['new_company']} new companies, {counts['new_founder']} new founders, "
+                  f"{counts['departed_founder']} departed founders, {counts['new_email']} new emails")
         
         return self.portfolio_data
     
+    def _scrape_companies(self, companies, should_stop=None):
+        """Yield scrape results (None for failures), sequentially or with worker scrapers"""
+        if self.workers == 1 and self.limiter is None:
+            for i, company in enumerate(companies):
+                if should_stop and should_stop():
+                    print("\n⏹️  Stopped before finishing the portfolio")
+                    return
+                
+                print(f"\n[{i+1}/{len(companies)}] Processing {company['name']}...")
+                yield self.scrape_company(company['url'], company['name'])
+                
+                # Small delay between companies
+                time.sleep(self.delay)
+            return
+        
+        # One scraper (and browser) per worker thread, sharing cache and events
+        local = threading.local()
+        spawned = []
+        spawn_lock = threading.Lock()
+        
+        def scrape(company):
+            if not hasattr(local, 'scraper'):
+                local.scraper = self._spawn_worker()
+                with spawn_lock:
+                    spawned.append(local.scraper)
+            result = local.scraper.scrape_company(company['url'], company['name'])
+            time.sleep(self.delay)
+            return result
+        
+        pending = iter(companies)
+        in_flight = set()
+        
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            try:
+                while True:
+                    # Keep at most `limit` companies in flight so cancellation is prompt
+                    limit = self.limiter.limit if self.limiter is not None else self.workers
+                    while len(in_flight) < limit and not (should_stop and should_stop()):
+                        company = next(pending, None)
+                        if company is None:
+                            break
+                        in_flight.add(pool.submit(scrape, company))
+                    if self.limiter is not None:
+                        self.limiter.observe_in_flight(len(in_flight))
+                    
+                    if not in_flight:
+                        break
+                    
+                    finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        try:
+                            yield future.result()
+                        except Exception as e:
+                            print(f"   ❌ Worker error: {e}")
+                            yield None
+            finally:
+                for future in in_flight:
+                    future.cancel()
+                pool.shutdown(wait=True)
+                for worker in spawned:
+                    worker._quit_browser()
+        
+        if should_stop and should_stop():
+            print("\n⏹️  Stopped before finishing the portfolio")
+    
+    def _feed_limiter(self, event):
+        """Page latencies and failed fetches (homepage or about page) drive the adaptive concurrency limit"""
+        if event['type'] != 'page_fetched':
+            return
+        message = event.get('error', '').lower()
+        if event.get('ok', True) or CLIENT_ERROR_RE.search(message):
+            # A missing page (404 and the like) says nothing about load
+            changed = self.limiter.record(event.get('seconds'))
+        else:
+            changed = self.limiter.record(ok=False, timeout='timed out' in message or 'timeout' in message)
+        if changed is not None:
+            self.events.emit('concurrency', **self.limiter.metrics())
+    
+    def _spawn_worker(self):
+        """Scraper for a worker thread - own browser or tab, shared caches and events"""
+        worker = PortfolioScraper(
+            headless=self.headless,
+            cache_dir=None,
+            stream_formats=None,
+            keep_in_memory=False,
+            fetch_mode=self.fetch_mode,
+            browser_engine='selenium',  # a CDP engine is shared below instead
+            delay=self.delay,
+            http_timeout=self.http_timeout,
+            use_ai=self.use_ai,
+            page_budget=self.page_budget
+        )
+        worker.engine = self.engine
+        worker.fingerprints = self.fingerprints
+        worker.email_inference = self.email_inference
+        worker.template_rules = self.template_rules
+        worker.redirects = self.redirects
+        worker.host_filter = self.host_filter
+        worker.claimed_sites = self.claimed_sites
+        worker.claim_lock = self.claim_lock
+        worker.mx_validator = self.mx_validator
+        worker.page_store = self.page_store
+        worker.events = self.events
+        return worker
+    
+    def start_new_portfolio(self):
+        """Forget the previous portfolio's records so the next one is scraped, saved and exported on its own"""
+        self.portfolio_data = []
+        self.aggregates = PortfolioAggregates()
+        with self.claim_lock:
+            self.claimed_sites.clear()
+    
     def save_data(self):
         """Save current data to pickle for dashboard"""
-        with open('portfolio_data.pkl', 'wb') as f:
+        # Temp file + rename: the dashboard polls this file and must never read it half-written
+        with open('portfolio_data.pkl.tmp', 'wb') as f:
             pickle.dump(self.portfolio_data, f)
+        os.replace('portfolio_data.pkl.tmp', 'portfolio_data.pkl')
+        save_aggregates(self._current_aggregates(), 'portfolio_data.pkl')
+        
+        if self.fingerprints is not None:
+            self.fingerprints.save()
+        self.email_inference.save()
+        self.template_rules.save()
+        self.redirects.save()
     
-    def save_all_formats(self):
-        """Save data in all formats"""
+    def _current_aggregates(self):
+        """Aggregates matching portfolio_data (rebuilt if the records were replaced wholesale)"""
+        if self.aggregates.companies != len(self.portfolio_data):
+            self.aggregates = PortfolioAggregates.from_records(self.portfolio_data)
+        return self.aggregates
+    
+    def save_all_formats(self, formats=('xlsx', 'csv', 'json', 'parquet'), timestamp=None):
+        """Save data in the requested formats (xlsx, csv, json, parquet, arrow)"""
         if not self.portfolio_data:
             return
         
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        # 1. Save detailed Excel with multiple sheets
-        with pd.ExcelWriter(f'portfolio_founders_{timestamp}.xlsx', engine='openpyxl') as writer:
-            # Overview sheet
-            overview_data = []
-            for company in self.portfolio_data:
-                overview_data.append({
-                    'Company Name': company['company_name'],
-                    'Website': company['company_url'],
-                    'Description': company['description'][:200] + '...' if len(company['description']) > 200 else company['description'],
-                    'Founders Count': len(company['founders']),
-                    'Emails Found': len(company['all_emails']),
-                    'Tech Stack': ', '.join(company['tech_stack']),
-                    'Scraped At': company['scraped_at']
-                })
-            
-            pd.DataFrame(overview_data).to_excel(writer, sheet_name='Overview', index=False)
-            
-            # Founders sheet
-            founders_data = []
-            for company in self.portfolio_data:
-                for founder in company['founders']:
-                    founders_data.append({
-                        'Company': company['company_name'],
-                        'Company URL': company['company_url'],
-                        'Founder Name': founder['name'],
-                        'Role': founder['role'],
-                        'Email': founder.get('email', ''),
-                        'LinkedIn': founder.get('linkedin', ''),
-                        'Twitter': founder.get('twitter', '')
-                    })
-            
-            if founders_data:
-                pd.DataFrame(founders_data).to_excel(writer, sheet_name='All Founders', index=False)
-            
-            # Emails sheet
-            emails_data = []
-            for company in self.portfolio_data:
-                for email in company['all_emails']:
-                    emails_data.append({
-                        'Company': company['company_name'],
-                        'Email': email,
-                        'Company URL': company['company_url']
-                    })
-            
-            if emails_data:
-                pd.DataFrame(emails_data).to_excel(writer, sheet_name='All Emails', index=False)
+        timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
+        saved = []
+        
+        # 1. Save detailed Excel with multiple sheets (slow for big portfolios)
+        if 'xlsx' in formats:
+            self._save_excel(f'portfolio_founders_{timestamp}.xlsx')
+            saved.append(f"portfolio_founders_{timestamp}.xlsx (Excel with sheets)")
         
         # 2. Save simple CSV
-        csv_data = []
-        for company in self.portfolio_data:
-            if company['founders']:
-                for founder in company['founders']:
-                    csv_data.append({
-                        'company_name': company['company_name'],
-                        'company_url': company['company_url'],
-                        'company_description': company['description'],
-                        'founder_name': founder['name'],
-                        'founder_role': founder['role'],
-                        'founder_email': founder.get('email', ''),
-                        'linkedin': founder.get('linkedin', ''),
-                        'twitter': founder.get('twitter', ''),
-                        'tech_stack': ', '.join(company['tech_stack'])
-                    })
-            else:
-                csv_data.append({
-                    'company_name': company['company_name'],
-                    'company_url': company['company_url'],
-                    'company_description': company['description'],
-                    'founder_name': '',
-                    'founder_role': '',
-                    'founder_email': '',
-                    'linkedin': '',
-                    'twitter': '',
-                    'tech_stack': ', '.join(company['tech_stack'])
-                })
-        
-        pd.DataFrame(csv_data).to_csv(f'portfolio_founders_{timestamp}.csv', index=False)
+        if 'csv' in formats:
+            self._save_csv(f'portfolio_founders_{timestamp}.csv')
+            saved.append(f"portfolio_founders_{timestamp}.csv (Simple CSV)")
         
         # 3. Save JSON
-        with open(f'portfolio_data_{timestamp}.json', 'w') as f:
-            json.dump(self.portfolio_data, f, indent=2)
+        if 'json' in formats:
+            with open(f'portfolio_data_{timestamp}.json', 'w') as f:
+                json.dump(dump_records(self.portfolio_data), f, indent=2)
+            save_aggregates(self._current_aggregates(), f'portfolio_data_{timestamp}.json')
+            saved.append(f"portfolio_data_{timestamp}.json (Complete JSON)")
+        
+        # 4. Save columnar tables (companies / founders / emails)
+        for fmt in COLUMNAR_FORMATS:
+            if fmt in formats:
+                try:
+                    for path in export_columnar(self.portfolio_data, timestamp, fmt=fmt):
+                        saved.append(f"{path} (Columnar {fmt})")
+                except ImportError as e:
+                    print(f"⚠️  Skipping {fmt} export: {e}")
         
         print(f"\n📁 Data saved to:")
-        print(f"   - portfolio_founders_{timestamp}.xlsx (Excel with sheets)")
-        print(f"   - portfolio_founders_{timestamp}.csv (Simple CSV)")
-        print(f"   - portfolio_data_{timestamp}.json (Complete JSON)")
+        for entry in saved:
+            print(f"   - {entry}")
         print(f"   - portfolio_data.pkl (For dashboard)")
     
+    def _save_excel(self, path):
+        """Excel workbook with overview, founders and emails sheets"""
+        write_excel(self.portfolio_data, path)
+    
+    def _save_csv(self, path):
+        """One row per founder (or per company without founders)"""
+        write_csv(self.portfolio_data, path)
+    
+    def _quit_browser(self):
+        if self._browser is not None:
+            self._browser.close()
+            self._browser = None
+    
     def close(self):
         """Close the browser"""
-        self.driver.quit()
+        if self.fingerprints is not None:
+            self.fingerprints.save()
+        self.email_inference.save()
+        self.template_rules.save()
+        self.redirects.save()
+        self.events.close()
+        if self.page_store is not None:
+            self.page_store.close()
+        if self.runs is not None:
+            self.runs.close()
+        self._quit_browser()
+        if self.engine is not None:
+            self.engine.close()
 
-# Example usage
+# Command line usage: see run_portfolio_scraper.py --help
 if __name__ == "__main__":
-    # Portfolio URLs to scrape
-    portfolio_urls = [
-        "https://www.orangecollective.vc/portfolio",
-        # Add more portfolio URLs here
-    ]
-    
-    scraper = PortfolioScraper(headless=False)
-    
-    try:
-        for url in portfolio_urls:
-            scraper.scrape_portfolio(url)
-    finally:
-        scraper.close()
\ No newline at end of file
+    from run_portfolio_scraper import main
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+In-memory search index for founders, companies, roles and emails
+
+Built once per dataset: an inverted token index (with per-field weights and
+IDF ranking) plus a trigram index over the vocabulary for prefix, substring
+and fuzzy (typo-tolerant) matching. Queries touch only the postings of the
+matching terms, so they stay in the millisecond range at 100k+ founders.
+"""
+
+import heapq
+import math
+import re
+import unicodedata
+from bisect import bisect_left
+from collections import Counter, defaultdict
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+# Match quality for the different ways a query token can match a term.
+# Quality dominates the score; field weight and IDF only order results within a tier.
+EXACT = 1.0
+PREFIX = 0.8
+SUBSTRING = 0.6
+FUZZY = 0.5
+QUALITY_SCALE = 10.0
+IDF_SCALE = 0.1
+
+MAX_EXPANSIONS = 200
+MIN_FUZZY_SIMILARITY = 0.5
+
+
+def tokenize(text):
+    """Lowercase, accent-folded alphanumeric tokens"""
+    if not text:
+        return []
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return TOKEN_RE.findall(text.lower())
+
+
+def _trigrams(term):
+    padded = f'${term}$'
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SearchIndex:
+    """Weighted inverted index over documents with named text fields"""
+
+    def __init__(self, field_weights):
+        self.field_weights = field_weights
+        self.postings = defaultdict(dict)  # term -> {doc_id: (weight, field)}
+        self.doc_count = 0
+        self._terms = None
+        self._term_trigrams = None
+
+    def add(self, doc_id, **fields):
+        """Index one document; fields are name=text pairs from field_weights"""
+        self.doc_count += 1
+        for field, text in fields.items():
+            weight = self.field_weights[field]
+            for term in set(tokenize(text)):
+                current = self.postings[term].get(doc_id)
+                if current is None or current[0] < weight:
+                    self.postings[term][doc_id] = (weight, field)
+        self._terms = None
+
+    def finalize(self):
+        """Build the lookup structures up front (otherwise done on the first search)"""
+        if self._terms is None:
+            self._freeze()
+        return self
+
+    def _freeze(self):
+        """Sorted vocabulary (for prefixes) and term trigrams (for substrings / typos)"""
+        self._terms = sorted(self.postings)
+        self._term_trigrams = defaultdict(list)
+        for term in self._terms:
+            for gram in _trigrams(term):
+                self._term_trigrams[gram].append(term)
+
+    def _expand(self, token, prefix=True, fuzzy=True):
+        """Vocabulary terms matching a query token, with their match multiplier"""
+        matches = {}
+        if token in self.postings:
+            matches[token] = EXACT
+
+        if prefix:
+            start = bisect_left(self._terms, token)
+            for term in self._terms[start:start + MAX_EXPANSIONS]:
+                if not term.startswith(token):
+                    break
+                matches.setdefault(term, PREFIX)
+
+        if fuzzy and len(token) >= 3:
+            grams = _trigrams(token)
+            inner = {g for g in grams if '$' not in g}
+            shared = Counter()
+            for gram in grams:
+                for term in self._term_trigrams.get(gram, ()):
+                    shared[term] += 1
+
+            for term, count in shared.most_common(MAX_EXPANSIONS * 5):
+                if term in matches:
+                    continue
+                if inner and count >= len(inner) and token in term:
+                    matches[term] = SUBSTRING
+                    continue
+                similarity = 2.0 * count / (len(grams) + len(_trigrams(term)))
+                if similarity >= MIN_FUZZY_SIMILARITY:
+                    matches[term] = FUZZY * similarity
+
+        return matches
+
+    def search(self, query, limit=100, prefix=True, fuzzy=True):
+        """Ranked (doc_id, score, best_field) results; every query token must match"""
+        tokens = tokenize(query)
+        if not tokens or not self.doc_count:
+            return []
+        if self._terms is None:
+            self._freeze()
+
+        scores = None
+        for token in tokens:
+            token_scores = {}
+            for term, factor in self._expand(token, prefix, fuzzy).items():
+                postings = self.postings[term]
+                idf = math.log(1 + self.doc_count / len(postings))
+                for doc_id, (weight, field) in postings.items():
+                    score = QUALITY_SCALE * factor + weight + IDF_SCALE * idf
+                    best = token_scores.get(doc_id)
+                    if best is None or score > best[0]:
+                        token_scores[doc_id] = (score, field)
+
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {
+                    doc_id: (score + token_scores[doc_id][0], field)
+                    for doc_id, (score, field) in scores.items()
+                    if doc_id in token_scores
+                }
+            if not scores:
+                return []
+
+        ranked = heapq.nlargest(limit, scores.items(), key=lambda item: item[1][0])
+        return [(doc_id, score, field) for doc_id, (score, field) in ranked]
+
+
+def build_founder_index(records):
+    """Founders searchable by name, role, company, email and profile links
+
+    Document ids are (company_position, founder_position) pairs.
+    """
+    index = SearchIndex({'name': 3.0, 'company': 2.0, 'role': 1.5, 'email': 1.0, 'links': 0.5})
+    for c, company in enumerate(records):
+        for f, founder in enumerate(company.founders):
+            index.add(
+                (c, f),
+                name=founder.name,
+                company=company.company_name,
+                role=founder.role,
+                email=founder.email,
+                links=f"{founder.linkedin} {founder.twitter}"
+            )
+    return index.finalize()
+
+
+def build_email_index(emails_frame):
+    """Rows of the emails table searchable by address, company and domain
+
+    Document ids are row positions in the frame.
+    """
+    index = SearchIndex({'email': 2.0, 'company': 1.5, 'domain': 1.0})
+    rows = zip(emails_frame['email'], emails_frame['company_name'], emails_frame['domain'])
+    for position, (email, company, domain) in enumerate(rows):
+        index.add(position, email=email, company=company, domain=domain)
+    return index.finalize()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Structured-data fast path - founders, description and social links from JSON-LD and meta tags
+
+Many company sites publish schema.org data (Organization.founder, Person
+with jobTitle/sameAs) in <script type="application/ld+json"> blocks, plus
+OpenGraph / Twitter meta tags. Those are found with a couple of regexes over
+the raw HTML - no DOM is built - and what they declare is more reliable than
+anything the heuristics guess, so a page with structured founders skips the
+heuristic and LLM extractors entirely.
+"""
+
+import html
+import json
+import re
+
+LD_JSON_RE = re.compile(
+    r'<script\b[^>]*type\s*=\s*["\']application/ld\+json["\'][^>]*>(.*?)</script\s*>', re.I | re.S
+)
+META_TAG_RE = re.compile(r'<meta\b[^>]*>', re.I)
+ATTR_RE = re.compile(r'([\w:-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\')', re.S)
+
+FOUNDER_TITLE_RE = re.compile(r'founder|\bceo\b|\bcto\b|chief executive|president|owner', re.I)
+SOCIAL_HOSTS = {
+    'linkedin': ('linkedin.com/',),
+    'twitter': ('twitter.com/', 'x.com/'),
+    'facebook': ('facebook.com/',),
+    'instagram': ('instagram.com/',),
+    'github': ('github.com/',),
+    'youtube': ('youtube.com/',),
+    'crunchbase': ('crunchbase.com/',),
+}
+
+
+def _types(node):
+    value = node.get('@type', '')
+    values = value if isinstance(value, list) else [value]
+    return {str(v).rsplit('/', 1)[-1].lower() for v in values}
+
+
+def _text(value):
+    if isinstance(value, list):
+        value = value[0] if value else ''
+    if isinstance(value, dict):
+        value = value.get('name') or value.get('@value') or ''
+    return html.unescape(str(value)).strip() if value else ''
+
+
+def _as_list(value):
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def _social_links(same_as):
+    """{'linkedin': url, 'twitter': url, ...} from a sameAs value"""
+    links = {}
+    for url in _as_list(same_as):
+        if not isinstance(url, str):
+            continue
+        lowered = url.lower()
+        for network, hosts in SOCIAL_HOSTS.items():
+            if network not in links and any(host in lowered for host in hosts):
+                links[network] = url
+    return links
+
+
+def _walk(node):
+    """Every dict in a JSON-LD document (@graph, lists and nested values included)"""
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(reversed(node))
+        elif isinstance(node, dict):
+            yield node
+            stack.extend(v for k, v in node.items() if isinstance(v, (dict, list)))
+
+
+def ld_json_documents(page_source):
+    """Parsed JSON-LD blocks of a page (malformed blocks are skipped)"""
+    documents = []
+    for block in LD_JSON_RE.findall(page_source):
+        block = block.strip()
+        if block.startswith('<!--'):
+            block = block[4:].rsplit('-->', 1)[0]
+        try:
+            documents.append(json.loads(block, strict=False))
+        except ValueError:
+            continue
+    return documents
+
+
+def meta_tags(page_source):
+    """{name-or-property: content} of the page's <meta> tags (first occurrence wins)"""
+    tags = {}
+    for tag in META_TAG_RE.findall(page_source):
+        attrs = {m.group(1).lower(): m.group(2) if m.group(2) is not None else m.group(3)
+                 for m in ATTR_RE.finditer(tag)}
+        key = (attrs.get('property') or attrs.get('name') or '').lower()
+        if key and 'content' in attrs and key not in tags:
+            tags[key] = html.unescape(attrs['content']).strip()
+    return tags
+
+
+def _person(node, default_role):
+    name = _text(node.get('name')) or ' '.join(
+        p for p in (_text(node.get('givenName')), _text(node.get('familyName'))) if p
+    )
+    if not name:
+        return None
+    links = _social_links(node.get('sameAs'))
+    for key in ('url', 'mainEntityOfPage'):
+        links.update({k: v for k, v in _social_links(node.get(key)).items() if k not in links})
+    email = _text(node.get('email'))
+    if email.lower().startswith('mailto:'):
+        email = email[7:]
+    return {
+        'name': name,
+        'role': _text(node.get('jobTitle')) or default_role,
+        'email': email,
+        'linkedin': links.get('linkedin', ''),
+        'twitter': links.get('twitter', '')
+    }
+
+
+def extract_structured(page_source):
+    """Founders, description, name and social links declared by the page
+
+    Returns {'name', 'description', 'founders': [founder dicts], 'social': {network: url}}.
+    """
+    result = {'name': '', 'description': '', 'founders': [], 'social': {}}
+    seen = set()
+
+    def add(founder):
+        if founder and founder['name'].lower() not in seen:
+            seen.add(founder['name'].lower())
+            result['founders'].append(founder)
+
+    for document in ld_json_documents(page_source):
+        for node in _walk(document):
+            types = _types(node)
+
+            if types & {'organization', 'corporation', 'localbusiness', 'website', 'softwareapplication'}:
+                if not result['name'] and 'website' not in types:
+                    result['name'] = _text(node.get('name'))
+                if not result['description']:
+                    result['description'] = _text(node.get('description'))
+                for network, url in _social_links(node.get('sameAs')).items():
+                    result['social'].setdefault(network, url)
+
+                for key in ('founder', 'founders'):
+                    for person in _as_list(node.get(key)):
+                        if isinstance(person, str):
+                            person = {'name': person}
+                        if isinstance(person, dict):
+                            add(_person(person, 'Founder'))
+
+            elif 'person' in types and FOUNDER_TITLE_RE.search(_text(node.get('jobTitle'))):
+                add(_person(node, 'Founder'))
+
+    meta = meta_tags(page_source)
+    if not result['description']:
+        result['description'] = meta.get('og:description') or meta.get('twitter:description', '')
+    if not result['name']:
+        result['name'] = meta.get('og:site_name', '')
+    twitter_handle = meta.get('twitter:site', '').lstrip('@')
+    if twitter_handle and 'twitter' not in result['social']:
+        result['social']['twitter'] = f"https://twitter.com/{twitter_handle}"
+
+    return result
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Site-builder templates - targeted founder selectors for Webflow, Wix, Squarespace, Framer and WordPress sites
+
+Most portfolio companies run on a handful of site builders whose team
+sections always use the same markup. detect_template() recognises the
+builder from the generator meta tag or its asset hosts (regexes over the raw
+HTML), and extract_with_template() tries that builder's precompiled
+selectors before the generic class-name walk.
+
+TemplateRules is the rule cache: it counts which selector produced founders
+on each builder (productive selectors are tried first) and learns new card
+selectors when the generic heuristics succeed on a detected builder. It is
+persisted next to the fingerprint cache, so rules grow across runs.
+"""
+
+import re
+import threading
+
+from portfolio_cache import JsonFileCache
+
+GENERATOR_RE = re.compile(
+    r'<meta\b[^>]*name\s*=\s*["\']generator["\'][^>]*content\s*=\s*["\']([^"\']+)'
+    r'|<meta\b[^>]*content\s*=\s*["\']([^"\']+)["\'][^>]*name\s*=\s*["\']generator["\']',
+    re.I
+)
+
+# Builder -> generator meta substring and asset/markup signatures
+SIGNATURES = {
+    'webflow': ('webflow', re.compile(r'data-wf-(?:site|page)=|assets\.website-files\.com|website-files\.com/', re.I)),
+    'wix': ('wix.com', re.compile(r'static\.wixstatic\.com|static\.parastorage\.com|wix-thunderbolt', re.I)),
+    'squarespace': ('squarespace', re.compile(r'static1\.squarespace\.com|assets\.squarespace\.com|sqs-block', re.I)),
+    'framer': ('framer', re.compile(r'framerusercontent\.com|data-framer-(?:name|component)', re.I)),
+    'wordpress': ('wordpress', re.compile(r'/wp-content/|/wp-includes/', re.I)),
+}
+
+# Containers a builder's generic item / column blocks must sit in to count as person cards -
+# bare .w-dyn-item or .wp-block-media-text also match blog posts, logos and feature blocks
+TEAM_SCOPE = (
+    ':is([class*="team" i], [id*="team" i], [class*="founder" i], [id*="founder" i], '
+    '[class*="leadership" i], [id*="leadership" i], [class*="people" i], [id*="people" i])'
+)
+
+
+def scoped(selector):
+    return f"{TEAM_SCOPE} {selector}"
+
+
+# Per builder: person card selectors (most specific first), then name / role selectors inside a card
+BUILTIN_RULES = {
+    'webflow': {
+        'cards': ['[class*="team-member"]', '[class*="team-card"]', scoped('.w-dyn-item')],
+        'name': ['[class*="name"]', 'h3', 'h4', 'h2'],
+        'role': ['[class*="role"]', '[class*="position"]', '[class*="job"]', '[class*="title"]:not(h2):not(h3):not(h4)'],
+    },
+    'wix': {
+        'cards': [scoped('[data-hook="item-container"]'), scoped('[data-testid="gallery-item-click-action-link"]'),
+                  scoped('[data-testid="columns"] [data-testid="column"]')],
+        'name': ['[data-hook="item-title"]', '[data-testid="gallery-item-title"]', 'h2', 'h3', 'h4'],
+        'role': ['[data-hook="item-description"]', '[data-testid="gallery-item-description"]', 'p'],
+    },
+    'squarespace': {
+        'cards': [scoped('.user-items-list-item-container li'), scoped('.summary-item'), scoped('.image-card'),
+                  scoped('.sqs-block-image')],
+        'name': ['.list-item-content__title', '.summary-title', '.image-title', 'h2', 'h3', 'h4'],
+        'role': ['.list-item-content__description', '.summary-excerpt', '.image-subtitle', 'p'],
+    },
+    'framer': {
+        'cards': ['[data-framer-name*="member" i]', '[data-framer-name*="person" i]',
+                  '[data-framer-name*="team" i] [data-framer-name*="card" i]'],
+        'name': ['[data-framer-name*="name" i]', 'h2', 'h3', 'h4', 'p'],
+        'role': ['[data-framer-name*="role" i]', '[data-framer-name*="title" i]', '[data-framer-name*="position" i]'],
+    },
+    'wordpress': {
+        'cards': ['.elementor-team-member', '.team-member', '.et_pb_team_member', scoped('.elementor-widget-image-box'),
+                  scoped('.wp-block-media-text'), scoped('.vc_column_container')],
+        'name': ['.elementor-image-box-title', '.team-member-name', '.et_pb_module_header', 'h3', 'h4', 'h2'],
+        'role': ['.elementor-image-box-description', '.team-member-position', '.et_pb_member_position', 'p'],
+    },
+}
+
+ROLE_KEYWORDS = ['CEO', 'CTO', 'CFO', 'Founder', 'Co-founder', 'Chief', 'President', 'Director', 'VP', 'Head']
+ROLE_EVIDENCE_RE = re.compile(r'founder|\b(?:ceo|cto|cfo|coo|chief|president|director|vp|head|partner)\b', re.I)
+LEARNED_SELECTOR_RE = re.compile(r'[a-z0-9]+\.[A-Za-z][A-Za-z_-]*[A-Za-z]')  # card_selector() output
+LINKEDIN_RE = re.compile('linkedin.com/in/', re.I)
+TWITTER_RE = re.compile('twitter.com/|x.com/', re.I)
+LEARNABLE_CLASS_RE = re.compile(r'[A-Za-z][A-Za-z_-]*[A-Za-z]')  # no digits: skips generated hashes
+
+_compiled = {}
+_compiled_lock = threading.Lock()
+
+
+def compiled(selector):
+    """soupsieve selector, compiled once per process"""
+    pattern = _compiled.get(selector)
+    if pattern is None:
+        import soupsieve
+        with _compiled_lock:
+            pattern = _compiled.get(selector)
+            if pattern is None:
+                pattern = _compiled[selector] = soupsieve.compile(selector)
+    return pattern
+
+
+def detect_template(page_source):
+    """Site builder name ('webflow', 'wix', ...) or None"""
+    match = GENERATOR_RE.search(page_source)
+    if match:
+        generator = (match.group(1) or match.group(2)).lower()
+        for template, (marker, _) in SIGNATURES.items():
+            if marker in generator:
+                return template
+
+    for template, (_, assets) in SIGNATURES.items():
+        if assets.search(page_source):
+            return template
+    return None
+
+
+def card_selector(card):
+    """Reusable selector for a person card the generic heuristics found, or None"""
+    for cls in card.get('class') or []:
+        if LEARNABLE_CLASS_RE.fullmatch(cls):
+            return f"{card.name}.{cls}"
+    return None
+
+
+def _first_text(card, selectors):
+    for selector in selectors:
+        element = compiled(selector).select_one(card)
+        if element is not None:
+            text = ' '.join(element.get_text(' ').split())
+            if text:
+                return text
+    return ''
+
+
+def founder_from_card(card, rules):
+    """Founder dict from one person card, or None if it holds no plausible name"""
+    name = _first_text(card, rules['name'])
+    if not (name and 3 < len(name) < 50 and ' ' in name):
+        return None
+
+    role = _first_text(card, rules['role'])
+    if not role or role == name or len(role) >= 100:
+        card_text = card.get_text()
+        role = next((keyword for keyword in ROLE_KEYWORDS if keyword in card_text), 'Team Member')
+
+    linkedin = card.find('a', href=LINKEDIN_RE)
+    twitter = card.find('a', href=TWITTER_RE)
+    return {
+        'name': name,
+        'role': role,
+        'email': '',
+        'linkedin': linkedin.get('href') if linkedin else '',
+        'twitter': twitter.get('href') if twitter else ''
+    }
+
+
+def looks_like_people(founders):
+    """Whether template cards are person cards: some carry a leadership role or a LinkedIn profile"""
+    return any(ROLE_EVIDENCE_RE.search(f['role']) or f['linkedin'] for f in founders)
+
+
+def extract_with_template(soup, template, rules):
+    """(founders, card selector) from the builder's selectors - ([], None) when none match"""
+    card_rules = rules.rules_for(template)
+    for selector in card_rules['cards']:
+        founders = []
+        seen = set()
+        for card in compiled(selector).select(soup):
+            founder = founder_from_card(card, card_rules)
+            if founder and founder['name'] not in seen:
+                seen.add(founder['name'])
+                founders.append(founder)
+        if founders:
+            return founders, selector
+    return [], None
+
+
+class TemplateRules(JsonFileCache):
+    """Per-builder selector rules: built-ins plus learned card selectors, ordered by hits"""
+
+    FILENAME = 'template_rules.json'
+    DUMP_OPTIONS = {'indent': 1, 'sort_keys': True}
+
+    def __init__(self, cache_dir=None):
+        super().__init__(cache_dir)
+        self.learned = self.data   # template -> {card selector: hits}
+
+    def rules_for(self, template):
+        builtin = BUILTIN_RULES[template]
+        with self.lock:
+            hits = dict(self.learned.get(template, {}))
+        # Built-ins and card_selector() output only: drops broad selectors confirmed by older rule sets
+        learned = [selector for selector in hits if LEARNED_SELECTOR_RE.fullmatch(selector)]
+        cards = list(dict.fromkeys(builtin['cards'] + learned))
+        # Stable sort: confirmed selectors first, built-in order otherwise
+        cards.sort(key=lambda selector: -hits.get(selector, 0))
+        return {'cards': cards, 'name': builtin['name'], 'role': builtin['role']}
+
+    def confirm(self, template, selector):
+        """A selector produced person cards (see looks_like_people) on this builder"""
+        if not selector:
+            return
+        with self.lock:
+            selectors = self.learned.setdefault(template, {})
+            selectors[selector] = selectors.get(selector, 0) + 1
+            self.dirty = True
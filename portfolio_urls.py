@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+URL canonicalization - one key per real company site
+
+Portfolio pages link the same company as http:// and https://, with and
+without www., with trailing slashes, UTM parameters or through redirects.
+canonical_url() normalizes scheme, host, path and query; site_key() reduces
+a URL to the registrable domain (or the full host on shared hosting such as
+*.webflow.io), which is what identifies a company. RedirectCache remembers
+where URLs ended up on previous fetches, and HostFilter applies compiled
+block / allow lists to hosts.
+"""
+
+import re
+from urllib.parse import parse_qsl, urlencode, urljoin, urlparse, urlunparse
+
+from portfolio_cache import JsonFileCache
+
+# Public suffixes with more than one label that company sites commonly use.
+# Anything else is treated as a single-label suffix (.com, .io, .vc, ...).
+MULTI_LABEL_SUFFIXES = {
+    'co.uk', 'org.uk', 'ac.uk', 'gov.uk', 'ltd.uk', 'plc.uk', 'me.uk',
+    'com.au', 'net.au', 'org.au', 'co.nz', 'org.nz', 'co.za', 'co.in', 'net.in', 'org.in',
+    'co.jp', 'ne.jp', 'or.jp', 'co.kr', 'or.kr', 'com.br', 'net.br', 'com.mx', 'com.ar',
+    'com.co', 'com.sg', 'com.hk', 'com.tw', 'com.cn', 'net.cn', 'org.cn', 'com.tr',
+    'co.il', 'org.il', 'com.my', 'com.ph', 'com.pk', 'com.ng', 'co.ke', 'com.eg',
+    'co.id', 'or.id', 'co.th', 'in.th', 'com.vn', 'com.ua', 'com.pl', 'com.es', 'com.pt'
+}
+
+
+def url_host(url):
+    """Lower-case host of a URL (or bare host) without credentials or port"""
+    if '//' not in url:
+        url = '//' + url
+    host = urlparse(url).hostname or ''
+    return host.rstrip('.')
+
+
+def registrable_domain(url):
+    """Domain a company actually registered: https://www.team.acme.co.uk/x -> acme.co.uk"""
+    host = url_host(url)
+    if not host or host.replace('.', '').isdigit() or '.' not in host:
+        return host  # IP address or single-label host (localhost)
+
+    labels = host.split('.')
+    if len(labels) >= 3 and '.'.join(labels[-2:]) in MULTI_LABEL_SUFFIXES:
+        return '.'.join(labels[-3:])
+    return '.'.join(labels[-2:])
+
+
+# Free-hosting domains where every subdomain is a different site
+SHARED_HOSTING = {
+    'webflow.io', 'wixsite.com', 'squarespace.com', 'framer.website', 'framer.app', 'framer.ai',
+    'vercel.app', 'netlify.app', 'herokuapp.com', 'github.io', 'gitlab.io', 'notion.site',
+    'carrd.co', 'super.site', 'pages.dev', 'web.app', 'firebaseapp.com', 'myshopify.com',
+    'substack.com', 'wordpress.com', 'blogspot.com', 'typedream.app', 'softr.app'
+}
+
+# Links on portfolio pages that never point at a portfolio company
+BLOCKED_HOSTS = (
+    'linkedin.com', 'twitter.com', 'x.com', 'facebook.com', 'youtube.com', 'youtu.be', 'instagram.com',
+    'tiktok.com', 'medium.com', 'crunchbase.com', 'angel.co', 'wellfound.com', 'apple.com',
+    'play.google.com', 'google.com', 'goo.gl', 'bit.ly', 'calendly.com', 'typeform.com',
+    'docs.google.com', 'forms.gle', 'substack.com', 'spotify.com', 'podcasts.apple.com',
+    'pitchbook.com', 'techcrunch.com', 'bloomberg.com', 'forbes.com', 'wsj.com', 'nytimes.com'
+)
+
+TRACKING_PARAM_RE = re.compile(
+    r'^(utm_\w+|gclid|dclid|fbclid|msclkid|mc_cid|mc_eid|_hsenc|_hsmi|hsctatracking|ref|ref_src|source|igshid|yclid)$',
+    re.I
+)
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def canonical_url(url, base=None):
+    """Normalized absolute http(s) URL, or '' for mailto:, javascript:, fragments and the like
+
+    Lower-case host without www. and default port, no fragment, no tracking
+    parameters, sorted query, no duplicate or trailing slashes. The scheme is
+    kept so http-only sites still load; site_key() ignores it.
+    """
+    url = (url or '').strip()
+    if base:
+        url = urljoin(base, url)
+    parsed = urlparse(url)
+    scheme = parsed.scheme.lower()
+    if scheme not in ('http', 'https') or not parsed.hostname:
+        return ''
+
+    host = parsed.hostname.rstrip('.')
+    if host.startswith('www.'):
+        host = host[4:]
+    netloc = host
+    if parsed.port and parsed.port != DEFAULT_PORTS[scheme]:
+        netloc = f"{host}:{parsed.port}"
+
+    path = re.sub(r'/{2,}', '/', parsed.path).rstrip('/')
+    query = urlencode(sorted(
+        (k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True) if not TRACKING_PARAM_RE.match(k)
+    ))
+    return urlunparse((scheme, netloc, path or '/', '', query, ''))
+
+
+def site_key(url):
+    """Identity of a company site: registrable domain, or full host on shared hosting"""
+    host = url_host(url)
+    if host.startswith('www.'):
+        host = host[4:]
+    domain = registrable_domain(host)
+    return host if domain in SHARED_HOSTING else domain
+
+
+class HostFilter:
+    """Compiled host block / allow lists (a host matches an entry or any subdomain of it)"""
+
+    def __init__(self, blocked=BLOCKED_HOSTS, allowed=()):
+        self.blocked = self._compile(blocked)
+        self.allowed = self._compile(allowed)
+
+    @staticmethod
+    def _compile(hosts):
+        hosts = [h.lower().strip().lstrip('.') for h in hosts if h and h.strip()]
+        if not hosts:
+            return None
+        return re.compile(r'(?:^|\.)(?:' + '|'.join(re.escape(h) for h in hosts) + r')$')
+
+    def allows(self, url):
+        host = url_host(url)
+        if not host:
+            return False
+        if self.allowed is not None and not self.allowed.search(host):
+            return False
+        return not (self.blocked is not None and self.blocked.search(host))
+
+
+class RedirectCache(JsonFileCache):
+    """Where URLs ended up on earlier fetches, so redirected duplicates are recognised before fetching"""
+
+    FILENAME = 'redirects.json'
+
+    def __init__(self, cache_dir=None):
+        super().__init__(cache_dir)
+        self.targets = self.data   # canonical url -> canonical final url
+
+    def record(self, url, final_url):
+        url, final_url = canonical_url(url), canonical_url(final_url)
+        if not url or not final_url:
+            return
+        with self.lock:
+            if url == final_url:
+                if self.targets.pop(url, None) is not None:
+                    self.dirty = True
+            elif self.targets.get(url) != final_url:
+                self.targets[url] = final_url
+                self.dirty = True
+
+    def resolve(self, url):
+        """Final URL of a (canonical) URL after known redirects"""
+        url = canonical_url(url) or url
+        with self.lock:
+            seen = set()
+            while url in self.targets and url not in seen:
+                seen.add(url)
+                url = self.targets[url]
+        return url
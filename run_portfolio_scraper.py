@@ -1,12 +1,39 @@
 #!/usr/bin/env python3
 """
 EASY RUN SCRIPT - Just run this!
+
+No arguments: interactive menu.
+With arguments: non-interactive command line for cron / containers, e.g.
+
+    python run_portfolio_scraper.py https://www.orangecollective.vc/portfolio \
+        --headless --workers 4 --fetch-mode hybrid --formats csv,json,parquet \
+        --metrics-file metrics.json
+
+    python run_portfolio_scraper.py --url-file portfolios.txt --dry-run
+
+    # keep raw HTML, then later re-run the extractors on it without a browser
+    python run_portfolio_scraper.py https://example.vc/portfolio --archive-dir .portfolio_archive
+    python run_portfolio_scraper.py --reextract .portfolio_archive --workers 8
+
+    # what changed: list runs, diff the latest run or a range of runs
+    python run_portfolio_scraper.py --runs
+    python run_portfolio_scraper.py --diff latest
+    python run_portfolio_scraper.py --diff 3..7
 """
 
+import argparse
+import json
+import os
 import sys
 import subprocess
+import time
+from datetime import datetime
 
-print("""
+EXPORT_FORMATS = ('xlsx', 'csv', 'json', 'parquet', 'arrow')
+
+
+def interactive_menu():
+    print("""
 🚀 PORTFOLIO SCRAPER - COMPLETE SOLUTION
 ======================================
 
@@ -19,54 +46,347 @@ Choose an option:
 
 """)
 
-choice = input("Enter your choice (1-3): ")
-
-if choice == "1":
-    print("\n🚀 Launching dashboard...")
-    print("=" * 50)
-    print("Instructions:")
-    print("1. Enter a portfolio URL in the sidebar")
-    print("2. Click 'START SCRAPING'")
-    print("3. Watch as it scrapes ALL companies!")
-    print("4. Download Excel/CSV when done")
-    print("\nPress Ctrl+C to stop")
-    print("=" * 50)
-    
-    subprocess.run(["streamlit", "run", "portfolio_dashboard.py"])
-
-elif choice == "2":
-    print("\n📝 Direct scraping mode")
-    print("=" * 50)
-    
-    url = input("Enter portfolio URL: ").strip()
-    
-    if not url:
-        print("❌ No URL provided")
-        sys.exit(1)
-    
+    choice = input("Enter your choice (1-3): ")
+
+    if choice == "1":
+        print("\n🚀 Launching dashboard...")
+        print("=" * 50)
+        print("Instructions:")
+        print("1. Enter a portfolio URL in the sidebar")
+        print("2. Click 'START SCRAPING'")
+        print("3. Watch as it scrapes ALL companies!")
+        print("4. Download Excel/CSV when done")
+        print("\nPress Ctrl+C to stop")
+        print("=" * 50)
+
+        subprocess.run(["streamlit", "run", "portfolio_dashboard.py"])
+
+    elif choice == "2":
+        print("\n📝 Direct scraping mode")
+        print("=" * 50)
+
+        url = input("Enter portfolio URL: ").strip()
+
+        if not url:
+            print("❌ No URL provided")
+            sys.exit(1)
+
+        from portfolio_scraper import PortfolioScraper
+
+        print(f"\n🚀 Scraping {url}...")
+
+        scraper = PortfolioScraper(headless=False)
+        try:
+            scraper.scrape_portfolio(url)
+
+            print("\n✅ Scraping complete!")
+            print("\n📁 Your data is saved in:")
+            print("   - portfolio_founders_*.xlsx (Excel)")
+            print("   - portfolio_founders_*.csv (CSV)")
+            print("\n🎯 To view in dashboard, run this script again and choose option 3")
+
+        finally:
+            scraper.close()
+
+    elif choice == "3":
+        print("\n📊 Viewing existing data...")
+        print("The dashboard will load your previous scraping results")
+        print("\nPress Ctrl+C to stop")
+
+        subprocess.run(["streamlit", "run", "portfolio_dashboard.py"])
+
+    else:
+        print("❌ Invalid choice")
+
+
+def parse_formats(value):
+    formats = tuple(f.strip().lower() for f in value.split(',') if f.strip())
+    unknown = [f for f in formats if f not in EXPORT_FORMATS]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown format(s): {', '.join(unknown)} (choose from {', '.join(EXPORT_FORMATS)})")
+    return formats
+
+
+def parse_workers(value):
+    if value == 'auto':
+        return value
+    try:
+        workers = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected a number or 'auto'")
+    if workers < 1:
+        raise argparse.ArgumentTypeError("must be at least 1")
+    return workers
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Scrape portfolio pages and every company they list for founder data."
+    )
+    parser.add_argument('urls', nargs='*', metavar='URL', help="portfolio page URL(s)")
+    parser.add_argument('--url-file', help="file with one portfolio URL per line (# comments allowed)")
+    parser.add_argument('--headless', action='store_true', help="run Chrome without a window")
+    parser.add_argument('--workers', type=parse_workers, default=1,
+                        help="companies scraped in parallel, or 'auto' to adapt to latency/errors/host load (default: 1)")
+    parser.add_argument('--fetch-mode', choices=('browser', 'http', 'hybrid'), default='browser',
+                        help="browser = Chrome, http = plain requests, hybrid = http with Chrome fallback")
+    parser.add_argument('--browser-engine', choices=('selenium', 'cdp'), default='selenium',
+                        help="selenium = one Chrome per worker, cdp = one Chrome with a tab per worker (needs websockets)")
+    parser.add_argument('--delay', type=float, default=2, help="seconds to wait after each company (default: 2)")
+    parser.add_argument('--cache-dir', default='.portfolio_cache', help="cache directory: content fingerprints, learned rules and run history")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="don't use or update the caches: re-extract every company even if unchanged "
+                             "(run history is still recorded, see --runs-dir)")
+    parser.add_argument('--resume', action='store_true', help="skip companies already in portfolio_data.pkl")
+    parser.add_argument('--formats', type=parse_formats, default=('xlsx', 'csv', 'json', 'parquet'),
+                        help=f"comma-separated export formats: {','.join(EXPORT_FORMATS)} (default: xlsx,csv,json,parquet)")
+    parser.add_argument('--event-file', help="append progress events (JSON Lines) to this file")
+    parser.add_argument('--metrics-file', help="write run metrics (timings, counters, throughput) as JSON")
+    parser.add_argument('--dry-run', action='store_true', help="only discover companies, don't scrape them")
+    parser.add_argument('--archive-dir', help="store compressed raw HTML of every company page here")
+    parser.add_argument('--reextract', metavar='ARCHIVE_DIR',
+                        help="re-run the extractors over an archive (no browser, no network); --workers sets processes")
+    parser.add_argument('--no-ai', action='store_true', help="never call the OpenAI fallback extractor")
+    parser.add_argument('--block-host', action='append', default=[], metavar='HOST',
+                        help="never treat links to this host (or its subdomains) as companies; repeatable")
+    parser.add_argument('--allow-host', action='append', default=[], metavar='HOST',
+                        help="only treat links to these hosts as companies; repeatable")
+    parser.add_argument('--validate-emails', action='store_true',
+                        help="drop emails whose domain has no MX record (needs dnspython)")
+    parser.add_argument('--max-pages', type=int, default=3,
+                        help="pages fetched per company, homepage included (default: 3)")
+    parser.add_argument('--max-company-seconds', type=float, default=60,
+                        help="stop fetching a company's pages after this many seconds (default: 60)")
+    parser.add_argument('--runs-dir', help="run history directory (default: --cache-dir)")
+    parser.add_argument('--runs', action='store_true', help="list recorded scrape runs and exit")
+    parser.add_argument('--diff', metavar='RUN',
+                        help="show what a run changed (run number, timestamp or 'latest'), or A..B for a range")
+    parser.add_argument('--record-snapshot', metavar='FILE',
+                        help="register an existing dataset file (e.g. portfolio_data_<ts>.json) as a run")
+    return parser
+
+
+def read_urls(args):
+    urls = list(args.urls)
+    if args.url_file:
+        with open(args.url_file, 'r') as f:
+            for line in f:
+                line = line.split('#', 1)[0].strip()
+                if line:
+                    urls.append(line)
+    return urls
+
+
+def write_metrics(path, metrics):
+    with open(path, 'w') as f:
+        json.dump(metrics, f, indent=2)
+    print(f"📈 Metrics written to {path}")
+
+
+def reextract(args):
+    from portfolio_pagestore import reextract_archive
+    from portfolio_resolve import resolve_records
     from portfolio_scraper import PortfolioScraper
-    
-    print(f"\n🚀 Scraping {url}...")
-    
-    scraper = PortfolioScraper(headless=False)
+
+    started = time.time()
+    print(f"🗄️  Re-extracting from archive: {args.reextract}")
+    workers = None if args.workers == 'auto' else args.workers  # auto: one process per CPU
+    records = resolve_records(reextract_archive(args.reextract, workers=workers))
+
+    if records and args.validate_emails:
+        from portfolio_mx import MXValidator
+        try:
+            stats = MXValidator().filter_records(records)
+            print(f"📭 Checked {stats['domains']} email domains, {stats['undeliverable_domains']} without mail servers "
+                  f"({stats['emails_dropped']} emails dropped, {stats['founder_emails_cleared']} founder emails cleared)")
+        except ImportError as e:
+            print(f"⚠️  Skipping email validation: {e}")
+    elapsed = time.time() - started
+
+    if not records:
+        print("❌ Archive is empty")
+        return 1
+
+    scraper = PortfolioScraper(cache_dir=None, stream_formats=None, export_formats=args.formats)
     try:
-        scraper.scrape_portfolio(url)
-        
-        print("\n✅ Scraping complete!")
-        print("\n📁 Your data is saved in:")
-        print("   - portfolio_founders_*.xlsx (Excel)")
-        print("   - portfolio_founders_*.csv (CSV)")
-        print("\n🎯 To view in dashboard, run this script again and choose option 3")
-        
+        scraper.portfolio_data = records
+        scraper.save_data()
+        scraper.save_all_formats(args.formats)
     finally:
         scraper.close()
 
-elif choice == "3":
-    print("\n📊 Viewing existing data...")
-    print("The dashboard will load your previous scraping results")
-    print("\nPress Ctrl+C to stop")
-    
-    subprocess.run(["streamlit", "run", "portfolio_dashboard.py"])
+    founders = sum(r.founders_count for r in records)
+    print(f"✅ Re-extracted {len(records)} companies ({founders} founders) in {elapsed:.1f}s")
+
+    if args.metrics_file:
+        write_metrics(args.metrics_file, {
+            'finished_at': datetime.now().isoformat(),
+            'mode': 'reextract',
+            'archive_dir': args.reextract,
+            'workers': args.workers,
+            'seconds': round(elapsed, 2),
+            'companies': len(records),
+            'founders': founders,
+            'companies_per_minute': round(len(records) * 60 / elapsed, 2) if elapsed else 0.0
+        })
+    return 0
+
+
+CHANGE_LABELS = (
+    ('new_company', '🆕 New companies'),
+    ('new_founder', '👤 New founders'),
+    ('departed_founder', '👋 Departed founders'),
+    ('new_email', '📧 New emails'),
+)
+
+
+def history(args):
+    from portfolio_runs import RunRegistry, summarize
+
+    registry = RunRegistry(args.runs_dir or args.cache_dir)
+    try:
+        if args.record_snapshot:
+            from portfolio_dataset import load_dataset
+            records = load_dataset(args.record_snapshot)
+            run = registry.record_run(records, run_id=os.path.basename(args.record_snapshot),
+                                      dataset=args.record_snapshot)
+            print(f"🕒 Recorded {len(records)} companies from {args.record_snapshot} as run {run}")
+            if not args.diff:
+                return 0
+
+        if args.runs:
+            runs = registry.runs()
+            if not runs:
+                print("No runs recorded yet")
+            for r in runs:
+                print(f"   #{r['id']:<4} {r['run_id']:<20} {r['companies']:>5} companies  {r['changed']:>4} changed  "
+                      f"{r['portfolio_url'] or r['dataset']}")
+            return 0
+
+        first, _, last = args.diff.rpartition('..')
+        run = registry.resolve_run(last)
+        since = 0 if first == '0' else registry.resolve_run(first) if first else None  # 0..B: from the start
+        if run is None or (first and since is None):
+            print(f"❌ Unknown run: {args.diff}")
+            return 2
+
+        changes = registry.changes(run, since)
+        counts = summarize(changes)
+        print(f"🕒 Changes in run {run}" + (f" since run {since}" if first else ""))
+        for kind, label in CHANGE_LABELS:
+            print(f"\n{label}: {counts[kind]}")
+            for change in changes:
+                if change['kind'] != kind:
+                    continue
+                if kind == 'new_company':
+                    print(f"   + {change['detail']} ({change['item']})")
+                else:
+                    detail = f" ({change['detail']})" if change['detail'] else ''
+                    sign = '-' if kind == 'departed_founder' else '+'
+                    print(f"   {sign} {change['item']}{detail} @ {change['company_name']}")
+        return 0
+    finally:
+        registry.close()
+
+
+def run(args):
+    from portfolio_scraper import PortfolioScraper
+
+    if args.reextract:
+        return reextract(args)
+
+    if args.runs or args.diff or args.record_snapshot:
+        return history(args)
+
+    urls = read_urls(args)
+    if not urls:
+        print("❌ No portfolio URLs given (pass URLs or --url-file)")
+        return 2
+
+    started = time.time()
+    metrics = {
+        'started_at': datetime.now().isoformat(),
+        'mode': 'dry-run' if args.dry_run else 'scrape',
+        'fetch_mode': args.fetch_mode,
+        'browser_engine': args.browser_engine,
+        'workers': args.workers,
+        'headless': args.headless,
+        'portfolios': []
+    }
+
+    scraper = PortfolioScraper(
+        headless=args.headless,
+        cache_dir=None if args.no_cache else args.cache_dir,
+        fetch_mode=args.fetch_mode,
+        browser_engine=args.browser_engine,
+        workers=args.workers,
+        delay=args.delay,
+        resume=args.resume,
+        export_formats=args.formats,
+        event_file=args.event_file,
+        archive_dir=args.archive_dir,
+        use_ai=not args.no_ai,
+        validate_emails=args.validate_emails,
+        block_hosts=args.block_host,
+        allow_hosts=args.allow_host,
+        page_budget={'max_pages': args.max_pages, 'max_seconds': args.max_company_seconds},
+        runs_dir=args.runs_dir or args.cache_dir
+    )
+
+    exit_code = 0
+    try:
+        for i, url in enumerate(urls):
+            portfolio_started = time.time()
+            if i:
+                # Shared browser and caches, but each portfolio gets its own records
+                scraper.start_new_portfolio()
+            try:
+                if args.dry_run:
+                    companies = scraper.find_portfolio_companies(url)
+                    for company in companies:
+                        print(f"   - {company['name']}: {company['url']}")
+                    entry = {'url': url, 'companies_found': len(companies)}
+                else:
+                    scraper.scrape_portfolio(url)
+                    entry = {'url': url}
+            except Exception as e:
+                print(f"❌ {url}: {e}")
+                entry = {'url': url, 'error': str(e)}
+                exit_code = 1
+            entry['seconds'] = round(time.time() - portfolio_started, 2)
+            metrics['portfolios'].append(entry)
+    finally:
+        scraper.close()
+
+    elapsed = time.time() - started
+    counters = scraper.events.counters
+    if scraper.limiter is not None:
+        metrics['concurrency'] = scraper.limiter.metrics()
+    metrics.update({
+        'finished_at': datetime.now().isoformat(),
+        'seconds': round(elapsed, 2),
+        'counters': dict(counters),
+        'companies_per_minute': round(counters['companies_done'] * 60 / elapsed, 2) if elapsed else 0.0,
+        'pages_per_minute': round(counters['pages_fetched'] * 60 / elapsed, 2) if elapsed else 0.0,
+        'pages_per_company': round(counters['pages_fetched'] / counters['companies_started'], 2)
+                             if counters['companies_started'] else 0.0
+    })
+
+    if args.metrics_file:
+        write_metrics(args.metrics_file, metrics)
+
+    return exit_code
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        interactive_menu()
+        return
+
+    args = build_parser().parse_args(argv)
+    sys.exit(run(args))
+
 
-else:
-    print("❌ Invalid choice")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
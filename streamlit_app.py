@@ -1,38 +1,30 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-import os
-import json
+from portfolio_dataset import find_dataset, load_dataset
 
 st.set_page_config(page_title="Static Dashboard Demo", layout="wide")
 
 def load_data():
-    files = [f for f in os.listdir() if f.endswith('.json') and f.startswith('portfolio_data')]
-    if files:
-        latest_file = sorted(files)[-1]
-    elif os.path.exists("sample_portfolio_data.json"):
-        latest_file = "sample_portfolio_data.json"
-    else:
+    path = find_dataset(include_sample=True)
+    if not path:
         st.warning("No data file found. Please upload a JSON or rerun the scraper.")
         return None
 
-    with open(latest_file, 'r') as f:
-        data = json.load(f)
-    return data
-
-def display_dashboard(data):
-    if not isinstance(data, dict):
-        st.error("Data format invalid.")
-        return
+    try:
+        return load_dataset(path)
+    except Exception as e:
+        st.error(f"Could not read {path}: {e}")
+        return None
 
-    companies = data.get("companies", [])
+def display_dashboard(companies):
     founders = []
     for company in companies:
-        for founder in company.get("founders", []):
+        for founder in company.founders:
             founders.append({
-                "Company": company.get("name"),
-                "Founder": founder.get("name"),
-                "Role": founder.get("role"),
+                "Company": company.company_name,
+                "Founder": founder.name,
+                "Role": founder.role,
             })
 
     st.title("📊 Portfolio Founder Dashboard")
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Tests for portfolio_mx - run with: python -m pytest test_portfolio_mx.py
+"""
+
+import threading
+import time
+
+import pytest
+
+import portfolio_mx
+from portfolio_mx import MXValidator, StubResolver, TTLCache
+from portfolio_records import CompanyRecord, FounderRecord
+
+
+class SlowResolver(StubResolver):
+    """StubResolver that takes a while to answer, so concurrent callers overlap"""
+
+    def __init__(self, records=None, delay=0.05):
+        super().__init__(records)
+        self.delay = delay
+        self.lock = threading.Lock()
+
+    def mx(self, domain):
+        time.sleep(self.delay)
+        with self.lock:
+            return super().mx(domain)
+
+
+class FailingResolver(StubResolver):
+    def mx(self, domain):
+        self.lookups += 1
+        raise TimeoutError(f"lookup for {domain} timed out")
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.monotonic for TTL tests"""
+    now = [1000.0]
+    monkeypatch.setattr(portfolio_mx.time, 'monotonic', lambda: now[0])
+    return now
+
+
+def company(emails=(), founders=()):
+    return CompanyRecord('Acme', 'https://acme.com', founders=founders, all_emails=emails)
+
+
+def test_repeated_checks_look_up_each_domain_once():
+    stub = StubResolver({'acme.com': ['mx.acme.com']})
+    validator = MXValidator(stub)
+
+    assert validator.check_domains(['acme.com', 'ACME.com', 'gone.io']) == {'acme.com': True, 'gone.io': False}
+    assert validator.check_domains(['gone.io', 'acme.com']) == {'gone.io': False, 'acme.com': True}
+    assert stub.lookups == 2
+
+
+def test_concurrent_checks_share_one_lookup_per_domain():
+    stub = SlowResolver({'acme.com': ['mx.acme.com'], 'beta.io': ['mx.beta.io']})
+    validator = MXValidator(stub, max_workers=4)
+    domains = ['acme.com', 'beta.io', 'gone.io']
+    results = []
+
+    def check():
+        results.append(validator.check_domains(domains))
+
+    threads = [threading.Thread(target=check) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert stub.lookups == len(domains)
+    assert all(r == {'acme.com': True, 'beta.io': True, 'gone.io': False} for r in results)
+
+
+def test_cached_answers_expire_after_ttl(clock):
+    stub = StubResolver({'acme.com': ['mx.acme.com']})
+    validator = MXValidator(stub, ttl=60)
+
+    validator.check_domains(['acme.com'])
+    clock[0] += 59
+    validator.check_domains(['acme.com'])
+    assert stub.lookups == 1
+
+    clock[0] += 2
+    validator.check_domains(['acme.com'])
+    assert stub.lookups == 2
+
+
+def test_ttl_cache_forgets_expired_entries(clock):
+    cache = TTLCache(ttl=10)
+    cache.set('acme.com', False)
+    assert cache.get('acme.com') is False
+
+    clock[0] += 11
+    assert cache.get('acme.com') is None
+    assert 'acme.com' not in cache.entries
+
+
+@pytest.mark.parametrize('answer', [['.'], []], ids=['null-mx', 'no-answer'])
+def test_domains_without_mail_drop_emails_and_clear_founder_emails(answer):
+    stub = StubResolver({'acme.com': ['mx.acme.com'], 'parked.io': answer})
+    founders = [
+        FounderRecord('Jane Doe', 'CEO', 'jane@parked.io', email_source='observed'),
+        FounderRecord('John Roe', 'CTO', 'john@acme.com', email_source='inferred'),
+    ]
+    record = company(['hello@acme.com', 'info@parked.io', 'sales@PARKED.io'], founders)
+
+    stats = MXValidator(stub).filter_records([record])
+
+    assert record.all_emails == ['hello@acme.com']
+    assert record.emails_count == 1
+    assert (founders[0].email, founders[0].email_source) == ('', '')
+    assert (founders[1].email, founders[1].email_source) == ('john@acme.com', 'inferred')
+    assert stats == {'domains': 2, 'undeliverable_domains': 1, 'emails_dropped': 2, 'founder_emails_cleared': 1}
+
+
+def test_resolver_errors_keep_the_address_and_are_retried():
+    stub = FailingResolver()
+    validator = MXValidator(stub)
+    founder = FounderRecord('Jane Doe', 'CEO', 'jane@flaky.dev', email_source='observed')
+    record = company(['hello@flaky.dev'], [founder])
+
+    stats = validator.filter_records([record])
+    assert record.all_emails == ['hello@flaky.dev']
+    assert founder.email == 'jane@flaky.dev'
+    assert stats['undeliverable_domains'] == 0
+
+    # Failures are not cached
+    validator.check_domains(['flaky.dev'])
+    assert stub.lookups == 2
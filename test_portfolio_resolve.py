@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Tests for portfolio_resolve - run with: python -m pytest test_portfolio_resolve.py
+"""
+
+import os
+
+import pytest
+
+from portfolio_dataset import load_dataset
+from portfolio_resolve import MIN_PERSON_SCORE, normalize_name, person_score, resolve_founders
+
+SAMPLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'portfolio_data_20250530_033733.json')
+
+# Headings, product copy and "<word> Co-founder" fragments the extractors picked up
+SAMPLE_JUNK = {
+    'Founder', 'Dropbox Co', 'Docker Co', 'Zoom Co', 'Shi Co', 'Khattak Co', 'Anderson Co', 'Former Co',
+    'Fast and easy management', 'Concentrate to run your business', 'Human-like voice',
+    'Continuous optimization', 'Latency <2s', 'Our Co'
+}
+
+
+@pytest.mark.parametrize('name', [
+    'Jane Doe', 'Efrén Alvarez Lamolda', 'Ludwig van Beethoven', 'Jake Stein', "Conan O'Brien"
+])
+def test_people_score_above_threshold(name):
+    assert person_score(name) > MIN_PERSON_SCORE
+
+
+@pytest.mark.parametrize('name', [
+    'Docker Co', 'Former Co', 'Our Co', 'Human-like voice', 'Continuous optimization',
+    'Meet the team', 'Founder / Mode Party', 'Jane'
+])
+def test_non_people_score_at_or_below_threshold(name):
+    assert person_score(name) <= MIN_PERSON_SCORE
+
+
+def test_sample_dataset_keeps_people_and_drops_junk():
+    records = load_dataset(SAMPLE, use_cache=False)
+    raw = [normalize_name(f.name) for r in records for f in r.founders]
+    kept = [f.name for r in records for f in resolve_founders(r.founders)]
+
+    assert not SAMPLE_JUNK & set(kept)
+    assert set(raw) - SAMPLE_JUNK == set(kept)
+    assert len(raw) - len(kept) == len(SAMPLE_JUNK)
@@ -65,8 +65,8 @@ try:
     
     # Quick test on a simple page
     print("   🔄 Testing on example.com...")
-    scraper.driver.get("https://example.com")
-    title = scraper.driver.title
+    scraper.browser.navigate("https://example.com")
+    title = scraper.browser.run_script("document.title")
     print(f"   ✅ Browser working! Page title: {title}")
     
     scraper.close()